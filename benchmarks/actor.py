@@ -0,0 +1,83 @@
+"""
+Actor core benchmark.
+
+Several cores each handle a stream of notifications doing some work:
+compares dispatching them inline on the sending thread with running
+each core as a CoreActor fed from producer threads, and measures the
+overhead of going through a mailbox. Only free-threaded builds of
+CPython can run the actors in parallel.
+
+    python benchmarks/actor.py [cores] [notifications] [work]
+"""
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from puremvc_multicore.patterns.facade import Facade
+from puremvc_multicore.patterns.mediator import Mediator
+
+
+class WorkMediator(Mediator):
+    def list_notification_interests(self):
+        return ['work']
+
+    def handle_notification(self, note):
+        self.total = sum(range(note.get_body()))
+
+
+def inline(facades, notifications, work):
+    start = time.perf_counter()
+    for _ in range(notifications):
+        for facade in facades:
+            facade.send_notification('work', work)
+    return time.perf_counter() - start
+
+
+def actors(facades, notifications, work):
+    running = [facade.start_actor() for facade in facades]
+
+    def produce(facade):
+        for _ in range(notifications):
+            facade.send_notification('work', work)
+
+    start = time.perf_counter()
+    producers = [threading.Thread(target=produce, args=(facade,)) for facade in facades]
+    for producer in producers:
+        producer.start()
+    for producer in producers:
+        producer.join()
+    for actor in running:
+        actor.flush()
+    elapsed = time.perf_counter() - start
+    for actor in running:
+        actor.stop()
+    return elapsed
+
+
+def main():
+    cores = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    notifications = int(sys.argv[2]) if len(sys.argv) > 2 else 20000
+    work = int(sys.argv[3]) if len(sys.argv) > 3 else 200
+    facades = []
+    for i in range(cores):
+        facade = Facade('core_%d' % i)
+        facade.register_mediator(WorkMediator('worker'))
+        facades.append(facade)
+
+    gil = getattr(sys, '_is_gil_enabled', lambda: True)()
+    total = cores * notifications
+    print('%d cores, %d notifications each, sum(range(%d)) per notification, GIL %s'
+          % (cores, notifications, work, 'enabled' if gil else 'disabled'))
+    for label, run in (('inline dispatch', inline), ('CoreActor mailboxes', actors)):
+        elapsed = run(facades, notifications, work)
+        print('  %-20s %8.0f notifications/s' % (label, total / elapsed))
+    for label, run in (('inline, no work', inline), ('CoreActor, no work', actors)):
+        elapsed = run(facades, notifications, 0)
+        print('  %-20s %8.2f us per notification' % (label, elapsed / total * 1e6))
+
+
+if __name__ == '__main__':
+    main()
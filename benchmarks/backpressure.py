@@ -0,0 +1,66 @@
+"""
+Backpressure benchmark.
+
+A producer sends notifications to a core whose mediator is slower than
+it, through an actor mailbox: compares the unbounded mailbox with
+bounded ones under each overflow policy, reporting how long the
+producer took, how many notifications were waiting when it was done
+and how many reached the mediator.
+
+    python benchmarks/backpressure.py [notifications] [max_pending] [work]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from puremvc_multicore.patterns.facade import Facade
+from puremvc_multicore.patterns.mediator import Mediator
+
+
+class SlowMediator(Mediator):
+    def list_notification_interests(self):
+        return ['price']
+
+    def handle_notification(self, note):
+        self.handled += 1
+        self.total = sum(range(note.get_type()))
+
+
+def run(key, notifications, work, max_pending, policy):
+    facade = Facade(key)
+    mediator = SlowMediator('slow')
+    mediator.handled = 0
+    facade.register_mediator(mediator)
+    actor = facade.start_actor(max_pending, policy)
+    body = bytes(1024)
+    start = time.perf_counter()
+    for i in range(notifications):
+        # a few symbols, so that the coalescing policy has something to merge
+        facade.send_notification('price', body, work + i % 8)
+    produced = time.perf_counter() - start
+    waiting = actor.pending()
+    actor.flush()
+    elapsed = time.perf_counter() - start
+    stats = actor.stats()
+    Facade.remove_core(key)
+    return produced, waiting, stats.get('high_water', waiting), mediator.handled, elapsed
+
+
+def main():
+    notifications = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    max_pending = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    work = int(sys.argv[3]) if len(sys.argv) > 3 else 300
+    print('%d notifications of 1 KiB, bounded mailboxes of %d' % (notifications, max_pending))
+    print('  %-12s %10s %10s %10s %10s %10s' % ('policy', 'producer', 'waiting', 'high water', 'handled', 'total'))
+    cases = [('unbounded', None, 'block')] + [(policy, max_pending, policy) for policy in
+                                              ('block', 'drop_oldest', 'drop_newest', 'coalesce')]
+    for label, bound, policy in cases:
+        produced, waiting, high_water, handled, elapsed = run(label, notifications, work, bound, policy)
+        print('  %-12s %8.0fms %10d %10d %10d %8.0fms'
+              % (label, produced * 1e3, waiting, high_water, handled, elapsed * 1e3))
+
+
+if __name__ == '__main__':
+    main()
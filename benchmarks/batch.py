@@ -0,0 +1,65 @@
+"""
+Bulk update benchmark.
+
+Times a command-like loop updating records through a Proxy that sends
+a notification per change, with mediators re-rendering on each one,
+without and with Facade.batch(merge=True).
+
+    python benchmarks/batch.py [records] [mediators]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from puremvc_multicore.patterns.facade import Facade
+from puremvc_multicore.patterns.mediator import Mediator
+from puremvc_multicore.patterns.proxy import Proxy
+
+
+class RecordsProxy(Proxy):
+    def update(self, index, value):
+        self.data[index] = value
+        self.send_notification('records_changed', self.data)
+
+
+class TableMediator(Mediator):
+    def list_notification_interests(self):
+        return ['records_changed']
+
+    def handle_notification(self, note):
+        # stand-in for re-rendering a view of the records
+        self.view_component = sum(note.get_body()[:200])
+
+
+def update(proxy, records):
+    for i in range(records):
+        proxy.update(i, i)
+
+
+def main():
+    records = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    mediators = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    facade = Facade('batch')
+    proxy = RecordsProxy('records', [0] * records)
+    facade.register_proxy(proxy)
+    for i in range(mediators):
+        facade.register_mediator(TableMediator('table_%d' % i))
+
+    start = time.perf_counter()
+    update(proxy, records)
+    plain = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with facade.batch(merge=True):
+        update(proxy, records)
+    batched = time.perf_counter() - start
+
+    print('%d updates, %d mediators' % (records, mediators))
+    print('  unbatched:      %8.1f ms' % (plain * 1e3))
+    print('  merged batch:   %8.1f ms' % (batched * 1e3))
+
+
+if __name__ == '__main__':
+    main()
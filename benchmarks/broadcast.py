@@ -0,0 +1,70 @@
+"""
+Cross-core broadcast benchmark.
+
+Many cores, few of them interested in a config reload: compares
+iterating IFacade.instance_map and calling send_notification on every
+Facade with Facade.broadcast, which creates the notification once and
+visits only the interested cores.
+
+    python benchmarks/broadcast.py [cores] [interested_every] [broadcasts]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from puremvc_multicore.interfaces import IFacade
+from puremvc_multicore.patterns.facade import Facade
+from puremvc_multicore.patterns.mediator import Mediator
+
+
+class ConfigMediator(Mediator):
+    def list_notification_interests(self):
+        return ['config_reload']
+
+    def handle_notification(self, note):
+        self.config = note.get_body()
+
+
+class OtherMediator(Mediator):
+    def list_notification_interests(self):
+        return ['other_%d' % i for i in range(5)]
+
+
+def timed(function, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    cores = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    interested_every = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    broadcasts = int(sys.argv[3]) if len(sys.argv) > 3 else 50
+
+    start = time.perf_counter()
+    for i in range(cores):
+        facade = Facade('core_%d' % i)
+        facade.register_mediator(OtherMediator('other'))
+        if i % interested_every == 0:
+            facade.register_mediator(ConfigMediator('config'))
+    setup = time.perf_counter() - start
+
+    def loop():
+        for facade in list(IFacade.instance_map.values()):
+            facade.send_notification('config_reload', {'debug': True})
+
+    def broadcast():
+        Facade.broadcast('config_reload', {'debug': True})
+
+    print('%d cores, 1 in %d interested (setup %.0f ms)' % (cores, interested_every, setup * 1e3))
+    print('  send_notification per core:  %8.2f ms' % (timed(loop, broadcasts) * 1e3))
+    # the first lookup indexes every core created since the last one
+    print('  Facade.broadcast, first:     %8.2f ms' % (timed(broadcast, 1) * 1e3))
+    print('  Facade.broadcast:            %8.2f ms' % (timed(broadcast, broadcasts) * 1e3))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Per-session core creation benchmark.
+
+Compares building a core through the Facade initializers with stamping
+it out of a template core with Facade.clone_core().
+
+    python benchmarks/clone_core.py [cores]
+"""
+import gc
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from puremvc_multicore.patterns.command import SimpleCommand
+from puremvc_multicore.patterns.facade import Facade
+from puremvc_multicore.patterns.mediator import Mediator
+from puremvc_multicore.patterns.proxy import Proxy
+
+COMMANDS = 100
+MEDIATORS = 30
+PROXIES = 20
+
+
+class SessionMediator(Mediator):
+    def list_notification_interests(self):
+        return ['note_%d' % (i % COMMANDS) for i in range(5)]
+
+
+class SessionFacade(Facade):
+    def initialize_controller(self):
+        super(SessionFacade, self).initialize_controller()
+        for i in range(COMMANDS):
+            self.register_command('note_%d' % i, SimpleCommand)
+
+    def initialize_model(self):
+        super(SessionFacade, self).initialize_model()
+        for i in range(PROXIES):
+            self.register_proxy_factory('proxy_%d' % i, lambda i=i: Proxy('proxy_%d' % i, []))
+
+    def initialize_view(self):
+        super(SessionFacade, self).initialize_view()
+        for i in range(MEDIATORS):
+            self.register_mediator(SessionMediator('mediator_%d' % i))
+
+
+def measure(create, cores):
+    keys = ['session_%d' % i for i in range(cores)]
+    # like timeit, keep collections of the growing heap out of the timings
+    gc.disable()
+    start = time.perf_counter()
+    for key in keys:
+        create(key)
+    elapsed = time.perf_counter() - start
+    gc.enable()
+    for key in keys:
+        Facade.remove_core(key)
+    return elapsed / cores
+
+
+def main():
+    cores = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    template = SessionFacade('template')
+    print('%d commands, %d mediators, %d proxy factories per core' % (COMMANDS, MEDIATORS, PROXIES))
+    print('  initializers:  %8.1f us per core' % (min(measure(SessionFacade, cores) for _ in range(3)) * 1e6))
+    print('  clone_core:    %8.1f us per core' % (min(measure(template.clone_core, cores) for _ in range(3)) * 1e6))
+
+
+if __name__ == '__main__':
+    main()
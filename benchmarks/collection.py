@@ -0,0 +1,66 @@
+"""
+Indexed collection benchmark.
+
+Looks records up by status and by a range of due dates in a list of
+dicts scanned in Python and in a CollectionProxy with a HashIndex and a
+SortedIndex, and measures the cost of an indexed update.
+
+    python benchmarks/collection.py [records] [lookups]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from puremvc_multicore.patterns.collection import CollectionProxy, HashIndex, SortedIndex
+from puremvc_multicore.patterns.proxy import Proxy
+
+STATUSES = ['status_%d' % i for i in range(100)]
+
+
+def make_records(count):
+    rng = random.Random(1)
+    return [{'id': i, 'status': rng.choice(STATUSES), 'due': rng.randrange(100000)} for i in range(count)]
+
+
+def timed(function, repeat):
+    start = time.perf_counter()
+    for i in range(repeat):
+        function(i)
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    lookups = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    records = make_records(count)
+    plain = Proxy('plain', records)
+    indexed = CollectionProxy('indexed', records, indexes={'status': HashIndex('status'), 'due': SortedIndex('due')})
+
+    def scan_status(i):
+        return [r for r in plain.get_data() if r['status'] == STATUSES[i % 100]]
+
+    def scan_due(i):
+        return [r for r in plain.get_data() if 500 * i <= r['due'] <= 500 * i + 100]
+
+    def find_status(i):
+        return indexed.find('status', STATUSES[i % 100])
+
+    def range_due(i):
+        return indexed.range('due', 500 * i, 500 * i + 100)
+
+    def update(i):
+        indexed.update(i, {'status': STATUSES[(i + 1) % 100], 'due': i})
+
+    print('%d records' % count)
+    print('  status ==, scan:          %10.1f us' % (timed(scan_status, lookups) * 1e6))
+    print('  status ==, HashIndex:     %10.1f us' % (timed(find_status, lookups) * 1e6))
+    print('  due range, scan:          %10.1f us' % (timed(scan_due, lookups) * 1e6))
+    print('  due range, SortedIndex:   %10.1f us' % (timed(range_due, lookups) * 1e6))
+    print('  indexed update:           %10.1f us' % (timed(update, 10000) * 1e6))
+
+
+if __name__ == '__main__':
+    main()
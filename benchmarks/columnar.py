@@ -0,0 +1,71 @@
+"""
+Columnar proxy benchmark.
+
+Filters and aggregates a table of orders held as a list of dicts in a
+plain Proxy, looping in Python, and as columns in a ColumnarProxy, with
+NumPy when it is installed and with array.array otherwise.
+
+    python benchmarks/columnar.py [rows] [repeat]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from puremvc_multicore.patterns import columnar
+from puremvc_multicore.patterns.columnar import ColumnarProxy
+from puremvc_multicore.patterns.proxy import Proxy
+
+CITIES = ['Oslo', 'Rome', 'Lima', 'Kyiv', 'Pune']
+
+
+def make_records(rows):
+    rng = random.Random(1)
+    return [{'id': i, 'city': rng.choice(CITIES), 'amount': rng.random() * 100} for i in range(rows)]
+
+
+def plain_query(proxy):
+    matching = [record for record in proxy.get_data() if record['city'] == 'Oslo' and record['amount'] > 50]
+    total = sum(record['amount'] for record in matching)
+    top = sorted(proxy.get_data(), key=lambda record: record['amount'], reverse=True)[:10]
+    return len(matching), total, top
+
+
+def columnar_query(proxy):
+    mask = proxy.where(('city', '==', 'Oslo'), ('amount', '>', 50))
+    total = proxy.aggregate('amount', 'sum', mask)
+    top = proxy.records(proxy.order('amount', reverse=True)[:10])
+    return proxy.count(mask), total, top
+
+
+def timed(query, proxy, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        query(proxy)
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    records = make_records(rows)
+
+    print('%d rows: filter, sum and top 10' % rows)
+    print('  list of dicts:            %8.2f ms' % (timed(plain_query, Proxy('plain', records), repeat) * 1e3))
+    if columnar.numpy is not None:
+        proxy = ColumnarProxy('numpy')
+        proxy.set_records(records)
+        print('  ColumnarProxy, NumPy:     %8.2f ms' % (timed(columnar_query, proxy, repeat) * 1e3))
+    numpy, columnar.numpy = columnar.numpy, None
+    try:
+        proxy = ColumnarProxy('array')
+        proxy.set_records(records)
+        print('  ColumnarProxy, array:     %8.2f ms' % (timed(columnar_query, proxy, repeat) * 1e3))
+    finally:
+        columnar.numpy = numpy
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""
+Computed proxy benchmark.
+
+An aggregate over an append-only list of orders, read once every few
+appends: compares a command recomputing it eagerly after every change
+with a ComputedProxy recomputing it lazily, from scratch or from the
+appended orders only.
+
+    python benchmarks/computed.py [orders] [appends] [reads_every]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from puremvc_multicore.patterns.computed import AppendOnlyProxy, ComputedProxy
+from puremvc_multicore.patterns.facade import Facade
+from puremvc_multicore.patterns.proxy import Proxy
+
+
+class TotalProxy(ComputedProxy):
+    DEPENDENCIES = ('orders',)
+
+    def compute(self, orders):
+        return sum(orders)
+
+
+class IncrementalTotalProxy(TotalProxy):
+    def update_appended(self, value, appended):
+        return value + sum(appended['orders'])
+
+
+def eager(orders, appends, reads_every):
+    facade = Facade('eager')
+    facade.register_proxy(Proxy('orders', list(range(orders))))
+    facade.register_proxy(Proxy('total', sum(range(orders))))
+    orders_proxy = facade.retrieve_proxy('orders')
+    total = facade.retrieve_proxy('total')
+    start = time.perf_counter()
+    for i in range(appends):
+        orders_proxy.get_data().append(i)
+        total.set_data(sum(orders_proxy.get_data()))
+        if i % reads_every == 0:
+            total.get_data()
+    return (time.perf_counter() - start) / appends
+
+
+def computed(cls, orders, appends, reads_every):
+    facade = Facade(cls.__name__)
+    facade.register_proxy(AppendOnlyProxy('orders', list(range(orders))))
+    facade.register_proxy(cls('total'))
+    orders_proxy = facade.retrieve_proxy('orders')
+    total = facade.retrieve_proxy('total')
+    total.get_data()
+    start = time.perf_counter()
+    for i in range(appends):
+        orders_proxy.append(i)
+        if i % reads_every == 0:
+            total.get_data()
+    return (time.perf_counter() - start) / appends
+
+
+def cached_read(reads):
+    facade = Facade('cached')
+    facade.register_proxy(AppendOnlyProxy('orders', [1, 2, 3]))
+    facade.register_proxy(TotalProxy('total'))
+    total = facade.retrieve_proxy('total')
+    start = time.perf_counter()
+    for _ in range(reads):
+        total.get_data()
+    return (time.perf_counter() - start) / reads
+
+
+def main():
+    orders = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    appends = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    reads_every = int(sys.argv[3]) if len(sys.argv) > 3 else 10
+
+    print('%d orders, %d appends, one read every %d' % (orders, appends, reads_every))
+    print('  eager recompute:     %8.2f us per append' % (eager(orders, appends, reads_every) * 1e6))
+    print('  lazy recompute:      %8.2f us per append' % (computed(TotalProxy, orders, appends, reads_every) * 1e6))
+    print('  lazy incremental:    %8.2f us per append' % (computed(IncrementalTotalProxy, orders, appends, reads_every) * 1e6))
+    print('  unchanged get_data:  %8.2f us' % (cached_read(100000) * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""
+Notification dispatch benchmark.
+
+Times View.notify_observers and Controller.execute_command in a core
+with many notification names, sending them by plain string name and by
+name interned in the notification registry. Then times a name
+multiplexed over many types, with mediators filtering on the type in
+handle_notification against mediators subscribed to (name, type).
+
+    python benchmarks/dispatch.py [number]
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from puremvc_multicore.patterns.command import SimpleCommand
+from puremvc_multicore.patterns.facade import Facade
+from puremvc_multicore.patterns.mediator import Mediator
+from puremvc_multicore.patterns.observer import Notification, notification_registry
+
+NAMES = 500
+TYPES = 20
+
+
+class NoopCommand(SimpleCommand):
+    def execute(self, note):
+        pass
+
+
+class BenchMediator(Mediator):
+    def list_notification_interests(self):
+        return ['note_%d' % i for i in range(0, NAMES, 7)]
+
+    def handle_notification(self, note):
+        pass
+
+
+class FilteringMediator(Mediator):
+    def list_notification_interests(self):
+        return ['multiplexed']
+
+    def handle_notification(self, note):
+        if note.get_type() == self.view_component:
+            pass
+
+
+class TypedMediator(Mediator):
+    def list_notification_interests(self):
+        return [('multiplexed', self.view_component)]
+
+    def handle_notification(self, note):
+        pass
+
+
+def main():
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 500000
+    facade = Facade('dispatch')
+    for i in range(NAMES):
+        facade.register_command('note_%d' % i, NoopCommand)
+    facade.register_mediator(BenchMediator('bench'))
+
+    plain = Notification('note_343')
+    interned = Notification(notification_registry.intern('note_343'))
+    namespace = {'view': facade.view, 'controller': facade.controller, 'plain': plain, 'interned': interned}
+    for label, statement in [
+        ('View.notify_observers, plain', 'view.notify_observers(plain)'),
+        ('View.notify_observers, interned', 'view.notify_observers(interned)'),
+        ('Controller.execute_command, plain', 'controller.execute_command(plain)'),
+        ('Controller.execute_command, interned', 'controller.execute_command(interned)'),
+    ]:
+        best = min(timeit.repeat(statement, globals=namespace, number=number, repeat=5))
+        print('%-38s %7.1f ns' % (label, best / number * 1e9))
+
+    filtering = Facade('dispatch_filtering')
+    typed = Facade('dispatch_typed')
+    for i in range(TYPES):
+        filtering.register_mediator(FilteringMediator('mediator_%d' % i, 'type_%d' % i))
+        typed.register_mediator(TypedMediator('mediator_%d' % i, 'type_%d' % i))
+    namespace = {'filtering': filtering.view, 'typed': typed.view, 'note': Notification('multiplexed', None, 'type_7')}
+    for label, statement in [
+        ('%d types, filter in handler' % TYPES, 'filtering.notify_observers(note)'),
+        ('%d types, (name, type) interests' % TYPES, 'typed.notify_observers(note)'),
+    ]:
+        best = min(timeit.repeat(statement, globals=namespace, number=number // 10, repeat=5))
+        print('%-38s %7.1f ns' % (label, best / (number // 10) * 1e9))
+
+
+if __name__ == '__main__':
+    main()
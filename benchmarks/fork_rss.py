@@ -0,0 +1,96 @@
+"""
+Per-worker memory benchmark for pre-forked cores (Linux only).
+
+Builds cores in the master, forks workers that dispatch notifications
+through every core and run the garbage collector, and reports how much
+memory each worker had to copy (Private_Dirty) with and without
+Facade.prepare_for_fork().
+
+    python benchmarks/fork_rss.py [cores] [workers]
+"""
+import gc
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from puremvc_multicore.patterns.facade import Facade
+from puremvc_multicore.patterns.mediator import Mediator
+from puremvc_multicore.patterns.proxy import Proxy
+
+MEDIATORS = 50
+PROXIES = 20
+
+
+class BenchMediator(Mediator):
+    def list_notification_interests(self):
+        return ['note_%d' % (i % 10) for i in range(5)]
+
+    def handle_notification(self, note):
+        pass
+
+
+def build_core(key):
+    facade = Facade(key)
+    for i in range(PROXIES):
+        facade.register_proxy(Proxy('proxy_%d' % i, [{'id': n, 'name': 'row %d' % n} for n in range(50)]))
+    for i in range(MEDIATORS):
+        facade.register_mediator(BenchMediator('mediator_%d' % i))
+
+
+def private_dirty_kb():
+    with open('/proc/self/smaps_rollup') as f:
+        for line in f:
+            if line.startswith('Private_Dirty:'):
+                return int(line.split()[1])
+
+
+def worker(keys, write):
+    before = private_dirty_kb()
+    for _ in range(3):
+        for key in keys:
+            facade = Facade.get_instance(key)
+            for i in range(10):
+                facade.send_notification('note_%d' % i)
+        gc.collect()
+    os.write(write, ('%d\n' % (private_dirty_kb() - before)).encode())
+    os._exit(0)
+
+
+def run(cores, workers, prepare):
+    read, write = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read)
+        # build the cores in a fresh master so both runs start alike
+        keys = ['core_%d' % i for i in range(cores)]
+        for key in keys:
+            build_core(key)
+        if prepare:
+            Facade.prepare_for_fork()
+        children = []
+        for _ in range(workers):
+            child = os.fork()
+            if child == 0:
+                worker(keys, write)
+            children.append(child)
+        for child in children:
+            os.waitpid(child, 0)
+        os._exit(0)
+    os.close(write)
+    os.waitpid(pid, 0)
+    with os.fdopen(read) as f:
+        copied = [int(line) for line in f]
+    return sum(copied) / float(len(copied))
+
+
+def main():
+    cores = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    print('%d cores, %d mediators and %d proxies each, %d workers' % (cores, MEDIATORS, PROXIES, workers))
+    print('  copied per worker:                   %8.0f kB' % run(cores, workers, False))
+    print('  copied per worker, prepare_for_fork: %8.0f kB' % run(cores, workers, True))
+
+
+if __name__ == '__main__':
+    main()
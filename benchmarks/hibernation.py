@@ -0,0 +1,64 @@
+"""
+Core hibernation benchmark.
+
+Creates many tenant cores behind a HibernatingCoreMap keeping only a few
+of them resident, then reports the cost of hibernating and restoring a
+core and of looking up a resident one.
+
+    python benchmarks/hibernation.py [cores] [resident]
+"""
+import os
+import sys
+import tempfile
+import time
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from puremvc_multicore.patterns.facade import Facade
+from puremvc_multicore.patterns.hibernation import HibernatingCoreMap, SqliteCoreStore
+from puremvc_multicore.patterns.proxy import Proxy
+
+PROXIES = 10
+
+
+class TenantFacade(Facade):
+    def initialize_model(self):
+        super(TenantFacade, self).initialize_model()
+        for i in range(PROXIES):
+            self.register_proxy(Proxy('proxy_%d' % i, [{'id': n, 'name': 'row %d' % n} for n in range(50)]))
+
+
+def main():
+    cores = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    resident = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    directory = tempfile.mkdtemp()
+    cache = HibernatingCoreMap(SqliteCoreStore(os.path.join(directory, 'cores.db')), max_cores=resident)
+    cache.install()
+
+    keys = ['tenant_%d' % i for i in range(cores)]
+    start = time.perf_counter()
+    for key in keys:
+        TenantFacade(key)
+    create = (time.perf_counter() - start) / cores
+
+    # every lookup of an old key restores it and hibernates the least recently used one
+    start = time.perf_counter()
+    for key in keys[:cores - resident]:
+        Facade(key)
+    swap = (time.perf_counter() - start) / (cores - resident)
+
+    Facade('hot')
+    lookup = min(timeit.repeat("Facade('hot')", globals={'Facade': Facade}, number=100000, repeat=5)) / 100000
+
+    stats = cache.stats()
+    print('%d cores, %d resident, %d proxies each' % (cores, resident, PROXIES))
+    print('  create (with evictions):  %8.1f us per core' % (create * 1e6))
+    print('  restore + evict:          %8.1f us per core' % (swap * 1e6))
+    print('  resident lookup:          %8.1f ns' % (lookup * 1e9))
+    print('  snapshot size:            %8.0f bytes per core' % (stats['bytes_written'] / float(stats['evictions'])))
+    print('  stats: %r' % (stats,))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""
+Import-time benchmark.
+
+Runs ``python -X importtime -c "import <module>"`` in fresh interpreters
+with a warm bytecode cache and reports, per entry module, the best
+cumulative import time and which modules of the package got loaded.
+
+    python benchmarks/import_time.py [runs] [module ...]
+"""
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+MODULES = [
+    'puremvc_multicore',
+    'puremvc_multicore.patterns.proxy',
+    'puremvc_multicore.patterns.mediator',
+    'puremvc_multicore.patterns.command',
+    'puremvc_multicore.patterns.facade',
+]
+
+
+def import_times(module, cache_dir):
+    """
+    Import C{module} in a fresh interpreter.
+
+    @return: a dict mapping each imported module to its cumulative import time in microseconds
+    """
+    env = dict(os.environ, PYTHONPATH=SRC, PYTHONPYCACHEPREFIX=cache_dir)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    output = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import ' + module],
+                            env=env, stderr=subprocess.PIPE, check=True).stderr.decode()
+    times = {}
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    modules = sys.argv[2:] or MODULES
+    cache_dir = tempfile.mkdtemp()
+    try:
+        for module in modules:
+            import_times(module, cache_dir)
+            best = min(import_times(module, cache_dir)[module] for _ in range(runs))
+            loaded = sorted(name for name in import_times(module, cache_dir) if name.startswith('puremvc_multicore'))
+            print('%-40s %8.2f ms  %d package modules' % (module, best / 1000.0, len(loaded)))
+    finally:
+        shutil.rmtree(cache_dir)
+
+
+if __name__ == '__main__':
+    main()
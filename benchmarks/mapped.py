@@ -0,0 +1,108 @@
+"""
+Memory-mapped proxy benchmark (Linux only).
+
+Workers each register a proxy of a reference dataset of fixed-size
+records and read a sample of it: compares loading the file into the
+proxy at on_register time with a MappedProxy, reporting the time to the
+first record and the memory private to each worker.
+
+    python benchmarks/mapped.py [megabytes] [workers]
+"""
+import os
+import random
+import struct
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from puremvc_multicore.patterns.facade import Facade
+from puremvc_multicore.patterns.mapped import MappedProxy
+from puremvc_multicore.patterns.proxy import Proxy
+
+RECORD = struct.Struct('<qdd')
+
+
+class LoadedProxy(Proxy):
+    def __init__(self, proxy_name, path):
+        super(LoadedProxy, self).__init__(proxy_name)
+        self.path = path
+
+    def on_register(self):
+        with open(self.path, 'rb') as f:
+            self.set_data(f.read())
+
+    def record(self, index):
+        return RECORD.unpack_from(self.data, index * RECORD.size)
+
+
+def private_kb():
+    total = 0
+    with open('/proc/self/smaps_rollup') as f:
+        for line in f:
+            if line.startswith(('Private_Clean:', 'Private_Dirty:')):
+                total += int(line.split()[1])
+    return total
+
+
+def worker(make_proxy, count, write):
+    before = private_kb()
+    start = time.perf_counter()
+    facade = Facade('worker')
+    facade.register_proxy(make_proxy())
+    proxy = facade.retrieve_proxy('reference')
+    proxy.record(0)
+    first = time.perf_counter() - start
+    rng = random.Random(os.getpid())
+    for _ in range(10000):
+        proxy.record(rng.randrange(count))
+    os.write(write, ('%f %d\n' % (first, private_kb() - before)).encode())
+    os._exit(0)
+
+
+def run(make_proxy, count, workers):
+    read, write = os.pipe()
+    children = []
+    for _ in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            os.close(read)
+            worker(make_proxy, count, write)
+        children.append(pid)
+    os.close(write)
+    for pid in children:
+        os.waitpid(pid, 0)
+    with os.fdopen(read) as f:
+        results = [line.split() for line in f.read().split('\n') if line]
+    first = sum(float(result[0]) for result in results) / len(results)
+    private = sum(int(result[1]) for result in results) / len(results)
+    return first, private
+
+
+def main():
+    megabytes = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    count = megabytes * 1024 * 1024 // RECORD.size
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, 'reference.bin')
+    try:
+        with open(path, 'wb') as f:
+            chunk = b''.join(RECORD.pack(i, i * 0.5, i * 0.25) for i in range(65536))
+            for _ in range(count // 65536):
+                f.write(chunk)
+        count = count // 65536 * 65536
+
+        print('%d MB, %d records, %d workers, 10000 random reads each' % (megabytes, count, workers))
+        for label, make_proxy in (('loaded at on_register', lambda: LoadedProxy('reference', path)),
+                                  ('MappedProxy', lambda: MappedProxy('reference', path, RECORD.format))):
+            first, private = run(make_proxy, count, workers)
+            print('  %-22s first record %8.2f ms, private per worker %8.1f MB'
+                  % (label, first * 1e3, private / 1024.0))
+    finally:
+        os.remove(path)
+        os.rmdir(directory)
+
+
+if __name__ == '__main__':
+    main()
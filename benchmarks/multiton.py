@@ -0,0 +1,37 @@
+"""
+Multiton lookup benchmark.
+
+Compares repeated lookups of an existing core through Facade(key),
+Facade.get_instance(key) and Notifier.facade against a bare dict access.
+
+    python benchmarks/multiton.py [number]
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from puremvc_multicore.interfaces import IFacade
+from puremvc_multicore.patterns.facade import Facade
+from puremvc_multicore.patterns.proxy import Proxy
+
+
+def main():
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    Facade('bench')
+    proxy = Proxy('bench')
+    proxy.initialize_notifier('bench')
+    namespace = {'Facade': Facade, 'instance_map': IFacade.instance_map, 'proxy': proxy}
+    for label, statement in [
+        ('dict access', "instance_map['bench']"),
+        ('Facade.get_instance(key)', "Facade.get_instance('bench')"),
+        ('Notifier.facade', 'proxy.facade'),
+        ('Facade(key)', "Facade('bench')"),
+    ]:
+        best = min(timeit.repeat(statement, globals=namespace, number=number, repeat=5))
+        print('%-28s %7.1f ns' % (label, best / number * 1e9))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""
+Process-per-core benchmark.
+
+Cores doing CPU-bound work for each notification: compares handling
+them in this process with running each core in a child process through
+Facade.spawn_core, and measures the cost of a notification sent through
+the pipe one at a time or batched, and of sending a large body with
+and without out-of-band buffers. Only with as many CPUs as cores can
+the child processes run in parallel.
+
+    python benchmarks/process.py [cores] [notifications] [work]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from puremvc_multicore.patterns.facade import Facade
+from puremvc_multicore.patterns.mediator import Mediator
+
+
+class WorkMediator(Mediator):
+    def list_notification_interests(self):
+        return ['work', 'data']
+
+    def handle_notification(self, note):
+        if note.get_name() == 'work':
+            self.total = sum(range(note.get_body()))
+        else:
+            self.size = len(note.get_body())
+
+
+class WorkFacade(Facade):
+    def initialize_view(self):
+        super(WorkFacade, self).initialize_view()
+        self.register_mediator(WorkMediator('worker'))
+
+
+def run_local(facades, notifications, work):
+    start = time.perf_counter()
+    for facade in facades:
+        for _ in range(notifications):
+            facade.send_notification('work', work)
+    return time.perf_counter() - start
+
+
+def run_remote(facades, notifications, work):
+    start = time.perf_counter()
+    for facade in facades:
+        with facade.batch():
+            for _ in range(notifications):
+                facade.send_notification('work', work)
+    for facade in facades:
+        # answered once the notifications before it are handled
+        facade.has_proxy('sync')
+    return time.perf_counter() - start
+
+
+def main():
+    cores = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    notifications = int(sys.argv[2]) if len(sys.argv) > 2 else 5000
+    work = int(sys.argv[3]) if len(sys.argv) > 3 else 2000
+    total = cores * notifications
+    print('%d cores, %d notifications each, sum(range(%d)) per notification, %d CPUs'
+          % (cores, notifications, work, os.cpu_count()))
+
+    local = [WorkFacade('local_%d' % i) for i in range(cores)]
+    elapsed = run_local(local, notifications, work)
+    print('  %-28s %8.0f notifications/s' % ('in this process', total / elapsed))
+    remote = [WorkFacade.spawn_core('remote_%d' % i) for i in range(cores)]
+    elapsed = run_remote(remote, notifications, work)
+    print('  %-28s %8.0f notifications/s' % ('one child process per core', total / elapsed))
+
+    facade = remote[0]
+    for label, batch_size in (('one message each', 1), ('batched by 256', 256)):
+        facade.batch_size = batch_size
+        start = time.perf_counter()
+        with facade.batch():
+            for _ in range(notifications):
+                facade.send_notification('work', 0)
+        facade.has_proxy('sync')
+        elapsed = time.perf_counter() - start
+        print('  %-28s %8.2f us per notification' % ('empty, ' + label, elapsed / notifications * 1e6))
+
+    body = bytearray(16 * 1024 * 1024)
+    for label, threshold in (('16 MB body, in band', len(body) + 1), ('16 MB body, out of band', 64 * 1024)):
+        facade.out_of_band_bytes = threshold
+        start = time.perf_counter()
+        for _ in range(20):
+            facade.send_notification('data', body)
+        facade.has_proxy('sync')
+        elapsed = time.perf_counter() - start
+        print('  %-28s %8.2f ms per notification' % (label, elapsed / 20 * 1e3))
+
+    for facade in remote:
+        facade.stop()
+
+
+if __name__ == '__main__':
+    main()
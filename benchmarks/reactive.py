@@ -0,0 +1,78 @@
+"""
+Reactive proxy fan-out benchmark.
+
+A wide model with one mediator per field: compares a proxy broadcasting
+a change notification that every mediator filters with a ReactiveProxy
+notifying only the mediators that read the changed field.
+
+    python benchmarks/reactive.py [fields] [changes]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from puremvc_multicore.patterns.facade import Facade
+from puremvc_multicore.patterns.mediator import Mediator
+from puremvc_multicore.patterns.proxy import Proxy
+from puremvc_multicore.patterns.reactive import ReactiveMediator, ReactiveProxy
+
+
+class BroadcastProxy(Proxy):
+    def set(self, field, value):
+        self.data[field] = value
+        self.send_notification('model_changed', field)
+
+
+class BroadcastMediator(Mediator):
+    def list_notification_interests(self):
+        return ['model_changed']
+
+    def handle_notification(self, note):
+        if note.get_body() == self.view_component:
+            self.value = self.facade.retrieve_proxy('model').get_data()[self.view_component]
+
+
+class FieldMediator(ReactiveMediator):
+    def list_notification_interests(self):
+        return ['render']
+
+    def handle_notification(self, note):
+        self.value = self.facade.retrieve_proxy('model').get(self.view_component)
+
+
+def run(facade, proxy, fields, changes):
+    start = time.perf_counter()
+    for i in range(changes):
+        proxy.set('field_%d' % (i % fields), i)
+    return (time.perf_counter() - start) / changes
+
+
+def main():
+    fields = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    changes = int(sys.argv[2]) if len(sys.argv) > 2 else 20000
+    data = dict(('field_%d' % i, 0) for i in range(fields))
+
+    broadcast = Facade('broadcast')
+    proxy = BroadcastProxy('model', dict(data))
+    broadcast.register_proxy(proxy)
+    for i in range(fields):
+        broadcast.register_mediator(BroadcastMediator('mediator_%d' % i, 'field_%d' % i))
+    plain = run(broadcast, proxy, fields, changes)
+
+    reactive = Facade('reactive')
+    proxy = ReactiveProxy('model', dict(data))
+    reactive.register_proxy(proxy)
+    for i in range(fields):
+        reactive.register_mediator(FieldMediator('mediator_%d' % i, 'field_%d' % i))
+    reactive.send_notification('render')
+    tracked = run(reactive, proxy, fields, changes)
+
+    print('%d fields, one mediator each' % fields)
+    print('  broadcast + filter:  %8.1f us per change' % (plain * 1e6))
+    print('  ReactiveProxy:       %8.1f us per change' % (tracked * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""
+Request/response round-trip benchmark.
+
+Compares a command answering through a reply notification, caught by a
+mediator registered for it, with Facade.request() answered through
+respond() on the request itself.
+
+    python benchmarks/request.py [number]
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from puremvc_multicore.patterns.command import SimpleCommand
+from puremvc_multicore.patterns.facade import Facade
+from puremvc_multicore.patterns.mediator import Mediator
+
+
+class ReplyCommand(SimpleCommand):
+    def execute(self, note):
+        self.send_notification('double_reply', note.get_body() * 2)
+
+
+class RespondCommand(SimpleCommand):
+    def execute(self, note):
+        self.respond(note, note.get_body() * 2)
+
+
+class ReplyMediator(Mediator):
+    result = None
+
+    def list_notification_interests(self):
+        return ['double_reply']
+
+    def handle_notification(self, note):
+        self.result = note.get_body()
+
+
+def main():
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    facade = Facade('request')
+    facade.register_command('double', ReplyCommand)
+    facade.register_command('double_request', RespondCommand)
+    mediator = ReplyMediator('reply')
+    facade.register_mediator(mediator)
+    # other observers of the reply name a real application would have
+    for i in range(5):
+        facade.register_mediator(ReplyMediator('other_%d' % i))
+
+    namespace = {'facade': facade, 'mediator': mediator}
+    for label, statement in [
+        ('reply notification', "facade.send_notification('double', 21); mediator.result"),
+        ('request/respond', "facade.request('double_request', 21).result()"),
+    ]:
+        best = min(timeit.repeat(statement, globals=namespace, number=number, repeat=5))
+        print('%-20s %7.2f us' % (label, best / number * 1e6))
+
+
+if __name__ == '__main__':
+    main()
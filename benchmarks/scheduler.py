@@ -0,0 +1,70 @@
+"""
+Scheduled notification benchmark.
+
+Schedules timers across many cores on one Scheduler and times
+scheduling, cancelling and sending them, next to the cost of starting
+one threading.Timer per delayed notification.
+
+    python benchmarks/scheduler.py [timers] [cores]
+"""
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from puremvc_multicore.patterns.facade import Facade
+from puremvc_multicore.patterns.scheduler import Scheduler
+
+
+class Clock(object):
+    now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def main():
+    timers = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    cores = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    clock = Clock()
+    scheduler = Scheduler(clock=clock)
+    facades = []
+    for i in range(cores):
+        facade = Facade('scheduled_%d' % i)
+        facade.scheduler = scheduler
+        facades.append(facade)
+
+    start = time.perf_counter()
+    handles = [facades[i % cores].send_notification_later(1 + i % 1000 / 100.0, 'tick') for i in range(timers)]
+    schedule = (time.perf_counter() - start) / timers
+
+    start = time.perf_counter()
+    for handle in handles[::2]:
+        handle.cancel()
+    cancel = (time.perf_counter() - start) / len(handles[::2])
+
+    clock.now = 100
+    start = time.perf_counter()
+    sent = scheduler.run_pending()
+    fire = (time.perf_counter() - start) / sent
+
+    count = 1000
+    start = time.perf_counter()
+    threads = [threading.Timer(3600, lambda: None) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    thread_timer = (time.perf_counter() - start) / count
+    for thread in threads:
+        thread.cancel()
+
+    print('%d timers over %d cores' % (timers, cores))
+    print('  schedule:                 %6.2f us per timer' % (schedule * 1e6))
+    print('  cancel:                   %6.2f us per timer' % (cancel * 1e6))
+    print('  send when due:            %6.2f us per timer' % (fire * 1e6))
+    print('  threading.Timer start:    %6.2f us per timer' % (thread_timer * 1e6))
+
+
+if __name__ == '__main__':
+    main()
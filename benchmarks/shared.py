@@ -0,0 +1,60 @@
+"""
+Shared proxy benchmark.
+
+Many tenant cores each need the same reference data: compares every
+core registering its own Proxy loaded with the data with every core
+mounting a SharedProxy of data loaded once, by memory allocated
+(tracemalloc) and setup time.
+
+    python benchmarks/shared.py [cores] [entries]
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from puremvc_multicore.patterns.facade import Facade
+from puremvc_multicore.patterns.proxy import Proxy
+from puremvc_multicore.patterns.shared import SharedProxyRegistry
+
+
+def load_reference(entries):
+    return dict(('code_%d' % i, {'name': 'Entry %d' % i, 'rate': i * 0.01}) for i in range(entries))
+
+
+def run(cores, entries, setup):
+    tracemalloc.start()
+    start = time.perf_counter()
+    for i in range(cores):
+        setup(Facade('core_%d' % i), entries)
+    elapsed = time.perf_counter() - start
+    current = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    for i in range(cores):
+        Facade.remove_core('core_%d' % i)
+    return elapsed, current
+
+
+def main():
+    cores = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    entries = int(sys.argv[2]) if len(sys.argv) > 2 else 10000
+
+    def own_copy(facade, entries):
+        facade.register_proxy(Proxy('reference', load_reference(entries)))
+
+    registry = SharedProxyRegistry()
+    registry.register('reference', factory=lambda: load_reference(entries))
+
+    def mounted(facade, entries):
+        registry.mount(facade, 'reference')
+
+    print('%d cores, %d reference entries' % (cores, entries))
+    for label, setup in (('own Proxy per core', own_copy), ('SharedProxy mounts', mounted)):
+        elapsed, memory = run(cores, entries, setup)
+        print('  %-20s %8.1f ms setup, %8.1f MB allocated' % (label, elapsed * 1e3, memory / 1048576.0))
+
+
+if __name__ == '__main__':
+    main()
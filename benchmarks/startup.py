@@ -0,0 +1,94 @@
+"""
+Cold-start benchmark for command registration.
+
+Generates a package of command modules, then times, in fresh
+interpreters, creating a Facade whose initialize_controller registers
+every command either by class (importing all modules up front) or by
+dotted import path (importing them on first execution).
+
+    python benchmarks/startup.py [number_of_commands] [runs]
+"""
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+COMMAND_MODULE = '''
+from puremvc_multicore.patterns.command import SimpleCommand
+
+# stand-in for the imports and module level setup of a real command module
+TABLE = dict((str(i), i * i) for i in range(2000))
+
+
+class Command%(index)d(SimpleCommand):
+    def execute(self, note):
+        note.set_body(TABLE['%(index)d'])
+'''
+
+SCRIPT = '''
+import time
+start = time.perf_counter()
+from puremvc_multicore.patterns.facade import Facade
+
+class StartupFacade(Facade):
+    def initialize_controller(self):
+        super(StartupFacade, self).initialize_controller()
+%(registrations)s
+
+StartupFacade('startup')
+print(time.perf_counter() - start)
+'''
+
+
+def write_commands(directory, count):
+    package = os.path.join(directory, 'bench_commands')
+    os.mkdir(package)
+    open(os.path.join(package, '__init__.py'), 'w').close()
+    for index in range(count):
+        with open(os.path.join(package, 'command_%d.py' % index), 'w') as f:
+            f.write(COMMAND_MODULE % {'index': index})
+
+
+def registrations(count, lazy):
+    lines = []
+    for index in range(count):
+        if lazy:
+            lines.append("        self.register_command('note_%d', 'bench_commands.command_%d.Command%d')" % (index, index, index))
+        else:
+            lines.append("        from bench_commands.command_%d import Command%d" % (index, index))
+            lines.append("        self.register_command('note_%d', Command%d)" % (index, index))
+    return '\n'.join(lines)
+
+
+def measure(directory, count, lazy, runs):
+    script = SCRIPT % {'registrations': registrations(count, lazy)}
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([SRC, directory]), PYTHONDONTWRITEBYTECODE='')
+    timings = []
+    for _ in range(runs):
+        output = subprocess.check_output([sys.executable, '-c', script], env=env)
+        timings.append(float(output))
+    return min(timings)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    directory = tempfile.mkdtemp()
+    try:
+        write_commands(directory, count)
+        # populate the bytecode cache so both variants measure warm .pyc imports
+        measure(directory, count, False, 1)
+        eager = measure(directory, count, False, runs)
+        lazy = measure(directory, count, True, runs)
+    finally:
+        shutil.rmtree(directory)
+    print('%d commands, best of %d' % (count, runs))
+    print('  class references:  %8.2f ms' % (eager * 1000))
+    print('  dotted paths:      %8.2f ms' % (lazy * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+Change-tracking proxy benchmark.
+
+A large dict model changed a few keys at a time, mirrored by a
+mediator: compares sending the whole dict, which the mediator diffs
+against its previous copy, with a TrackingProxy sending only a Diff.
+
+    python benchmarks/tracking.py [keys] [changed_per_step] [steps]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from puremvc_multicore.patterns.facade import Facade
+from puremvc_multicore.patterns.mediator import Mediator
+from puremvc_multicore.patterns.proxy import Proxy
+from puremvc_multicore.patterns.tracking import TrackingProxy
+
+
+class FullBodyProxy(Proxy):
+    def update(self, values):
+        self.data.update(values)
+        self.send_notification('model_changed', dict(self.data))
+
+
+class DiffingMediator(Mediator):
+    def list_notification_interests(self):
+        return ['model_changed']
+
+    def handle_notification(self, note):
+        data = note.get_body()
+        previous = self.view_component
+        changed = [key for key, value in data.items() if previous.get(key) != value]
+        removed = [key for key in previous if key not in data]
+        self.view_component = data
+        self.changes = (changed, removed)
+
+
+class ApplyingMediator(Mediator):
+    def list_notification_interests(self):
+        return [TrackingProxy.CHANGED]
+
+    def handle_notification(self, note):
+        note.get_body().apply(self.view_component)
+
+
+def run(proxy, keys, changed, steps):
+    start = time.perf_counter()
+    for step in range(steps):
+        proxy.update(dict(('key_%d' % ((step * changed + i) % keys), step) for i in range(changed)))
+    return (time.perf_counter() - start) / steps
+
+
+def main():
+    keys = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    changed = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    steps = int(sys.argv[3]) if len(sys.argv) > 3 else 200
+    data = dict(('key_%d' % i, -1) for i in range(keys))
+
+    full = Facade('full')
+    full.register_proxy(FullBodyProxy('model', dict(data)))
+    full.register_mediator(DiffingMediator('mirror', dict(data)))
+    full_time = run(full.retrieve_proxy('model'), keys, changed, steps)
+
+    tracked = Facade('tracked')
+    tracked.register_proxy(TrackingProxy('model', dict(data)))
+    tracked.register_mediator(ApplyingMediator('mirror', dict(data)))
+    tracked_time = run(tracked.retrieve_proxy('model'), keys, changed, steps)
+    assert tracked.retrieve_mediator('mirror').view_component == tracked.retrieve_proxy('model').get_data()
+
+    print('%d keys, %d changed per step' % (keys, changed))
+    print('  full body + mediator diff:  %10.1f us per step' % (full_time * 1e6))
+    print('  TrackingProxy Diff:         %10.1f us per step' % (tracked_time * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""
+Watchdog benchmark.
+
+Times send_notification in a core of fast mediators without a watchdog,
+with one and with one sampling stacks, then the latency seen by the
+sender of a notification observed by a slow mediator before and after
+the watchdog demotes it.
+
+    python benchmarks/watchdog.py [mediators] [number]
+"""
+import os
+import sys
+import time
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from puremvc_multicore.patterns.facade import Facade
+from puremvc_multicore.patterns.mediator import Mediator
+
+
+class TickMediator(Mediator):
+    def list_notification_interests(self):
+        return ['tick']
+
+    def handle_notification(self, note):
+        self.last = note.get_body()
+
+
+class SlowMediator(TickMediator):
+    def handle_notification(self, note):
+        time.sleep(0.005)
+
+
+def main():
+    mediators = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    number = int(sys.argv[2]) if len(sys.argv) > 2 else 100000
+    facade = Facade('watched')
+    for i in range(mediators):
+        facade.register_mediator(TickMediator('tick_%d' % i))
+    send = lambda: facade.send_notification('tick', 1)
+
+    print('send_notification to %d mediators' % mediators)
+    print('  %-32s %8.1f ns' % ('no watchdog', min(timeit.repeat(send, number=number, repeat=3)) / number * 1e9))
+    watchdog = facade.start_watchdog(0.01)
+    print('  %-32s %8.1f ns' % ('watchdog', min(timeit.repeat(send, number=number, repeat=3)) / number * 1e9))
+    watchdog.stop()
+    watchdog = facade.start_watchdog(0.01, sample_interval=0.001)
+    print('  %-32s %8.1f ns' % ('watchdog sampling every 1 ms', min(timeit.repeat(send, number=number, repeat=3)) / number * 1e9))
+    watchdog.stop()
+
+    facade.register_mediator(SlowMediator('slow'))
+    watchdog = facade.start_watchdog(0.002, demote='async', strikes=3)
+    latencies = []
+    for _ in range(6):
+        start = time.perf_counter()
+        send()
+        latencies.append((time.perf_counter() - start) * 1e3)
+    print('sender latency with a 5 ms mediator, demoted after 3 strikes:')
+    print('  ' + ' '.join('%.2fms' % latency for latency in latencies))
+    print('  offenders: %r' % (watchdog.worst_offenders(),))
+    watchdog.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+"""
+ PureMVC Multicore Port, pep8 by Oleg Butovich <obutovich@gmail.com>
+ PureMVC Python Port by Toby de Havilland <toby.de.havilland@puremvc.org>
+ PureMVC - Copyright(c) 2006-08 Futurescale, Inc., Some rights reserved.
+ Your reuse is governed by the Creative Commons Attribution 3.0 License
+
+ Submodules and the commonly used classes are loaded on first access,
+ so importing the package itself costs next to nothing.
+"""
+__all__ = [
+    'core', 'interfaces', 'patterns',
+    'Controller', 'Model', 'View',
+    'Facade', 'Notifier', 'Observer', 'Notification',
+    'Proxy', 'Mediator', 'SimpleCommand', 'MacroCommand',
+]
+
+_lazy_attributes = {
+    'Controller': 'puremvc_multicore.core',
+    'Model': 'puremvc_multicore.core',
+    'View': 'puremvc_multicore.core',
+    'Facade': 'puremvc_multicore.patterns.facade',
+    'Notifier': 'puremvc_multicore.patterns.notifier',
+    'Observer': 'puremvc_multicore.patterns.observer',
+    'Notification': 'puremvc_multicore.patterns.observer',
+    'Proxy': 'puremvc_multicore.patterns.proxy',
+    'Mediator': 'puremvc_multicore.patterns.mediator',
+    'SimpleCommand': 'puremvc_multicore.patterns.command',
+    'MacroCommand': 'puremvc_multicore.patterns.command',
+}
+
+
+def __getattr__(name):
+    if name in ('core', 'interfaces', 'patterns'):
+        return __import__(__name__ + '.' + name, fromlist=['_'])
+    if name in _lazy_attributes:
+        value = getattr(__import__(_lazy_attributes[name], fromlist=[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -4,26 +4,247 @@
  PureMVC - Copyright(c) 2006-08 Futurescale, Inc., Some rights reserved.
  Your reuse is governed by the Creative Commons Attribution 3.0 License
 """
-from abc import ABCMeta
 from puremvc_multicore.interfaces import IController, IModel, IView
-from puremvc_multicore.patterns.observer import Observer
+from puremvc_multicore.patterns.observer import Observer, notification_registry
 
 
+# the multiton keys of the Views having observers of a notification name, by name,
+# and of the Views having observers of a name and type, by (name, type);
+# brought up to date by update_interest_index
+interest_index = {}
+# the names each View is indexed under, by multiton key
+indexed_interests = {}
+# the multiton keys of the Views whose observed names changed since they were indexed
+stale_views = set()
 
-class ControllerMeta(ABCMeta):
-    def __init__(cls, name, bases, dict):
-        super(ControllerMeta, cls).__init__(name, bases, dict)
-        IController.instance_map = {}
 
+def index_interests(key, names):
+    """
+    Record in the C{interest_index} that a View has observer lists for some names.
+
+    @param key: the multiton key of the View
+    @param names: an iterable of notification names or C{(name, type)} tuples
+    """
+    for name in names:
+        try:
+            interest_index[name].add(key)
+        except KeyError:
+            interest_index[name] = {key}
+
+
+def unindex_interests(key, names):
+    """
+    Record in the C{interest_index} that a View dropped observer lists for some names.
+
+    @param key: the multiton key of the View
+    @param names: an iterable of notification names or C{(name, type)} tuples
+    """
+    for name in names:
+        keys = interest_index.get(name)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del interest_index[name]
+
+
+def update_interest_index():
+    """
+    Index again the Views whose observed names changed.
+
+    Views only mark themselves stale when an observer list is created
+    or deleted, so creating and removing Cores does not pay for an
+    index that may never be used; the cost is paid by the next lookup.
+
+    @return: the C{interest_index}
+    """
+    while stale_views:
+        try:
+            key = stale_views.pop()
+        except KeyError:
+            # emptied by another thread updating the index
+            break
+        unindex_interests(key, indexed_interests.pop(key, ()))
+        view = View.instance_map.get(key)
+        if view is not None:
+            names = list(view.observer_map)
+            names.extend(view.typed_observer_map)
+            index_interests(key, names)
+            indexed_interests[key] = names
+    return interest_index
+
+
+def add_typed_observers(observers, typed_observers):
+    """
+    Append the observers of a notification name and type to those of the name.
+
+    An observer in both lists, such as the one of a mediator interested
+    in a name and in that name with a type, is notified once.
+
+    @param observers: the tuple of C{IObservers} of the name
+    @param typed_observers: the tuple of C{IObservers} of the name and type
+    @return: the tuple of C{IObservers} to notify
+    """
+    if not observers:
+        return typed_observers
+    return observers + tuple(obsvr for obsvr in typed_observers if obsvr not in observers)
+
+
+def resolve_class_ref(class_ref):
+    """
+    Resolve a dotted import path to the C{Class} it names.
 
-    def __call__(cls, key, *args,**kw):
-        if key not in IController.instance_map:
-            IController.instance_map[key] = super(ControllerMeta, cls).__call__(key, *args, **kw)
-        return IController.instance_map[key]
+    Both C{'package.module.ClassName'} and C{'package.module:ClassName'}
+    are accepted. Anything that is not a string is returned unchanged.
 
+    @param class_ref: a dotted import path or a C{Class}
+    @return: the C{Class}
+    """
+    if not isinstance(class_ref, str):
+        return class_ref
+    if ':' in class_ref:
+        module_name, class_name = class_ref.split(':', 1)
+    else:
+        module_name, _, class_name = class_ref.rpartition('.')
+    if not module_name or not class_name:
+        raise ValueError("Not a dotted import path: %r" % class_ref)
+    return getattr(__import__(module_name, fromlist=[class_name]), class_name)
+
+
+
+def split_interest(interest):
+    """
+    Split a notification interest into its name and type.
+
+    An interest is either a notification name, or a C{(name, type)}
+    tuple restricting it to the C{INotification}s of that type.
 
+    @param interest: a notification name or a C{(name, type)} tuple
+    @return: the C{(name, type)} tuple, with C{None} as the type of a plain name
+    """
+    if isinstance(interest, tuple):
+        return interest
+    return interest, None
+
+
+
+def copy_instance(instance):
+    """
+    Shallow-copy an instance without calling its constructor.
 
-class Controller(IController):
+    @param instance: an object with an instance C{__dict__}
+    @return: a new instance of the same class sharing the attribute values
+    """
+    clone = instance.__class__.__new__(instance.__class__)
+    clone.__dict__.update(instance.__dict__)
+    return clone
+
+
+def rebind_observers(observer_map, contexts, originals=None):
+    """
+    Copy an observer map, moving observers over to replacement notification contexts.
+
+    Observers whose notification context has a replacement in C{contexts}
+    are recreated with the same notification method bound to the
+    replacement; observers that are themselves keys of C{contexts} are
+    swapped for their replacement. Observers that are keys of
+    C{originals}, such as those standing in for a mediator running on a
+    thread of its own, are first put back to the observer they replace.
+    All other observers are shared, as are the observer lists that
+    contain none of the replaced ones.
+
+    @param observer_map: a map of notification names to tuples of C{IObserver}s
+    @param contexts: a map of C{id()}s of the objects to replace to their replacements
+    @param originals: a map of C{id()}s of observers to the observers they stand in for (optional)
+    @return: the new observer map
+    """
+    originals = originals or {}
+    replacements = {}
+    for obsvr in set().union(*observer_map.values()):
+        original = originals.get(id(obsvr), obsvr)
+        clone = contexts.get(id(original))
+        if clone is None:
+            context = contexts.get(id(original.get_notify_context()))
+            if context is None:
+                if original is obsvr:
+                    continue
+                clone = original
+            else:
+                notify = original.get_notify_method()
+                if getattr(notify, '__self__', None) is original.get_notify_context():
+                    notify = notify.__func__.__get__(context, type(context))
+                clone = Observer(notify, context)
+        replacements[obsvr] = clone
+
+    if not replacements:
+        return dict(observer_map)
+    lookup = replacements.get
+    return {notification_name: tuple(map(lookup, observers, observers))
+            for notification_name, observers in observer_map.items()}
+
+
+
+class MultitonMeta(type):
+    """
+    Metaclass of the multiton C{Controller}, C{Model}, C{View} and C{Facade}.
+
+    Calling the class returns the instance stored under the given
+    multiton key in the class' C{instance_map}, creating it first if
+    there is none. A new instance is stored before its C{__init__}
+    runs, so actors looking up the core during its initialization find
+    it instead of creating a second one.
+    """
+
+    def __call__(cls, key, *args, **kw):
+        instance_map = cls.instance_map
+        instance = instance_map.get(key)
+        if instance is None:
+            instance = cls.__new__(cls, key, *args, **kw)
+            instance_map[key] = instance
+            try:
+                instance.__init__(key, *args, **kw)
+            except BaseException:
+                del instance_map[key]
+                raise
+        return instance
+
+
+    def get_instance(cls, key):
+        """
+        Get the instance for a multiton key, creating it if needed.
+
+        Existing instances are returned with a single dictionary lookup.
+
+        @param key: the multiton key
+        @return: the instance registered for C{key}
+        """
+        try:
+            return cls.instance_map[key]
+        except KeyError:
+            return cls(key)
+
+
+    def has_instance(cls, key):
+        """
+        Check if an instance exists for a multiton key.
+
+        @param key: the multiton key
+        @return: whether an instance is registered for C{key}
+        """
+        return key in cls.instance_map
+
+
+    def remove_instance(cls, key):
+        """
+        Forget the instance registered for a multiton key.
+
+        @param key: the multiton key
+        @return: the removed instance, or C{None}
+        """
+        return cls.instance_map.pop(key, None)
+
+
+
+class Controller(IController, metaclass=MultitonMeta):
     """
     A Singleton C{IController} implementation.
 
@@ -58,10 +279,11 @@ class Controller(IController):
     @see: L{MacroCommand<puremvc_multicore.patterns.command.MacroCommand>}
     """
 
-    __metaclass__ = ControllerMeta
-
     view = None
     command_map = None
+    # command_map by notification id, rebuilt on first use after a change
+    command_table = None
+    observer = None
 
     def __init__(self, key):
         """
@@ -75,6 +297,8 @@ class Controller(IController):
         self.view = View(key)
         self.command_map = {}
         self.multiton_key = key
+        # a single observer is registered for all commands
+        self.observer = Observer(self.execute_command, self)
 
 
     def execute_command(self, note):
@@ -84,8 +308,17 @@ class Controller(IController):
 
         @param note: an C{INotification}
         """
-        command_class_ref = self.command_map.get(note.get_name(),None)
+        note_id = note.id
+        if note_id is None:
+            command_class_ref = self.command_map.get(note.get_name(),None)
+        else:
+            try:
+                command_class_ref = self.command_table[note_id]
+            except (TypeError, IndexError):
+                command_class_ref = self.build_command_table()[note_id]
         if command_class_ref is not None:
+            if isinstance(command_class_ref, str):
+                command_class_ref = self.resolve_command(note.get_name())
             command_instance = command_class_ref()
             command_instance.initialize_notifier(self.multiton_key)
             command_instance.execute(note)
@@ -103,13 +336,70 @@ class Controller(IController):
         The Observer for the new ICommand is only created if this the
         first time an ICommand has been registered for this Notification name.
 
+        The C{ICommand} may also be given as a dotted import path
+        such as C{'myapp.controller.StartupCommand'}. Its module is
+        then only imported when the C{ICommand} is first executed
+        (or when C{prewarm_commands} is called), keeping the cost of
+        importing every command module out of core startup.
+
         @param notification_name: the name of the C{INotification}
-        @param command_class_ref: the C{Class} of the C{ICommand}
+        @param command_class_ref: the C{Class} of the C{ICommand}, or its dotted import path
         """
         if self.command_map.get(notification_name,None) is None:
-            self.view.register_observer(notification_name, Observer(self.execute_command, self))
+            self.view.register_observer(notification_name, self.observer)
 
         self.command_map[notification_name] = command_class_ref
+        self.command_table = None
+
+
+    def build_command_table(self):
+        """
+        Index the command map by the ids of the interned notification names.
+
+        @return: a list holding the C{ICommand} registered for each id, or C{None}
+        """
+        command_map = self.command_map
+        self.command_table = [command_map.get(name) for name in notification_registry.names]
+        return self.command_table
+
+
+    def resolve_command(self, notification_name):
+        """
+        Resolve the C{ICommand} registered by dotted import path for a given Notification.
+
+        The resolved C{Class} replaces the import path in the command map,
+        so the import is only paid for once.
+
+        @param notification_name: the name of the C{INotification}
+        @return: the C{Class} of the C{ICommand}
+        """
+        command_ref = self.command_map[notification_name]
+        command_class_ref = resolve_class_ref(command_ref)
+        # the mapping may have been replaced or removed meanwhile
+        if self.command_map.get(notification_name,None) is command_ref:
+            self.command_map[notification_name] = command_class_ref
+            self.command_table = None
+        return command_class_ref
+
+
+    def prewarm_commands(self, background=False):
+        """
+        Resolve all C{ICommand}s registered by dotted import path.
+
+        @param background: resolve the commands in a daemon thread instead of the calling thread
+        @return: the started C{Thread} if C{background} is set, otherwise C{None}
+        """
+        if background:
+            # threading is only imported when asked for, it is costly for short-lived processes
+            import threading
+            thread = threading.Thread(target=self.prewarm_commands, name='prewarm-%s' % (self.multiton_key,))
+            thread.daemon = True
+            thread.start()
+            return thread
+
+        for notification_name, command_ref in list(self.command_map.items()):
+            if isinstance(command_ref, str):
+                self.resolve_command(notification_name)
 
 
     def has_command(self, notification_name):
@@ -131,23 +421,34 @@ class Controller(IController):
         if self.has_command(notification_name):
             self.view.remove_observer(notification_name, self)
             del self.command_map[notification_name]
+            self.command_table = None
 
 
+    def clone(self, key):
+        """
+        Create the C{Controller} of a new Core from this one.
 
-class ModelMeta(ABCMeta):
-    def __init__(cls, name, bases, dict):
-        super(ModelMeta, cls).__init__(name, bases, dict)
-        IModel.instance_map = {}
-
+        The command map is copied in bulk and no C{ICommand} is
+        registered one by one. The observers of the C{View} are not
+        touched: the caller has to set the C{view} of the clone to a
+        C{View} whose observers, including the C{observer} of this
+        C{Controller}, were moved over to it, as done by
+        C{Facade.clone_core}.
 
-    def __call__(cls, key, *args,**kw):
-        if key not in IModel.instance_map:
-            IModel.instance_map[key] = super(ModelMeta, cls).__call__(key, *args, **kw)
-        return IModel.instance_map[key]
+        @param key: the multiton key of the new Core
+        @return: the new C{Controller}, registered under C{key}
+        """
+        controller = copy_instance(self)
+        controller.multiton_key = key
+        controller.command_map = dict(self.command_map)
+        controller.command_table = None
+        controller.observer = Observer(controller.execute_command, controller)
+        type(self).instance_map[key] = controller
+        return controller
 
 
 
-class Model(IModel):
+class Model(IModel, metaclass=MultitonMeta):
     """
     A Singleton C{IModel} implementation.
 
@@ -169,9 +470,8 @@ class Model(IModel):
     @see: L{Proxy<puremvc_multicore.patterns.proxy.Proxy>}
     @see: L{IProxy<puremvc_multicore.interfaces.IProxy>}
     """
-    __metaclass__ = ModelMeta
-
     proxy_map = None
+    proxy_factory_map = None
 
 
     def __init__(self, key):
@@ -182,6 +482,7 @@ class Model(IModel):
         """
         self.multiton_key = key
         self.proxy_map = {}
+        self.proxy_factory_map = {}
 
 
     def register_proxy(self, proxy):
@@ -191,10 +492,28 @@ class Model(IModel):
         @param proxy: an C{IProxy} to be held by the C{Model}.
         """
         proxy.initialize_notifier(self.multiton_key)
+        self.proxy_factory_map.pop(proxy.get_proxy_name(), None)
         self.proxy_map[proxy.get_proxy_name()] = proxy
         proxy.on_register()
 
 
+    def register_proxy_factory(self, proxy_name, factory):
+        """
+        Register a factory for an C{IProxy} with the C{Model}.
+
+        The C{IProxy} is not created until it is first requested
+        through C{retrieve_proxy} or C{has_proxy}; it is then
+        registered as if passed to C{register_proxy}, so its
+        C{on_register} method is only called at that point.
+
+        @param proxy_name: the name the C{IProxy} will be retrieved by.
+        @param factory: a callable without arguments returning the C{IProxy}, usually its C{Class}.
+        """
+        if proxy_name in self.proxy_map:
+            self.remove_proxy(proxy_name)
+        self.proxy_factory_map[proxy_name] = factory
+
+
     def retrieve_proxy(self, proxy_name):
         """
         Retrieve an C{IProxy} from the C{Model}.
@@ -202,7 +521,10 @@ class Model(IModel):
         @param proxy_name: the name of the C{IProxy}
         @return: the C{IProxy} instance previously registered with the given C{proxy_name}.
         """
-        return self.proxy_map.get(proxy_name,None)
+        proxy = self.proxy_map.get(proxy_name,None)
+        if proxy is None and proxy_name in self.proxy_factory_map:
+            proxy = self.create_proxy(proxy_name)
+        return proxy
 
 
     def has_proxy(self, proxy_name):
@@ -212,16 +534,34 @@ class Model(IModel):
         @param proxy_name: the name of the C{IProxy}
         @return: whether a Proxy is currently registered with the given C{proxy_name}.
         """
-        return self.proxy_map.get(proxy_name,None) is not None
+        return self.retrieve_proxy(proxy_name) is not None
+
+
+    def create_proxy(self, proxy_name):
+        """
+        Create and register the C{IProxy} for a registered factory.
+
+        @param proxy_name: the name the factory was registered with.
+        @return: the newly registered C{IProxy}
+        """
+        proxy = self.proxy_factory_map[proxy_name]()
+        if proxy.get_proxy_name() != proxy_name:
+            raise ValueError("Proxy factory for %r created proxy named %r" % (proxy_name, proxy.get_proxy_name()))
+        self.register_proxy(proxy)
+        return proxy
 
 
     def remove_proxy(self, proxy_name):
         """
         Remove an C{IProxy} from the C{Model}.
 
+        A factory registered for C{proxy_name} whose C{IProxy}
+        has not been created yet is discarded as well.
+
         @param proxy_name: name of the C{IProxy} instance to be removed.
         @return: the C{IProxy} that was removed from the C{Model}
         """
+        self.proxy_factory_map.pop(proxy_name, None)
         proxy = self.proxy_map.get(proxy_name,None)
         if proxy:
             del self.proxy_map[proxy_name]
@@ -229,20 +569,79 @@ class Model(IModel):
         return proxy
 
 
+    def clone(self, key):
+        """
+        Create the C{Model} of a new Core from this one.
+
+        Proxy factories are copied and stay lazy. Every registered
+        C{IProxy} is copied for the new Core with its C{clone_for_core},
+        if it has one, which copies the data of a C{Proxy} deeply, see
+        C{Proxy.copy_data}; other proxies are shallow-copied. The
+        caller is expected to call C{on_register} on the copies once the
+        new Core is wired up, as done by C{Facade.clone_core}.
+
+        @param key: the multiton key of the new Core
+        @return: the new C{Model}, registered under C{key}
+        """
+        model = copy_instance(self)
+        model.multiton_key = key
+        model.proxy_factory_map = dict(self.proxy_factory_map)
+        model.proxy_map = {}
+        for proxy_name, proxy in self.proxy_map.items():
+            clone_for_core = getattr(proxy, 'clone_for_core', None)
+            proxy = clone_for_core() if clone_for_core is not None else copy_instance(proxy)
+            proxy.initialize_notifier(key)
+            model.proxy_map[proxy_name] = proxy
+        type(self).instance_map[key] = model
+        return model
+
+
+
+class LazyMediatorObserver(Observer):
+    """
+    An C{Observer} standing in for an C{IMediator} that has not been created yet.
 
-class ViewMeta(ABCMeta):
-    def __init__(cls, name, bases, dict):
-        super(ViewMeta, cls).__init__(name, bases, dict)
-        IView.instance_map = {}
+    Registered by C{View.register_mediator_factory} for each of the
+    declared notification interests. When first notified, it has the
+    C{View} create and register the C{IMediator}, which replaces this
+    placeholder, and hands the C{INotification} on to it.
 
+    @see: L{View<puremvc_multicore.core.View>}
+    """
+    view = None
+    mediator_name = None
+    factory = None
+    interests = None
 
-    def __call__(cls, key, *args,**kw):
-        if key not in IView.instance_map:
-            IView.instance_map[key] = super(ViewMeta, cls).__call__(key, *args, **kw)
-        return IView.instance_map[key]
+    def __init__(self, view, mediator_name, factory, interests):
+        """
+        Constructor.
 
+        @param view: the C{View} the C{IMediator} will be registered with
+        @param mediator_name: the name of the C{IMediator}
+        @param factory: a callable without arguments returning the C{IMediator}
+        @param interests: the C{INotification} names this placeholder is registered for
+        """
+        Observer.__init__(self, self.notify_mediator, self)
+        self.view = view
+        self.mediator_name = mediator_name
+        self.factory = factory
+        self.interests = list(interests)
 
-class View(IView):
+
+    def notify_mediator(self, notification):
+        """
+        Create the C{IMediator} if needed and let it handle the C{INotification}.
+
+        @param notification: the C{INotification} to pass to the C{IMediator}
+        """
+        mediator = self.view.retrieve_mediator(self.mediator_name)
+        if mediator is not None:
+            mediator.handle_notification(notification)
+
+
+
+class View(IView, metaclass=MultitonMeta):
     """
     A Singleton C{IView} implementation.
 
@@ -267,10 +666,13 @@ class View(IView):
     @see: L{Observer<puremvc_multicore.patterns.observer.Observer>}
     @see: L{Notification<puremvc_multicore.patterns.observer.Notification>}
     """
-    __metaclass__ = ViewMeta
-
     observer_map = None
+    # observer_map by notification id, rebuilt on first use after a change
+    observer_table = None
+    # observers of the notifications of one type only, by (name, type)
+    typed_observer_map = None
     mediator_map = None
+    mediator_factory_map = None
 
     def __init__(self, key):
         """
@@ -280,20 +682,65 @@ class View(IView):
         """
         self.multiton_key = key
         self.observer_map = {}
+        self.typed_observer_map = {}
         self.mediator_map = {}
+        self.mediator_factory_map = {}
 
 
-    def register_observer(self, notification_name, observer):
+    def register_observer(self, notification_name, observer, notification_type=None):
         """
         Register an C{IObserver} to be notified
         of C{INotifications} with a given name.
 
+        With a C{notification_type}, the C{IObserver} is only
+        notified of the C{INotification}s of that name carrying that
+        type; the others never reach it.
+
         @param notification_name: the name of the C{INotifications} to notify this C{IObserver} of
         @param observer: the C{IObserver} to register
+        @param notification_type: the type of the C{INotifications} to notify this C{IObserver} of (optional)
         """
-        if not notification_name in self.observer_map:
-            self.observer_map[notification_name] = []
-        self.observer_map[notification_name].append(observer)
+        if notification_type is not None:
+            key = (notification_name, notification_type)
+            if key not in self.typed_observer_map:
+                stale_views.add(self.multiton_key)
+            self.typed_observer_map[key] = self.typed_observer_map.get(key, ()) + (observer,)
+            return
+        observers = self.observer_map.get(notification_name)
+        if observers is None:
+            stale_views.add(self.multiton_key)
+            observers = ()
+        self.observer_map[notification_name] = observers + (observer,)
+        self.observer_table = None
+
+
+    @classmethod
+    def remove_instance(cls, key):
+        """
+        Forget the instance registered for a multiton key.
+
+        It is dropped from the C{interest_index} on its next update.
+
+        @param key: the multiton key
+        @return: the removed instance, or C{None}
+        """
+        view = cls.instance_map.pop(key, None)
+        if key in indexed_interests:
+            stale_views.add(key)
+        else:
+            stale_views.discard(key)
+        return view
+
+
+    def build_observer_table(self):
+        """
+        Index the observer lists by the ids of the interned notification names.
+
+        @return: a list holding the observers of each id
+        """
+        observer_map = self.observer_map
+        self.observer_table = [observer_map.get(name, ()) for name in notification_registry.names]
+        return self.observer_table
 
 
     def notify_observers(self, notification):
@@ -302,31 +749,92 @@ class View(IView):
 
         All previously attached C{IObservers} for this C{INotification}'s
         list are notified and are passed a reference to the C{INotification} in
-        the order in which they were registered.
+        the order in which they were registered, followed by those registered
+        for its name and type; an C{IObserver} in both is notified once.
 
         @param notification: the C{INotification} to notify C{IObservers} of.
         """
-        observers = self.observer_map.get(notification.get_name(), [])[:]
+        note_id = notification.id
+        if note_id is None:
+            observers = self.observer_map.get(notification.get_name(), ())
+        else:
+            try:
+                observers = self.observer_table[note_id]
+            except (TypeError, IndexError):
+                observers = self.build_observer_table()[note_id]
+
+        if self.typed_observer_map:
+            note_type = notification.get_type()
+            if note_type is not None:
+                typed_observers = self.typed_observer_map.get((notification.get_name(), note_type))
+                if typed_observers:
+                    observers = add_typed_observers(observers, typed_observers)
+
+        # observer lists are tuples that are replaced rather than changed,
+        # so observers added or removed meanwhile do not affect this loop
         for obsvr in observers:
             obsvr.notify_observer(notification)
 
 
-    def remove_observer(self, notification_name, notify_context):
+    def observers_for(self, notification):
+        """
+        Get the C{IObservers} to notify of an C{INotification}.
+
+        Finds them as C{notify_observers} does, which keeps the lookup
+        inline for speed.
+
+        @param notification: the C{INotification}
+        @return: a tuple of C{IObservers}, in the order they are notified
+        """
+        note_id = notification.id
+        if note_id is None:
+            observers = self.observer_map.get(notification.get_name(), ())
+        else:
+            try:
+                observers = self.observer_table[note_id]
+            except (TypeError, IndexError):
+                observers = self.build_observer_table()[note_id]
+        if self.typed_observer_map:
+            note_type = notification.get_type()
+            if note_type is not None:
+                typed_observers = self.typed_observer_map.get((notification.get_name(), note_type))
+                if typed_observers:
+                    observers = add_typed_observers(observers, typed_observers)
+        return observers
+
+
+    def remove_observer(self, notification_name, notify_context, notification_type=None):
         """
         Remove the observer for a given notify_context from an observer list for a given Notification name.
 
         @param notification_name: which observer list to remove from
         @param notify_context: remove the observer with this object as its notify_context
+        @param notification_type: the type the observer was registered for (optional)
         """
+        if notification_type is not None:
+            key = (notification_name, notification_type)
+            observers = self.typed_observer_map[key]
+            remaining = tuple(obsvr for obsvr in observers if not obsvr.compare_notify_context(notify_context))
+            if remaining:
+                self.typed_observer_map[key] = remaining
+            else:
+                del self.typed_observer_map[key]
+                stale_views.add(self.multiton_key)
+            return
+
         observers = self.observer_map[notification_name]
 
         for i in range(len(observers)-1, -1, -1):
             if observers[i].compare_notify_context(notify_context):
-                observers.pop(i)
+                observers = observers[:i] + observers[i+1:]
                 break
 
-        if not observers:
+        if observers:
+            self.observer_map[notification_name] = observers
+        else:
             del self.observer_map[notification_name]
+            stale_views.add(self.multiton_key)
+        self.observer_table = None
 
 
     def register_mediator(self, mediator):
@@ -346,21 +854,47 @@ class View(IView):
         @param mediator: a reference to the C{IMediator} instance
         """
         # do not allow re-registration (you must to remove_mediator fist)
-        if mediator.get_mediator_name() in self.mediator_map:
+        if self.has_mediator(mediator.get_mediator_name()):
             return
 
         mediator.initialize_notifier(self.multiton_key)
         self.mediator_map[mediator.get_mediator_name()] = mediator
-        interests = mediator.list_notification_interests()
+        interests = [split_interest(interest) for interest in mediator.list_notification_interests()]
         if len(interests) > 0:
             obsvr = Observer(mediator.handle_notification, mediator)
 
-            for i in range(0,len(interests)):
-                self.register_observer(interests[i], obsvr)
+            for name, note_type in interests:
+                self.register_observer(name, obsvr, note_type)
 
         mediator.on_register()
 
 
+    def register_mediator_factory(self, mediator_name, factory, interests):
+        """
+        Register a factory for an C{IMediator} with the C{View}.
+
+        The C{IMediator} is not created until the first
+        C{INotification} it declared an interest in is broadcast,
+        or until it is retrieved with C{retrieve_mediator}. It is
+        then registered as if passed to C{register_mediator}, and
+        the C{INotification} that triggered its creation is handed
+        to its C{handle_notification} method.
+
+        @param mediator_name: the name the C{IMediator} will be retrieved by.
+        @param factory: a callable without arguments returning the C{IMediator}, usually its C{Class}.
+        @param interests: the C{INotification} names that should trigger the creation of the C{IMediator}
+        """
+        # do not allow re-registration (you must to remove_mediator fist)
+        if self.has_mediator(mediator_name):
+            return
+
+        obsvr = LazyMediatorObserver(self, mediator_name, factory, interests)
+        self.mediator_factory_map[mediator_name] = obsvr
+        for interest in obsvr.interests:
+            name, note_type = split_interest(interest)
+            self.register_observer(name, obsvr, note_type)
+
+
     def retrieve_mediator(self, mediator_name):
         """
         Retrieve an C{IMediator} from the C{View}.
@@ -368,28 +902,69 @@ class View(IView):
         @param mediator_name: the name of the C{IMediator} instance to retrieve.
         @return: the C{IMediator} instance previously registered with the given C{mediator_name}.
         """
-        return self.mediator_map.get(mediator_name,None)
+        mediator = self.mediator_map.get(mediator_name,None)
+        if mediator is None and mediator_name in self.mediator_factory_map:
+            mediator = self.create_mediator(mediator_name)
+        return mediator
+
+
+    def create_mediator(self, mediator_name):
+        """
+        Create and register the C{IMediator} for a registered factory.
+
+        @param mediator_name: the name the factory was registered with.
+        @return: the newly registered C{IMediator}
+        """
+        obsvr = self.mediator_factory_map[mediator_name]
+        mediator = obsvr.factory()
+        if mediator.get_mediator_name() != mediator_name:
+            raise ValueError("Mediator factory for %r created mediator named %r" % (mediator_name, mediator.get_mediator_name()))
+
+        self.remove_mediator_factory(mediator_name)
+        self.register_mediator(mediator)
+        return mediator
+
+
+    def remove_mediator_factory(self, mediator_name):
+        """
+        Remove a factory registered for an C{IMediator} that has not been created yet.
+
+        @param mediator_name: the name the factory was registered with.
+        """
+        obsvr = self.mediator_factory_map.pop(mediator_name, None)
+        if obsvr is not None:
+            for interest in obsvr.interests:
+                name, note_type = split_interest(interest)
+                self.remove_observer(name, obsvr, note_type)
 
 
     def remove_mediator(self, mediator_name):
         """
         Remove an C{IMediator} from the C{View}.
 
+        A factory registered for C{mediator_name} whose C{IMediator}
+        has not been created yet is discarded as well.
+
         @param mediator_name: name of the C{IMediator} instance to be removed.
         @return: the C{IMediator} that was removed from the C{View}
         """
-        for notificationName in self.observer_map.keys():
-            observers = self.observer_map[notificationName]
-            for i in range(len(observers)-1, -1, -1):
-                if observers[i].compare_notify_context(self.retrieve_mediator(mediator_name)):
-                    observers.pop(i)
-
-            if not observers:
-                del self.observer_map[notificationName]
+        self.remove_mediator_factory(mediator_name)
 
         mediator = self.mediator_map.get(mediator_name,None)
 
         if mediator is not None:
+            # every observer with the mediator as context, including those
+            # it registered itself besides its notification interests
+            for observer_map in (self.observer_map, self.typed_observer_map):
+                for key, observers in list(observer_map.items()):
+                    remaining = tuple(obsvr for obsvr in observers if not obsvr.compare_notify_context(mediator))
+                    if not remaining:
+                        del observer_map[key]
+                        stale_views.add(self.multiton_key)
+                    elif len(remaining) != len(observers):
+                        observer_map[key] = remaining
+            self.observer_table = None
+
             del self.mediator_map[mediator_name]
             mediator.on_remove()
         return mediator
@@ -402,4 +977,48 @@ class View(IView):
         @param mediator_name: the name of the C{IMediator}
         @return: whether a Mediator is registered with the given C{mediator_name}.
         """
-        return self.mediator_map.get(mediator_name,None) is not None
+        return self.mediator_map.get(mediator_name,None) is not None or mediator_name in self.mediator_factory_map
+
+
+    def clone(self, key, contexts=None, originals=None):
+        """
+        Create the C{View} of a new Core from this one.
+
+        Every registered C{IMediator} is shallow-copied for the new
+        Core, so its view component is shared until replaced; mediator
+        factories are copied and stay lazy. The observer lists are
+        copied in bulk, with the observers of the mediators (and of the
+        objects given in C{contexts}) moved over to their copies. The
+        caller is expected to call C{on_register} on the copied
+        mediators once the new Core is wired up, as done by
+        C{Facade.clone_core}.
+
+        @param key: the multiton key of the new Core
+        @param contexts: a map of C{id()}s of other notification contexts to their replacements (optional)
+        @param originals: a map of C{id()}s of observers put in place of others, by a mediator
+        actor or a watchdog of this Core, to the observers they replace (optional)
+        @return: the new C{View}, registered under C{key}
+        """
+        view = copy_instance(self)
+        view.multiton_key = key
+        view.mediator_map = {}
+        view.mediator_factory_map = {}
+        view.observer_table = None
+        # a watchdog of this View does not watch the copy
+        view.__dict__.pop('notify_observers', None)
+        contexts = dict(contexts or {})
+
+        for mediator_name, mediator in self.mediator_map.items():
+            clone = copy_instance(mediator)
+            clone.initialize_notifier(key)
+            view.mediator_map[mediator_name] = contexts[id(mediator)] = clone
+
+        for mediator_name, obsvr in self.mediator_factory_map.items():
+            clone = LazyMediatorObserver(view, mediator_name, obsvr.factory, obsvr.interests)
+            view.mediator_factory_map[mediator_name] = contexts[id(obsvr)] = clone
+
+        view.observer_map = rebind_observers(self.observer_map, contexts, originals)
+        view.typed_observer_map = rebind_observers(self.typed_observer_map, contexts, originals)
+        stale_views.add(key)
+        type(self).instance_map[key] = view
+        return view
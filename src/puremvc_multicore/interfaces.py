@@ -4,7 +4,7 @@
  PureMVC - Copyright(c) 2006-08 Futurescale, Inc., Some rights reserved.
  Your reuse is governed by the Creative Commons Attribution 3.0 License
 """
-from abc import ABCMeta, abstractmethod
+from abc import abstractmethod
 
 class ICommand(object):
     """
@@ -13,8 +13,6 @@ class ICommand(object):
     See also:
         INotification
     """
-    __metaclass__ = ABCMeta
-
     @abstractmethod
     def execute(self, notification):
         """
@@ -51,7 +49,8 @@ class IController(object):
     See also:
         INotification, ICommand
     """
-    __metaclass__ = ABCMeta
+    # multiton instances of the implementation, by multiton key
+    instance_map = {}
 
     @abstractmethod
     def register_command(self, notification_name, command_class_ref):
@@ -60,7 +59,7 @@ class IController(object):
 
         Args:
             notification_name: the name of the INotification
-            command_class_ref: the Class of the ICommand
+            command_class_ref: the Class of the ICommand, or its dotted import path
         """
         pass
 
@@ -119,8 +118,6 @@ class INotifier(object):
     @see: IFacade<puremvc_multicore.interfaces.IFacade>
     @see: INotification<puremvc_multicore.interfaces.INotification>
     """
-    __metaclass__ = ABCMeta
-
     @abstractmethod
     def send_notification(self, notification_name, body = None, type = None):
         """
@@ -156,7 +153,8 @@ class IFacade(INotifier):
     See also:
         IModel, IView, IController, ICommand, INotification
     """
-    __metaclass__ = ABCMeta
+    # multiton instances of the implementation, by multiton key
+    instance_map = {}
 
     @abstractmethod
     def register_proxy(self, proxy):
@@ -167,6 +165,16 @@ class IFacade(INotifier):
         """
         pass
 
+    @abstractmethod
+    def register_proxy_factory(self, proxy_name, factory):
+        """
+        Register a factory for an IProxy with the Model by name.
+
+        @param proxy_name: the name the IProxy will be retrieved by.
+        @param factory: a callable returning the IProxy, called on first retrieval.
+        """
+        pass
+
     @abstractmethod
     def retrieve_proxy(self, proxy_name):
         """
@@ -203,7 +211,7 @@ class IFacade(INotifier):
         Register an ICommand with the Controller.
 
         @param note_name: the name of the INotification to associate the ICommand with.
-        @param command_class_ref: a reference to the Class of the ICommand.
+        @param command_class_ref: a reference to the Class of the ICommand, or its dotted import path.
         """
         pass
 
@@ -235,6 +243,17 @@ class IFacade(INotifier):
         """
         pass
 
+    @abstractmethod
+    def register_mediator_factory(self, mediator_name, factory, interests):
+        """
+        Register a factory for an IMediator with the View.
+
+        @param mediator_name: the name the IMediator will be retrieved by
+        @param factory: a callable returning the IMediator, called on first use
+        @param interests: the INotification names that trigger the creation of the IMediator
+        """
+        pass
+
     @abstractmethod
     def retrieve_mediator(self, mediator_name):
         """
@@ -265,6 +284,19 @@ class IFacade(INotifier):
         """
         pass
 
+    @abstractmethod
+    def request(self, notification_name, body=None, type=None, loop=None):
+        """
+        Send an INotification expecting a response.
+
+        @param notification_name: the name of the notification to send
+        @param body: the body of the notification (optional)
+        @param type: the type of the notification (optional)
+        @param loop: an asyncio event loop, to get an asyncio Future of it (optional)
+        @return: a future completed by the observer answering the request
+        """
+        pass
+
     @abstractmethod
     def notify_observers(self, note):
         """
@@ -316,8 +348,6 @@ class IMediator(object):
 
     @see: INotification<puremvc_multicore.interfaces.INotification>
     """
-    __metaclass__ = ABCMeta
-
     @abstractmethod
     def get_mediator_name(self):
         """
@@ -350,6 +380,9 @@ class IMediator(object):
         """
         List INotification interests.
 
+        An interest may also be a (name, type) tuple, to be notified
+        only of the INotifications of that name carrying that type.
+
         @return: an List of the INotification names this IMediator has an interest in.
         """
         pass
@@ -390,7 +423,8 @@ class IModel(object):
 
     Maintain a cache of IProxy instances and Provide methods for registering, retrieving, and removing IProxy instances
     """
-    __metaclass__ = ABCMeta
+    # multiton instances of the implementation, by multiton key
+    instance_map = {}
 
     @abstractmethod
     def register_proxy(self, proxy):
@@ -401,6 +435,19 @@ class IModel(object):
         """
         pass
 
+    @abstractmethod
+    def register_proxy_factory(self, proxy_name, factory):
+        """
+        Register a factory for an IProxy instance with the Model.
+
+        The IProxy is created and registered the first time
+        it is retrieved.
+
+        @param proxy_name: the name the IProxy will be retrieved by.
+        @param factory: a callable returning the IProxy instance.
+        """
+        pass
+
     @abstractmethod
     def retrieve_proxy(self, proxy_name):
         """
@@ -464,7 +511,8 @@ class INotification(object):
     @see: IView<puremvc_multicore.interfaces.IView>
     @see: IObserver<puremvc_multicore.interfaces.IObserver>
     """
-    __metaclass__ = ABCMeta
+    # dense integer id of the name, if it was interned by a NotificationRegistry
+    id = None
 
     @abstractmethod
     def get_name(self):
@@ -547,7 +595,8 @@ class IObserver(object):
     @see: IView<puremvc_multicore.interfaces.IView>
     @see: INotification<puremvc_multicore.interfaces.INotification>
     """
-    __metaclass__ = ABCMeta
+    # lets implementations do without a per-instance dict
+    __slots__ = ()
 
     @abstractmethod
     def set_notify_method(self, notify_method):
@@ -608,8 +657,6 @@ class IProxy(object):
     Expose their name as a public static const called NAME, if they are not instantiated multiple times.
     Encapsulate interaction with local or remote services used to fetch and persist model data.
     """
-    __metaclass__ = ABCMeta
-
     @abstractmethod
     def get_proxy_name(self):
         """
@@ -677,15 +724,17 @@ class IView(object):
     @see: IObserver<puremvc_multicore.interfaces.IObserver>
     @see: INotification<puremvc_multicore.interfaces.INotification>
     """
-    __metaclass__ = ABCMeta
+    # multiton instances of the implementation, by multiton key
+    instance_map = {}
 
     @abstractmethod
-    def register_observer(self, notification_name, observer):
+    def register_observer(self, notification_name, observer, notification_type=None):
         """
         Register an IObserver to be notified of INotifications with a given name.
 
         @param notification_name: the name of the INotifications to notify this IObserver of
         @param observer: the IObserver to register
+        @param notification_type: only notify this IObserver of the INotifications of this type (optional)
         """
         pass
 
@@ -705,12 +754,13 @@ class IView(object):
 
 
     @abstractmethod
-    def remove_observer(self, notification_name, notify_context):
+    def remove_observer(self, notification_name, notify_context, notification_type=None):
         """
         Remove the observer for a given notify_context from an observer list for a given Notification name.
 
         @param notification_name: which observer list to remove from
         @param notify_context: remove the observer with this object as its notify_context
+        @param notification_type: the type the observer was registered for (optional)
         """
         pass
 
@@ -734,6 +784,21 @@ class IView(object):
         """
         pass
 
+    @abstractmethod
+    def register_mediator_factory(self, mediator_name, factory, interests):
+        """
+        Register a factory for an IMediator with the View.
+
+        The IMediator is created, registered and handed the
+        INotification the first time one of the given interests
+        is broadcast.
+
+        @param mediator_name: the name the IMediator will be retrieved by.
+        @param factory: a callable returning the IMediator instance.
+        @param interests: the INotification names that trigger the creation of the IMediator.
+        """
+        pass
+
     @abstractmethod
     def retrieve_mediator(self, mediator_name):
         """
@@ -0,0 +1,19 @@
+"""
+ PureMVC Multicore Port, pep8 by Oleg Butovich <obutovich@gmail.com>
+ PureMVC Python Port by Toby de Havilland <toby.de.havilland@puremvc.org>
+ PureMVC - Copyright(c) 2006-08 Futurescale, Inc., Some rights reserved.
+ Your reuse is governed by the Creative Commons Attribution 3.0 License
+
+ Submodules are loaded on first access.
+"""
+__all__ = ['actor', 'batch', 'collection', 'columnar', 'command', 'computed', 'facade', 'hibernation', 'mapped', 'mediator', 'notifier', 'observer', 'process', 'proxy', 'reactive', 'scheduler', 'shared', 'tracking', 'watchdog']
+
+
+def __getattr__(name):
+    if name in __all__:
+        return __import__(__name__ + '.' + name, fromlist=['_'])
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
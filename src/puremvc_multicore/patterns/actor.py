@@ -0,0 +1,530 @@
+"""
+ PureMVC Multicore Port, pep8 by Oleg Butovich <obutovich@gmail.com>
+ PureMVC Python Port by Toby de Havilland <toby.de.havilland@puremvc.org>
+ PureMVC - Copyright(c) 2006-08 Futurescale, Inc., Some rights reserved.
+ Your reuse is governed by the Creative Commons Attribution 3.0 License
+"""
+import collections
+import logging
+import queue
+import threading
+from puremvc_multicore.patterns.observer import Observer, RequestNotification
+
+# the running CoreActors, by multiton key
+actors = {}
+# the running MediatorActors, by multiton key and mediator name
+mediator_actors = {}
+actors_lock = threading.Lock()
+
+logger = logging.getLogger(__name__)
+
+# put in a mailbox to stop its thread once the notifications before it are handled
+STOP = object()
+
+# what a full mailbox does with another notification
+BLOCK = 'block'
+DROP_OLDEST = 'drop_oldest'
+DROP_NEWEST = 'drop_newest'
+COALESCE = 'coalesce'
+POLICIES = (BLOCK, DROP_OLDEST, DROP_NEWEST, COALESCE)
+
+
+class MailboxFull(Exception):
+    """
+    Rejects a C{RequestNotification} dropped by a full C{BoundedMailbox}.
+    """
+
+
+
+class BoundedMailbox(object):
+    """
+    A mailbox holding at most C{max_size} notifications.
+
+    When it is full, another notification is handled by the overflow
+    C{policy}:
+
+      - C{BLOCK}: the sender waits until the actor has taken one out.
+      - C{DROP_OLDEST}: the oldest notification waiting is dropped.
+      - C{DROP_NEWEST}: the new notification is dropped.
+      - C{COALESCE}: the new notification replaces the last one waiting
+        with the same name and type, keeping its place; if there is
+        none, the sender waits as with C{BLOCK}.
+
+    A dropped C{RequestNotification} is rejected with C{MailboxFull}.
+    The markers of C{flush} and C{stop} do not count.
+
+    @see: L{CoreActor<puremvc_multicore.patterns.actor.CoreActor>}
+    """
+
+    def __init__(self, max_size, policy=BLOCK):
+        """
+        Constructor.
+
+        @param max_size: the largest number of notifications held
+        @param policy: the overflow policy, one of C{POLICIES}
+        """
+        if policy not in POLICIES:
+            raise ValueError("Unknown overflow policy %r" % (policy,))
+        if max_size < 1:
+            raise ValueError("A bounded mailbox holds at least one notification")
+        self.max_size = max_size
+        self.policy = policy
+        self.items = collections.deque()
+        self.size = 0
+        self.condition = threading.Condition(threading.Lock())
+        self.high_water = 0
+        self.received = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.blocked = 0
+
+
+    def put(self, item):
+        """
+        Add a notification, or a marker, applying the overflow policy.
+
+        @param item: the C{INotification}
+        """
+        if item is STOP or item.__class__ is threading.Event:
+            with self.condition:
+                self.items.append(item)
+                self.condition.notify()
+            return
+        dropped = None
+        with self.condition:
+            self.received += 1
+            if self.size >= self.max_size:
+                policy = self.policy
+                if policy == DROP_NEWEST:
+                    self.dropped += 1
+                    dropped = item
+                elif policy == DROP_OLDEST:
+                    dropped = self.remove_oldest()
+                    self.dropped += 1
+                elif policy == COALESCE and self.replace(item):
+                    self.coalesced += 1
+                    return
+                if dropped is None:
+                    self.blocked += 1
+                    while self.size >= self.max_size:
+                        self.condition.wait()
+            if dropped is not item:
+                self.items.append(item)
+                self.size += 1
+                if self.size > self.high_water:
+                    self.high_water = self.size
+                self.condition.notify()
+        if isinstance(dropped, RequestNotification):
+            dropped.reject(MailboxFull("Request %r dropped by a full mailbox" % (dropped.get_name(),)))
+
+
+    def remove_oldest(self):
+        items = self.items
+        for index, item in enumerate(items):
+            if item is not STOP and item.__class__ is not threading.Event:
+                del items[index]
+                self.size -= 1
+                return item
+
+
+    def replace(self, notification):
+        name = notification.get_name()
+        type = notification.get_type()
+        items = self.items
+        for index in range(len(items) - 1, -1, -1):
+            item = items[index]
+            if item is STOP or item.__class__ is threading.Event:
+                continue
+            if item.get_name() == name and item.get_type() == type and not isinstance(item, RequestNotification):
+                items[index] = notification
+                return True
+        return False
+
+
+    def get(self):
+        """
+        Take out the oldest notification or marker, waiting for one.
+
+        @return: the C{INotification} or marker
+        """
+        with self.condition:
+            while not self.items:
+                self.condition.wait()
+            item = self.items.popleft()
+            if item is not STOP and item.__class__ is not threading.Event:
+                self.size -= 1
+                # wake the senders waiting for room
+                self.condition.notify_all()
+            return item
+
+
+    def qsize(self):
+        return self.size
+
+
+    def stats(self):
+        """
+        Get the metrics of the mailbox.
+
+        @return: a dict of the current C{depth}, its C{high_water} mark and the numbers of
+        notifications C{received}, C{dropped}, C{coalesced} and of senders C{blocked}
+        """
+        with self.condition:
+            return {
+                'depth': self.size,
+                'max_size': self.max_size,
+                'policy': self.policy,
+                'high_water': self.high_water,
+                'received': self.received,
+                'dropped': self.dropped,
+                'coalesced': self.coalesced,
+                'blocked': self.blocked,
+            }
+
+
+
+class Actor(object):
+    """
+    Dispatches notifications on a thread of its own, fed by a mailbox.
+
+    The mailbox is unbounded, unless C{max_pending} is given: it is then
+    a C{BoundedMailbox} applying the overflow C{policy}, so a sender
+    faster than the observers slows down or loses notifications instead
+    of filling the memory.
+
+    An observer failing does not stop the thread: a request not yet
+    answered is rejected with the error, other errors are passed to
+    C{on_error}.
+
+    @see: L{CoreActor<puremvc_multicore.patterns.actor.CoreActor>}
+    @see: L{MediatorActor<puremvc_multicore.patterns.actor.MediatorActor>}
+    """
+
+    def __init__(self, name, max_pending=None, policy=BLOCK):
+        """
+        Constructor.
+
+        @param name: the name of the thread
+        @param max_pending: the largest number of notifications waiting, unbounded if C{None}
+        @param policy: the overflow policy of a bounded mailbox, one of C{POLICIES}
+        """
+        self.name = name
+        if max_pending is None:
+            self.mailbox = queue.SimpleQueue()
+        else:
+            self.mailbox = BoundedMailbox(max_pending, policy)
+        self.thread = None
+        self.ident = None
+        self.deliver = None
+        self.errors = 0
+
+
+    def start_thread(self):
+        self.thread = threading.Thread(target=self.run, name=self.name)
+        self.thread.daemon = True
+        self.thread.start()
+
+
+    def post(self, notification):
+        """
+        Hand a notification to the actor.
+
+        @param notification: the C{INotification}
+        """
+        if threading.get_ident() == self.ident:
+            self.deliver(notification)
+        else:
+            self.mailbox.put(notification)
+
+
+    def run(self):
+        self.ident = threading.get_ident()
+        get = self.mailbox.get
+        deliver = self.deliver
+        while True:
+            notification = get()
+            if notification is STOP:
+                return
+            if notification.__class__ is threading.Event:
+                notification.set()
+                continue
+            try:
+                deliver(notification)
+            except Exception as exception:
+                self.errors += 1
+                if isinstance(notification, RequestNotification) and not notification.answered:
+                    notification.reject(exception)
+                else:
+                    self.on_error(notification, exception)
+
+
+    def on_error(self, notification, exception):
+        """
+        Report an error raised delivering a notification.
+
+        The error is logged; override this to report it elsewhere.
+
+        @param notification: the C{INotification}, or the item posted to the actor
+        @param exception: the exception raised
+        """
+        logger.error("Delivering %r failed on thread %r", notification, self.name, exc_info=exception)
+
+
+    def flush(self, timeout=None):
+        """
+        Wait until the notifications in the mailbox have been handled.
+
+        @param timeout: the longest time to wait, in seconds (optional)
+        @return: whether they were handled in time
+        """
+        if threading.get_ident() == self.ident:
+            return True
+        event = threading.Event()
+        self.mailbox.put(event)
+        return event.wait(timeout)
+
+
+    def pending(self):
+        """
+        Count the notifications in the mailbox.
+
+        @return: the approximate number of notifications
+        """
+        return self.mailbox.qsize()
+
+
+    def stats(self):
+        """
+        Get the metrics of the mailbox.
+
+        @return: a dict of the C{depth} of the mailbox, the number of C{errors} and,
+        for a bounded mailbox, the metrics of L{BoundedMailbox.stats}
+        """
+        if isinstance(self.mailbox, BoundedMailbox):
+            stats = self.mailbox.stats()
+        else:
+            stats = {'depth': self.mailbox.qsize()}
+        stats['errors'] = self.errors
+        return stats
+
+
+    def stop_thread(self, wait):
+        thread = self.thread
+        if thread is None:
+            return
+        self.mailbox.put(STOP)
+        if wait and thread is not threading.current_thread():
+            thread.join()
+
+
+
+class CoreActor(Actor):
+    """
+    Runs a Core on a thread of its own, fed by a mailbox.
+
+    Once started, notifications sent to the Core from other threads,
+    through its C{Facade} or by its proxies, mediators and commands, are
+    put in the mailbox instead of being dispatched by the sending thread.
+    The thread of the Core takes them out one at a time and dispatches
+    them, so its observers run one notification to completion before
+    the next, and never concurrently with each other; they need no
+    locks for the state of the Core.
+
+    Notifications sent from the thread of the Core itself, such as those
+    sent by its commands, are dispatched at once as usual. Methods of
+    the Core called directly from other threads, such as
+    C{retrieve_proxy}, are not serialized.
+
+    The actor replaces C{notify_observers} on the C{Facade} instance
+    while it runs. Separate Cores handle their notifications in
+    parallel on free-threaded builds of CPython; otherwise the threads
+    take turns on the global interpreter lock.
+
+    @see: L{Facade.start_actor<puremvc_multicore.patterns.facade.Facade.start_actor>}
+    """
+
+    def __init__(self, facade, max_pending=None, policy=BLOCK):
+        """
+        Constructor.
+
+        @param facade: the C{Facade} of the Core
+        @param max_pending: the largest number of notifications waiting, unbounded if C{None}
+        @param policy: the overflow policy of a bounded mailbox, one of C{POLICIES}
+        """
+        super(CoreActor, self).__init__('puremvc-core-%s' % (facade.multiton_key,), max_pending, policy)
+        self.facade = facade
+        self.multiton_key = facade.multiton_key
+        self.previous = None
+
+
+    def start(self):
+        """
+        Start the thread of the Core.
+
+        @return: this actor
+        """
+        with actors_lock:
+            if self.thread is not None:
+                return self
+            if self.multiton_key in actors:
+                raise RuntimeError("Core %r already runs on a thread" % (self.multiton_key,))
+            facade = self.facade
+            self.previous = facade.__dict__.get('notify_observers')
+            self.deliver = facade.notify_observers
+            facade.notify_observers = self.post
+            actors[self.multiton_key] = self
+            self.start_thread()
+        return self
+
+
+    def stop(self, wait=True):
+        """
+        Stop the thread once the notifications in the mailbox are handled.
+
+        Notifications sent afterwards are dispatched by the sending
+        thread again.
+
+        @param wait: whether to wait for the thread to end
+        """
+        with actors_lock:
+            if actors.get(self.multiton_key) is self:
+                del actors[self.multiton_key]
+            facade = self.facade
+            if facade.__dict__.get('notify_observers') == self.post:
+                if self.previous is None:
+                    del facade.notify_observers
+                else:
+                    facade.notify_observers = self.previous
+        self.stop_thread(wait)
+
+
+
+class MediatorActor(Actor):
+    """
+    Runs the notifications of one C{IMediator} on a thread of its own.
+
+    The observers of the mediator in the C{View} are replaced by ones
+    putting the notifications in the mailbox of the actor, so a slow
+    mediator no longer holds up the sender and the other observers.
+    With a bounded mailbox, its overflow policy decides what happens
+    once the mediator falls C{max_pending} notifications behind.
+
+    @see: L{Facade.start_mediator_actor<puremvc_multicore.patterns.facade.Facade.start_mediator_actor>}
+    """
+
+    def __init__(self, view, mediator, max_pending=None, policy=BLOCK):
+        """
+        Constructor.
+
+        @param view: the C{View} of the Core
+        @param mediator: the C{IMediator}
+        @param max_pending: the largest number of notifications waiting, unbounded if C{None}
+        @param policy: the overflow policy of a bounded mailbox, one of C{POLICIES}
+        """
+        self.view = view
+        self.mediator = mediator
+        self.observer = Observer(self.post, mediator)
+        self.key = (view.multiton_key, mediator.get_mediator_name())
+        super(MediatorActor, self).__init__('puremvc-mediator-%s-%s' % self.key, max_pending, policy)
+
+
+    def start(self):
+        """
+        Start the thread of the mediator.
+
+        @return: this actor
+        """
+        with actors_lock:
+            if self.thread is not None:
+                return self
+            if self.key in mediator_actors:
+                raise RuntimeError("Mediator %r of Core %r already runs on a thread" % self.key[::-1])
+            self.deliver = self.mediator.handle_notification
+            replace_observers(self.view, self.mediator, self.observer)
+            mediator_actors[self.key] = self
+            self.start_thread()
+        return self
+
+
+    def stop(self, wait=True):
+        """
+        Stop the thread once the notifications in the mailbox are handled.
+
+        The mediator is notified by the sending thread again, if it is
+        still registered.
+
+        @param wait: whether to wait for the thread to end
+        """
+        with actors_lock:
+            if mediator_actors.get(self.key) is self:
+                del mediator_actors[self.key]
+                replace_observers(self.view, self.mediator, Observer(self.mediator.handle_notification, self.mediator))
+        self.stop_thread(wait)
+
+
+
+def replace_observers(view, context, observer):
+    """
+    Replace the observers of a context in the observer lists of a C{View}.
+
+    @param view: the C{View}
+    @param context: the notify context of the observers
+    @param observer: the C{IObserver} taking their place
+    """
+    for observer_map in (view.observer_map, view.typed_observer_map):
+        for key, observers in list(observer_map.items()):
+            if any(obsvr.compare_notify_context(context) for obsvr in observers):
+                observer_map[key] = tuple(observer if obsvr.compare_notify_context(context) else obsvr
+                                          for obsvr in observers)
+    view.observer_table = None
+
+
+
+def get_actor(multiton_key):
+    """
+    Get the actor running a Core.
+
+    @param multiton_key: the multiton key of the Core
+    @return: the C{CoreActor}, or C{None} if the Core does not run on a thread of its own
+    """
+    return actors.get(multiton_key)
+
+
+def get_mediator_actor(multiton_key, mediator_name):
+    """
+    Get the actor running a mediator.
+
+    @param multiton_key: the multiton key of the Core
+    @param mediator_name: the name of the mediator
+    @return: the C{MediatorActor}, or C{None} if the mediator does not run on a thread of its own
+    """
+    return mediator_actors.get((multiton_key, mediator_name))
+
+
+def original_observers(multiton_key):
+    """
+    Get the observers the mediator actors of a Core stand in for.
+
+    @param multiton_key: the multiton key of the Core
+    @return: a map of the C{id()}s of the observers of the actors to the observers notifying
+    the mediators directly, for C{View.clone}
+    """
+    originals = {}
+    for key, actor in list(mediator_actors.items()):
+        if key[0] == multiton_key:
+            originals[id(actor.observer)] = Observer(actor.mediator.handle_notification, actor.mediator)
+    return originals
+
+
+def stop_core(multiton_key):
+    """
+    Stop the actors of a removed Core, without waiting for them.
+
+    @param multiton_key: the multiton key of the Core
+    """
+    actor = actors.get(multiton_key)
+    if actor is not None:
+        actor.stop(wait=False)
+    for key, actor in list(mediator_actors.items()):
+        if key[0] == multiton_key:
+            actor.stop(wait=False)
@@ -0,0 +1,125 @@
+"""
+ PureMVC Multicore Port, pep8 by Oleg Butovich <obutovich@gmail.com>
+ PureMVC Python Port by Toby de Havilland <toby.de.havilland@puremvc.org>
+ PureMVC - Copyright(c) 2006-08 Futurescale, Inc., Some rights reserved.
+ Your reuse is governed by the Creative Commons Attribution 3.0 License
+"""
+from puremvc_multicore.patterns.observer import RequestNotification
+
+
+def keep_last(previous, notification):
+    """
+    Merge two notifications of a batch by keeping the later one.
+
+    @param previous: the C{INotification} sent first
+    @param notification: the C{INotification} sent later
+    @return: C{notification}
+    """
+    return notification
+
+
+
+class NotificationBatch(object):
+    """
+    Defers the notifications of a Core until the end of a C{with} block.
+
+    While the batch is open, the notifications sent through the
+    C{Facade} of the Core, including those sent by its commands, proxies
+    and mediators, are held back. When the block ends they are all
+    delivered in the order they were sent; if it raises, they are
+    discarded.
+
+    With a C{merge} callable, such as C{keep_last}, those with the same
+    name and type are merged instead and take the place of the first
+    one, so observers are notified once per name and type. Merging is
+    only right for notifications whose body carries the whole state,
+    as the bodies of the merged ones are lost.
+
+    Requests sent with C{Facade.request} are delivered immediately, as
+    their sender waits for an answer. Batches may be nested: an inner
+    batch delivers into the outer one.
+
+    The batch replaces C{notify_observers} on the C{Facade} instance for
+    its duration, so dispatch outside of batches is not slowed down; it
+    applies to all threads sending through that C{Facade}.
+
+    @see: L{Facade.batch<puremvc_multicore.patterns.facade.Facade.batch>}
+    """
+
+    def __init__(self, facade, merge=None):
+        """
+        Constructor.
+
+        @param facade: the C{Facade} of the Core
+        @param merge: a callable merging two notifications of the same name and type, C{None} to keep them all
+        """
+        self.facade = facade
+        self.merge = merge
+        self.pending = []
+        self.index = {}
+        self.previous = None
+        self.deliver = None
+
+
+    def __enter__(self):
+        facade = self.facade
+        self.previous = facade.__dict__.get('notify_observers')
+        self.deliver = facade.notify_observers
+        facade.notify_observers = self.add
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.previous is None:
+            del self.facade.notify_observers
+        else:
+            self.facade.notify_observers = self.previous
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+        return False
+
+
+    def add(self, notification):
+        """
+        Hold back a notification until the batch is committed.
+
+        @param notification: the C{INotification}
+        """
+        if isinstance(notification, RequestNotification):
+            self.deliver(notification)
+            return
+        if self.merge is None:
+            self.pending.append(notification)
+            return
+        key = (notification.get_name(), notification.get_type())
+        position = self.index.get(key)
+        if position is None:
+            self.index[key] = len(self.pending)
+            self.pending.append(notification)
+        else:
+            self.pending[position] = self.merge(self.pending[position], notification)
+
+
+    def commit(self):
+        """
+        Deliver the notifications held back so far.
+        """
+        pending = self.pending
+        self.pending = []
+        self.index = {}
+        for notification in pending:
+            self.deliver(notification)
+
+
+    def rollback(self):
+        """
+        Discard the notifications held back so far.
+        """
+        self.pending = []
+        self.index = {}
+
+
+    def __len__(self):
+        return len(self.pending)
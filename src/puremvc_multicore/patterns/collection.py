@@ -0,0 +1,492 @@
+"""
+ PureMVC Multicore Port, pep8 by Oleg Butovich <obutovich@gmail.com>
+ PureMVC Python Port by Toby de Havilland <toby.de.havilland@puremvc.org>
+ PureMVC - Copyright(c) 2006-08 Futurescale, Inc., Some rights reserved.
+ Your reuse is governed by the Creative Commons Attribution 3.0 License
+"""
+import bisect
+import copy
+from puremvc_multicore.patterns.proxy import Proxy
+
+
+class HashIndex(object):
+    """
+    An index of records by the value of a field, or of several fields.
+
+    Finding the records with a key costs O(1). With several fields the
+    key is the tuple of their values.
+
+    @see: L{CollectionProxy<puremvc_multicore.patterns.collection.CollectionProxy>}
+    """
+
+    def __init__(self, *fields):
+        """
+        Constructor.
+
+        @param fields: the names of the indexed fields
+        """
+        if not fields:
+            raise ValueError("An index needs at least one field")
+        self.fields = fields
+        self.entries = {}
+
+
+    def copy(self):
+        """
+        Get an empty index on the same fields.
+
+        @return: the new index
+        """
+        return self.__class__(*self.fields)
+
+
+    def keys(self, record):
+        """
+        Get the keys a record is indexed under.
+
+        @param record: the record
+        @return: a tuple of keys
+        """
+        try:
+            if len(self.fields) == 1:
+                return (record[self.fields[0]],)
+            return (tuple(record[field] for field in self.fields),)
+        except KeyError:
+            return ()
+
+
+    def add(self, key, primary_key):
+        self.entries.setdefault(key, {})[primary_key] = True
+
+
+    def remove(self, key, primary_key):
+        primary_keys = self.entries[key]
+        del primary_keys[primary_key]
+        if not primary_keys:
+            del self.entries[key]
+
+
+    def find(self, key):
+        """
+        Get the primary keys of the records indexed under a key.
+
+        @param key: the key
+        @return: an iterable of primary keys, in order of insertion
+        """
+        return self.entries.get(key, ())
+
+
+    def __len__(self):
+        return len(self.entries)
+
+
+
+class MultiKeyIndex(HashIndex):
+    """
+    An index of records by each of the values of a field holding several.
+
+    A record whose C{tags} field is C{['a', 'b']} is found under both
+    C{'a'} and C{'b'}.
+
+    @see: L{CollectionProxy<puremvc_multicore.patterns.collection.CollectionProxy>}
+    """
+
+    def __init__(self, field):
+        """
+        Constructor.
+
+        @param field: the name of the field holding an iterable of keys
+        """
+        super(MultiKeyIndex, self).__init__(field)
+
+
+    def keys(self, record):
+        return tuple(set(record.get(self.fields[0], ())))
+
+
+
+class SortedIndex(HashIndex):
+    """
+    An index of records sorted by the value of a field.
+
+    Finding the records with a key or within a range of keys costs
+    O(log n), plus the number of records found. Keys must be mutually
+    comparable; records of equal keys are kept in order of insertion.
+
+    @see: L{CollectionProxy<puremvc_multicore.patterns.collection.CollectionProxy>}
+    """
+
+    def __init__(self, field):
+        """
+        Constructor.
+
+        @param field: the name of the indexed field
+        """
+        super(SortedIndex, self).__init__(field)
+        self.values = []
+        self.primary_keys = []
+
+
+    def add(self, key, primary_key):
+        position = bisect.bisect_right(self.values, key)
+        self.values.insert(position, key)
+        self.primary_keys.insert(position, primary_key)
+
+
+    def remove(self, key, primary_key):
+        position = bisect.bisect_left(self.values, key)
+        while self.primary_keys[position] != primary_key:
+            position += 1
+        del self.values[position]
+        del self.primary_keys[position]
+
+
+    def find(self, key):
+        return self.range(key, key)
+
+
+    def range(self, low=None, high=None, include_high=True):
+        """
+        Get the primary keys of the records within a range of keys, in key order.
+
+        @param low: the lowest key, unbounded if C{None}
+        @param high: the highest key, unbounded if C{None}
+        @param include_high: include the records whose key is C{high}
+        @return: a list of primary keys
+        """
+        start = 0 if low is None else bisect.bisect_left(self.values, low)
+        if high is None:
+            stop = len(self.values)
+        elif include_high:
+            stop = bisect.bisect_right(self.values, high)
+        else:
+            stop = bisect.bisect_left(self.values, high)
+        return self.primary_keys[start:stop]
+
+
+    def __len__(self):
+        return len(self.values)
+
+
+
+class CollectionChange(object):
+    """
+    The body of a C{CollectionProxy.CHANGED} notification.
+
+    Besides the record before and after the change, it tells for each
+    index the keys the record left and joined, so that a mediator
+    showing the records under one key can tell whether it is affected
+    without scanning the collection.
+
+    @see: L{CollectionProxy<puremvc_multicore.patterns.collection.CollectionProxy>}
+    """
+    __slots__ = ('kind', 'primary_key', 'record', 'previous', 'index_changes', 'indexes')
+
+    def __init__(self, kind, primary_key, record, previous, index_changes, indexes):
+        """
+        Constructor.
+
+        @param kind: C{'insert'}, C{'update'} or C{'delete'}
+        @param primary_key: the primary key of the record
+        @param record: the record after the change, C{None} if deleted
+        @param previous: the record before the change, C{None} if inserted
+        @param index_changes: a dict of C{(removed keys, added keys)}, by index name,
+        for the indexes under which the record moved
+        @param indexes: the indexes of the proxy, by name
+        """
+        self.kind = kind
+        self.primary_key = primary_key
+        self.record = record
+        self.previous = previous
+        self.index_changes = index_changes
+        self.indexes = indexes
+
+
+    def affects(self, index_name, key):
+        """
+        Tell whether the change concerns the records indexed under a key.
+
+        @param index_name: the name of the index
+        @param key: the key
+        @return: whether the record left, joined or changed under C{key}
+        """
+        if index_name in self.index_changes:
+            removed, added = self.index_changes[index_name]
+            if key in removed or key in added:
+                return True
+        record = self.record if self.record is not None else self.previous
+        return key in self.indexes[index_name].keys(record)
+
+
+    def __repr__(self):
+        return 'CollectionChange(%r, %r, %r)' % (self.kind, self.primary_key, self.index_changes)
+
+
+
+class CollectionProxy(Proxy):
+    """
+    A C{Proxy} holding a collection of dict records with secondary indexes.
+
+    Records are kept by their primary key, the field named C{KEY}, and
+    indexed by the indexes named in C{INDEXES}, or added with
+    C{add_index}: C{HashIndex}, C{SortedIndex} and C{MultiKeyIndex}.
+    C{find} and C{range} use them instead of scanning the records.
+
+    Change the records through C{insert}, C{update} and C{delete}, which
+    keep the indexes up to date by moving only the changed record, and
+    send a C{CHANGED} notification, typed with the name of the proxy,
+    whose body is a C{CollectionChange}. Records must not be changed in
+    place, as the indexes would not follow.
+
+    The indexes are moved before the records are changed: a change
+    one of them cannot take, such as a key a C{SortedIndex} cannot
+    compare with the others, raises and leaves the proxy as it was.
+
+    C{get_data} returns a view of the records.
+    """
+
+    CHANGED = 'CollectionProxyChanged'
+    KEY = 'id'
+    INDEXES = {}
+
+    key = None
+    records = None
+    indexes = None
+
+    def __init__(self, proxy_name=None, data=None, key=None, indexes=None):
+        """
+        Constructor.
+
+        @param proxy_name: the name of the proxy instance (optional)
+        @param data: an iterable of records (optional)
+        @param key: the name of the primary key field, C{KEY} if C{None}
+        @param indexes: a dict of indexes by name, added to those of C{INDEXES} (optional)
+        """
+        self.key = key if key is not None else self.KEY
+        self.records = {}
+        self.indexes = dict((name, index.copy()) for name, index in self.INDEXES.items())
+        for name, index in (indexes or {}).items():
+            self.indexes[name] = index.copy()
+        super(CollectionProxy, self).__init__(proxy_name, data)
+        self.data = self.records.values()
+
+
+    def set_data(self, data):
+        """
+        Replace all records, rebuilding the indexes.
+
+        No C{CHANGED} notification is sent.
+
+        @param data: an iterable of records
+        """
+        self.records = {}
+        self.indexes = dict((name, index.copy()) for name, index in self.indexes.items())
+        for record in data:
+            self.records[record[self.key]] = record
+        for index in self.indexes.values():
+            self.fill(index)
+        self.data = self.records.values()
+        self.version += 1
+
+
+    def copy_data(self):
+        # the view of the records is replaced by clone_for_core
+        return None
+
+
+    def clone_for_core(self):
+        # records are not changed in place, the indexes are
+        clone = super(CollectionProxy, self).clone_for_core()
+        clone.records = dict(self.records)
+        clone.indexes = copy.deepcopy(self.indexes)
+        clone.data = clone.records.values()
+        return clone
+
+
+    def add_index(self, name, index):
+        """
+        Add an index, indexing the current records.
+
+        @param name: the name of the index
+        @param index: an empty index
+        """
+        self.fill(index)
+        self.indexes[name] = index
+
+
+    def fill(self, index):
+        for primary_key, record in self.records.items():
+            for index_key in index.keys(record):
+                index.add(index_key, primary_key)
+
+
+    def get(self, primary_key, default=None):
+        """
+        Get a record.
+
+        @param primary_key: the primary key of the record
+        @param default: the value returned if there is no such record
+        @return: the record
+        """
+        return self.records.get(primary_key, default)
+
+
+    def __len__(self):
+        return len(self.records)
+
+
+    def __contains__(self, primary_key):
+        return primary_key in self.records
+
+
+    def find(self, index_name, key):
+        """
+        Get the records indexed under a key.
+
+        @param index_name: the name of the index
+        @param key: the key, a tuple for an index on several fields
+        @return: a list of records
+        """
+        records = self.records
+        return [records[primary_key] for primary_key in self.indexes[index_name].find(key)]
+
+
+    def range(self, index_name, low=None, high=None, include_high=True):
+        """
+        Get the records within a range of keys of a C{SortedIndex}, in key order.
+
+        @param index_name: the name of the index
+        @param low: the lowest key, unbounded if C{None}
+        @param high: the highest key, unbounded if C{None}
+        @param include_high: include the records whose key is C{high}
+        @return: a list of records
+        """
+        records = self.records
+        return [records[primary_key] for primary_key in self.indexes[index_name].range(low, high, include_high)]
+
+
+    def count(self, index_name, key):
+        """
+        Count the records indexed under a key.
+
+        @param index_name: the name of the index
+        @param key: the key
+        @return: the number of records
+        """
+        return len(self.indexes[index_name].find(key))
+
+
+    def insert(self, record):
+        """
+        Add a record.
+
+        @param record: the record, a dict holding its primary key
+        """
+        primary_key = record[self.key]
+        if primary_key in self.records:
+            raise KeyError("Record %r already in Proxy %r" % (primary_key, self.proxy_name))
+        index_changes = self.reindex(primary_key, record, None)
+        self.records[primary_key] = record
+        self.changed('insert', primary_key, record, None, index_changes)
+
+
+    def update(self, primary_key, changes):
+        """
+        Change fields of a record.
+
+        The record is replaced by a copy holding the changes, so the
+        previous one can be compared with it.
+
+        @param primary_key: the primary key of the record
+        @param changes: a dict of the new values, by field name
+        @return: the new record
+        """
+        previous = self.records[primary_key]
+        if self.key in changes and changes[self.key] != primary_key:
+            raise ValueError("The primary key of a record of Proxy %r cannot change" % self.proxy_name)
+        record = dict(previous)
+        record.update(changes)
+        index_changes = self.reindex(primary_key, record, previous)
+        self.records[primary_key] = record
+        self.changed('update', primary_key, record, previous, index_changes)
+        return record
+
+
+    def delete(self, primary_key):
+        """
+        Remove a record.
+
+        @param primary_key: the primary key of the record
+        @return: the removed record
+        """
+        previous = self.records[primary_key]
+        index_changes = self.reindex(primary_key, None, previous)
+        del self.records[primary_key]
+        self.changed('delete', primary_key, None, previous, index_changes)
+        return previous
+
+
+    def __getstate__(self):
+        # a view of a dict cannot be pickled
+        state = self.__dict__.copy()
+        state.pop('data', None)
+        return state
+
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.data = self.records.values()
+
+
+    def reindex(self, primary_key, record, previous):
+        """
+        Move a changed record in the indexes.
+
+        If an index fails to take the change, the indexes already moved
+        are moved back before the error is raised.
+
+        @param primary_key: the primary key of the record
+        @param record: the record after the change, C{None} if deleted
+        @param previous: the record before the change, C{None} if inserted
+        @return: a dict of C{(removed keys, added keys)}, by index name
+        """
+        index_changes = {}
+        done = []
+        try:
+            for name, index in self.indexes.items():
+                old_keys = index.keys(previous) if previous is not None else ()
+                new_keys = index.keys(record) if record is not None else ()
+                if old_keys == new_keys:
+                    continue
+                removed = tuple(key for key in old_keys if key not in new_keys)
+                added = tuple(key for key in new_keys if key not in old_keys)
+                if not removed and not added:
+                    continue
+                for key in removed:
+                    index.remove(key, primary_key)
+                    done.append((index.add, key))
+                for key in added:
+                    index.add(key, primary_key)
+                    done.append((index.remove, key))
+                index_changes[name] = (removed, added)
+        except Exception:
+            for undo, key in reversed(done):
+                undo(key, primary_key)
+            raise
+        return index_changes
+
+
+    def changed(self, kind, primary_key, record, previous, index_changes):
+        """
+        Record a change of the records and send the C{CHANGED} notification.
+
+        @param kind: the kind of change
+        @param primary_key: the primary key of the record
+        @param record: the record after the change, C{None} if deleted
+        @param previous: the record before the change, C{None} if inserted
+        @param index_changes: the changes of the indexes, as returned by C{reindex}
+        """
+        self.version += 1
+        if self.multiton_key is not None:
+            change = CollectionChange(kind, primary_key, record, previous, index_changes, self.indexes)
+            self.send_notification(self.CHANGED, change, self.proxy_name)
@@ -0,0 +1,448 @@
+"""
+ PureMVC Multicore Port, pep8 by Oleg Butovich <obutovich@gmail.com>
+ PureMVC Python Port by Toby de Havilland <toby.de.havilland@puremvc.org>
+ PureMVC - Copyright(c) 2006-08 Futurescale, Inc., Some rights reserved.
+ Your reuse is governed by the Creative Commons Attribution 3.0 License
+"""
+import array
+import itertools
+import operator
+from puremvc_multicore.patterns.proxy import Proxy
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# comparisons accepted by ColumnarProxy.where
+OPERATORS = {
+    '==': operator.eq,
+    '!=': operator.ne,
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+}
+
+# array.array type codes standing in for NumPy dtypes without NumPy
+TYPECODES = {
+    'bool': 'b', 'i1': 'b', 'i2': 'h', 'i4': 'i', 'i8': 'q',
+    'u1': 'B', 'u2': 'H', 'u4': 'I', 'u8': 'Q', 'f4': 'f', 'f8': 'd',
+    'int8': 'b', 'int16': 'h', 'int32': 'i', 'int64': 'q',
+    'uint8': 'B', 'uint16': 'H', 'uint32': 'I', 'uint64': 'Q',
+    'float32': 'f', 'float64': 'd', int: 'q', float: 'd', bool: 'b',
+}
+
+AGGREGATES = ('sum', 'min', 'max', 'mean', 'count')
+
+
+def make_column(values, dtype=None):
+    """
+    Make a column from a sequence of values.
+
+    Without NumPy, numbers are kept in an C{array.array} and other
+    values in a list.
+
+    @param values: the values
+    @param dtype: the NumPy dtype of the column, inferred if C{None}
+    @return: the column
+    """
+    if numpy is not None:
+        return numpy.asarray(values, dtype=dtype)
+    if dtype is None:
+        values = list(values)
+        if all(value.__class__ is int for value in values):
+            dtype = int
+        elif all(value.__class__ in (int, float) for value in values):
+            dtype = float
+    typecode = TYPECODES.get(dtype)
+    if typecode is None:
+        return list(values)
+    return array.array(typecode, values)
+
+
+def column_like(column, values):
+    if numpy is not None:
+        return numpy.asarray(values, dtype=column.dtype)
+    if column.__class__ is list:
+        return list(values)
+    return array.array(column.typecode, values)
+
+
+class RowMask(array.array):
+    """
+    A boolean mask of rows, as returned by C{ColumnarProxy.where} without NumPy.
+
+    An C{array('b')} of its own type, so that it is not taken for the
+    row numbers held by an C{int8} or C{bool} column.
+    """
+
+    def __new__(cls, values=()):
+        return array.array.__new__(cls, 'b', values)
+
+
+    def __reduce__(self):
+        return RowMask, (self.tolist(),)
+
+
+
+def is_mask(rows):
+    """
+    Tell a mask from row numbers, without NumPy.
+
+    @return: C{True} for a C{RowMask} or a sequence of C{bool}s
+    """
+    if isinstance(rows, RowMask):
+        return True
+    return not isinstance(rows, array.array) and len(rows) > 0 and isinstance(rows[0], bool)
+
+
+def to_indices(rows, length):
+    """
+    Get the row numbers selected by a slice, a mask or row numbers.
+
+    @return: a sequence of row numbers
+    """
+    if rows is None:
+        return range(length)
+    if rows.__class__ is slice:
+        return range(*rows.indices(length))
+    if numpy is not None:
+        rows = numpy.asarray(rows)
+        if rows.dtype == bool:
+            return numpy.flatnonzero(rows)
+        # an empty list makes an array of floats
+        return rows if len(rows) else rows.astype(numpy.intp)
+    if is_mask(rows):
+        return list(itertools.compress(range(length), rows))
+    return rows
+
+
+def take(column, rows):
+    if rows is None:
+        return column
+    if numpy is not None or rows.__class__ is slice:
+        return column[rows]
+    if is_mask(rows):
+        return column_like(column, itertools.compress(column, rows))
+    return column_like(column, map(column.__getitem__, rows))
+
+
+
+class ColumnChange(object):
+    """
+    The body of a C{ColumnarProxy.CHANGED} notification.
+
+    It tells which rows changed, as a C{slice}, a boolean mask or an
+    array of row numbers, rather than carrying copies of them. The rows
+    of a C{'delete'} are always a boolean mask.
+
+    @see: L{ColumnarProxy<puremvc_multicore.patterns.columnar.ColumnarProxy>}
+    """
+    __slots__ = ('kind', 'rows', 'columns')
+
+    def __init__(self, kind, rows, columns):
+        """
+        Constructor.
+
+        @param kind: C{'replace'}, C{'append'}, C{'update'}, C{'delete'} or C{'sort'}
+        @param rows: the changed rows; for C{'delete'} the mask of the removed rows before
+        removal, for C{'sort'} the previous row number of each row
+        @param columns: the names of the changed columns
+        """
+        self.kind = kind
+        self.rows = rows
+        self.columns = columns
+
+
+    def __repr__(self):
+        return 'ColumnChange(%r, %r, %r)' % (self.kind, self.rows, self.columns)
+
+
+
+class ColumnarProxy(Proxy):
+    """
+    A C{Proxy} holding a table as one array per column.
+
+    The data is a dict of columns of equal length: NumPy arrays, or
+    without NumPy C{array.array}s of numbers and lists of other values.
+    Filtering, sorting and aggregating work on whole columns, which with
+    NumPy avoids looping over rows in Python.
+
+    Rows are selected by a C{slice}, a boolean mask as returned by
+    C{where}, or an array of row numbers as returned by C{order}. A mask
+    is a NumPy array of C{bool}s, or without NumPy a C{RowMask} or a
+    list of C{bool}s; any other array holds row numbers. Each
+    change sends a C{CHANGED} notification, typed with the name of the
+    proxy, whose body is a C{ColumnChange} telling which rows changed.
+
+    Appending copies the columns with NumPy, so append rows in bulk.
+
+    @see: L{ColumnChange<puremvc_multicore.patterns.columnar.ColumnChange>}
+    """
+
+    CHANGED = 'ColumnarProxyChanged'
+
+    dtypes = None
+
+    def __init__(self, proxy_name=None, data=None, dtypes=None):
+        """
+        Constructor.
+
+        @param proxy_name: the name of the proxy instance (optional)
+        @param data: a dict of sequences of values, by column name (optional)
+        @param dtypes: a dict of NumPy dtypes, by column name (optional)
+        """
+        self.dtypes = dict(dtypes or {})
+        super(ColumnarProxy, self).__init__(proxy_name, data if data is not None else {})
+
+
+    def set_data(self, data):
+        """
+        Replace the table.
+
+        @param data: a dict of sequences of values, by column name
+        """
+        columns = dict((name, make_column(values, self.dtypes.get(name))) for name, values in data.items())
+        lengths = set(len(column) for column in columns.values())
+        if len(lengths) > 1:
+            raise ValueError("Columns of %r differ in length" % self.proxy_name)
+        super(ColumnarProxy, self).set_data(columns)
+        self.changed('replace', slice(0, len(self)), tuple(columns))
+
+
+    def set_records(self, records):
+        """
+        Replace the table with rows given as dicts.
+
+        @param records: a sequence of dicts of values, by column name
+        """
+        names = list(self.data) or (list(records[0]) if records else [])
+        self.set_data(dict((name, [record[name] for record in records]) for name in names))
+
+
+    def __len__(self):
+        for column in self.data.values():
+            return len(column)
+        return 0
+
+
+    def column(self, name):
+        """
+        Get a column.
+
+        @param name: the name of the column
+        @return: the column, not a copy
+        """
+        return self.data[name]
+
+
+    def where(self, *conditions):
+        """
+        Select the rows meeting all of some conditions.
+
+        @param conditions: C{(column, operator, value)} tuples, the operator one of
+        C{==}, C{!=}, C{<}, C{<=}, C{>}, C{>=} or C{in}
+        @return: a boolean mask of the rows
+        """
+        mask = None
+        for name, op, value in conditions:
+            column = self.data[name]
+            if op == 'in':
+                if numpy is not None:
+                    selected = numpy.isin(column, list(value))
+                else:
+                    value = frozenset(value)
+                    selected = RowMask(map(value.__contains__, column))
+            elif numpy is not None:
+                selected = OPERATORS[op](column, value)
+            else:
+                selected = RowMask(map(OPERATORS[op], column, itertools.repeat(value)))
+            if mask is None:
+                mask = selected
+            elif numpy is not None:
+                mask &= selected
+            else:
+                mask = RowMask(map(operator.and_, mask, selected))
+        if mask is None:
+            mask = numpy.ones(len(self), dtype=bool) if numpy is not None else RowMask(itertools.repeat(1, len(self)))
+        return mask
+
+
+    def select(self, rows=None, columns=None):
+        """
+        Get some rows of some columns.
+
+        @param rows: the rows, all if C{None}
+        @param columns: the names of the columns, all if C{None}
+        @return: a dict of columns, by name
+        """
+        names = columns if columns is not None else list(self.data)
+        return dict((name, take(self.data[name], rows)) for name in names)
+
+
+    def records(self, rows=None, columns=None):
+        """
+        Get some rows as dicts.
+
+        @param rows: the rows, all if C{None}
+        @param columns: the names of the columns, all if C{None}
+        @return: a list of dicts of values, by column name
+        """
+        selected = self.select(rows, columns)
+        names = list(selected)
+        values = [column.tolist() if numpy is not None else column for column in selected.values()]
+        return [dict(zip(names, row)) for row in zip(*values)]
+
+
+    def count(self, rows=None):
+        """
+        Count rows.
+
+        @param rows: the rows, all if C{None}
+        @return: the number of rows
+        """
+        if rows is None:
+            return len(self)
+        if rows.__class__ is slice:
+            return len(range(*rows.indices(len(self))))
+        if numpy is not None:
+            rows = numpy.asarray(rows)
+            return int(numpy.count_nonzero(rows)) if rows.dtype == bool else len(rows)
+        if is_mask(rows):
+            return sum(map(bool, rows))
+        return len(rows)
+
+
+    def aggregate(self, name, function, rows=None):
+        """
+        Aggregate a column.
+
+        @param name: the name of the column
+        @param function: C{'sum'}, C{'min'}, C{'max'}, C{'mean'} or C{'count'}
+        @param rows: the rows, all if C{None}
+        @return: the aggregate, C{None} for the C{min}, C{max} or C{mean} of no rows
+        """
+        if function not in AGGREGATES:
+            raise ValueError("Unknown aggregate %r" % (function,))
+        if function == 'count':
+            return self.count(rows)
+        values = take(self.data[name], rows)
+        if function == 'sum':
+            return values.sum() if numpy is not None else sum(values)
+        if not len(values):
+            return None
+        if numpy is not None:
+            return getattr(values, function)()
+        if function == 'mean':
+            return sum(values) / len(values)
+        return min(values) if function == 'min' else max(values)
+
+
+    def order(self, name, reverse=False):
+        """
+        Get the row numbers sorted by a column.
+
+        @param name: the name of the column
+        @param reverse: sort in descending order
+        @return: an array of row numbers
+        """
+        column = self.data[name]
+        if numpy is not None:
+            indices = numpy.argsort(column, kind='stable')
+            return indices[::-1] if reverse else indices
+        return array.array('q', sorted(range(len(column)), key=column.__getitem__, reverse=reverse))
+
+
+    def sort(self, name, reverse=False):
+        """
+        Reorder the rows by a column.
+
+        @param name: the name of the column
+        @param reverse: sort in descending order
+        """
+        indices = self.order(name, reverse)
+        self.data = dict((column_name, take(column, indices)) for column_name, column in self.data.items())
+        self.version += 1
+        self.changed('sort', indices, tuple(self.data))
+
+
+    def append(self, data):
+        """
+        Append rows.
+
+        @param data: a dict of sequences of values, by column name, for all columns
+        """
+        start = len(self)
+        if set(data) != set(self.data):
+            raise ValueError("Rows appended to %r must have its columns" % self.proxy_name)
+        appended = dict((name, column_like(self.data[name], data[name])) for name in self.data)
+        if len(set(len(column) for column in appended.values())) > 1:
+            raise ValueError("Columns appended to %r differ in length" % self.proxy_name)
+        for name, column in appended.items():
+            if numpy is not None:
+                self.data[name] = numpy.concatenate((self.data[name], column))
+            else:
+                self.data[name].extend(column)
+        self.version += 1
+        self.changed('append', slice(start, len(self)), tuple(self.data))
+
+
+    def append_records(self, records):
+        """
+        Append rows given as dicts.
+
+        @param records: a sequence of dicts of values, by column name
+        """
+        self.append(dict((name, [record[name] for record in records]) for name in self.data))
+
+
+    def update(self, rows, values):
+        """
+        Set columns of some rows to a value.
+
+        @param rows: the rows
+        @param values: a dict of the new values, by column name
+        """
+        for name, value in values.items():
+            column = self.data[name]
+            if numpy is not None:
+                column[rows] = value
+            else:
+                for index in to_indices(rows, len(column)):
+                    column[index] = value
+        self.version += 1
+        self.changed('update', rows, tuple(values))
+
+
+    def delete(self, rows):
+        """
+        Remove some rows.
+
+        @param rows: the rows to remove
+        """
+        length = len(self)
+        if numpy is not None:
+            removed = numpy.zeros(length, dtype=bool)
+            removed[to_indices(rows, length)] = True
+            keep = ~removed
+        else:
+            removed = RowMask(itertools.repeat(0, length))
+            for index in to_indices(rows, length):
+                removed[index] = 1
+            keep = RowMask(map(operator.not_, removed))
+        self.data = dict((name, take(column, keep)) for name, column in self.data.items())
+        self.version += 1
+        self.changed('delete', removed, tuple(self.data))
+
+
+    def changed(self, kind, rows, columns):
+        """
+        Send the C{CHANGED} notification, if the proxy is registered.
+
+        @param kind: the kind of change
+        @param rows: the changed rows
+        @param columns: the names of the changed columns
+        """
+        if self.multiton_key is not None:
+            self.send_notification(self.CHANGED, ColumnChange(kind, rows, columns), self.proxy_name)
@@ -0,0 +1,210 @@
+"""
+ PureMVC Multicore Port, pep8 by Oleg Butovich <obutovich@gmail.com>
+ PureMVC Python Port by Toby de Havilland <toby.de.havilland@puremvc.org>
+ PureMVC - Copyright(c) 2006-08 Futurescale, Inc., Some rights reserved.
+ Your reuse is governed by the Creative Commons Attribution 3.0 License
+"""
+from abc import abstractmethod
+from puremvc_multicore.patterns.proxy import Proxy
+
+
+class AppendOnlyProxy(Proxy):
+    """
+    A C{Proxy} holding a list that normally only grows.
+
+    Items added with C{append} and C{extend} let the C{ComputedProxy}s
+    depending on it update their value from the new items alone.
+    Replacing the list with C{set_data}, or changing it in place and
+    calling C{mark_changed}, starts a new C{generation}, after which
+    they compute their value from scratch.
+
+    @see: L{ComputedProxy<puremvc_multicore.patterns.computed.ComputedProxy>}
+    """
+
+    # bumped when the list is replaced rather than appended to
+    generation = 0
+
+    def __init__(self, proxy_name=None, data=None):
+        """
+        Constructor.
+
+        @param proxy_name: the name of the proxy instance (optional)
+        @param data: the initial list (optional)
+        """
+        super(AppendOnlyProxy, self).__init__(proxy_name, data if data is not None else [])
+
+
+    def set_data(self, data):
+        """
+        Replace the list.
+
+        @param data: the new list
+        """
+        super(AppendOnlyProxy, self).set_data(data)
+        self.generation += 1
+
+
+    def mark_changed(self):
+        """
+        Record a change made to the list in place, other than appending.
+
+        Items may have been changed or removed, so it starts a new
+        C{generation} as C{set_data} does.
+        """
+        super(AppendOnlyProxy, self).mark_changed()
+        self.generation += 1
+
+
+    def append(self, item):
+        """
+        Add an item to the end of the list.
+
+        @param item: the item
+        """
+        self.data.append(item)
+        self.version += 1
+
+
+    def extend(self, items):
+        """
+        Add items to the end of the list.
+
+        @param items: the items
+        """
+        self.data.extend(items)
+        self.version += 1
+
+
+
+class ComputedProxy(Proxy):
+    """
+    A C{Proxy} whose data is derived from other proxies of its Core.
+
+    Name the proxies it depends on in C{DEPENDENCIES} (or pass them to
+    the constructor) and implement C{compute}, which gets their data in
+    that order. The value is computed on C{get_data}, and only if one of
+    them has changed since the previous computation, as seen by their
+    C{version}; so commands changing the sources no longer recompute the
+    derived data eagerly.
+
+    When the only changes are items appended to C{AppendOnlyProxy}
+    sources, C{update_appended} is tried first and may return the new
+    value from the previous one and the new items.
+
+    @see: L{AppendOnlyProxy<puremvc_multicore.patterns.computed.AppendOnlyProxy>}
+    """
+
+    DEPENDENCIES = ()
+
+    dependencies = None
+    # the (proxy, version, generation, length) of each source at the last computation
+    stamps = None
+
+    def __init__(self, proxy_name=None, dependencies=None):
+        """
+        Constructor.
+
+        @param proxy_name: the name of the proxy instance (optional)
+        @param dependencies: the names of the proxies the data is computed from (optional)
+        """
+        super(ComputedProxy, self).__init__(proxy_name)
+        self.dependencies = tuple(dependencies if dependencies is not None else self.DEPENDENCIES)
+
+
+    @abstractmethod
+    def compute(self, *sources):
+        """
+        Compute the data from the data of the sources.
+
+        Override in your subclass.
+
+        @param sources: the data of the proxies named in C{dependencies}, in that order
+        @return: the data of this proxy
+        """
+        pass
+
+
+    def update_appended(self, value, appended):
+        """
+        Update the data after items were appended to some sources.
+
+        @param value: the data computed previously
+        @param appended: a dict of the lists of new items, by name of the C{AppendOnlyProxy}
+        @return: the new data, or C{NotImplemented} to compute it from scratch
+        """
+        return NotImplemented
+
+
+    def get_data(self):
+        """
+        Get the data, computing it again if a source has changed.
+
+        @return: the computed data
+        """
+        self.refresh()
+        return self.data
+
+
+    def refresh(self):
+        """
+        Compute the data again if a source has changed.
+
+        @return: whether the data was computed again
+        """
+        model = self.facade.model
+        sources = []
+        for proxy_name in self.dependencies:
+            proxy = model.retrieve_proxy(proxy_name)
+            if proxy is None:
+                raise KeyError("Proxy %r needed by %r is not registered" % (proxy_name, self.proxy_name))
+            if isinstance(proxy, ComputedProxy):
+                proxy.refresh()
+            sources.append(proxy)
+
+        previous = self.stamps
+        if previous is not None and len(previous) == len(sources):
+            if all(stamp[0] is proxy and stamp[1] == proxy.version for stamp, proxy in zip(previous, sources)):
+                return False
+
+        stamps = tuple((proxy, proxy.version, getattr(proxy, 'generation', None), self.source_length(proxy))
+                       for proxy in sources)
+        value = NotImplemented
+        if previous is not None and len(previous) == len(sources):
+            appended = self.appended_items(previous, sources)
+            if appended is not None:
+                value = self.update_appended(self.data, appended)
+        if value is NotImplemented:
+            value = self.compute(*[proxy.get_data() for proxy in sources])
+
+        self.data = value
+        self.version += 1
+        self.stamps = stamps
+        return True
+
+
+    def appended_items(self, previous, sources):
+        """
+        Get the items appended to the sources since the last computation.
+
+        @return: a dict of the lists of new items by proxy name, or
+        C{None} if a source changed in another way
+        """
+        appended = {}
+        for (proxy, version, generation, length), source in zip(previous, sources):
+            if proxy is source and version == source.version:
+                continue
+            if proxy is not source or not isinstance(source, AppendOnlyProxy) or generation != source.generation:
+                return None
+            appended[source.get_proxy_name()] = source.data[length:]
+        return appended
+
+
+    def source_length(self, proxy):
+        if isinstance(proxy, AppendOnlyProxy):
+            return len(proxy.data)
+        return None
+
+
+    def on_register(self):
+        # computed again once registered, the sources of a copy made by Facade.clone_core differ
+        self.stamps = None
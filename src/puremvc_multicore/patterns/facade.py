@@ -4,28 +4,14 @@
  PureMVC - Copyright(c) 2006-08 Futurescale, Inc., Some rights reserved.
  Your reuse is governed by the Creative Commons Attribution 3.0 License
 """
-from abc import ABCMeta
-from puremvc_multicore.core import Controller, View, Model
+import gc
+import sys
+from puremvc_multicore.core import Controller, View, Model, MultitonMeta, copy_instance, update_interest_index
 from puremvc_multicore.interfaces import IFacade
-from puremvc_multicore.patterns.observer import Notification
+from puremvc_multicore.patterns.observer import Notification, RequestNotification
 
 
-class FacadeMeta(ABCMeta):
-    def __init__(cls, name, bases, dict):
-        super(FacadeMeta, cls).__init__(name, bases, dict)
-        IFacade.instance_map = {}
-
-
-    def __call__(cls, key, *args,**kw):
-        if key not in IFacade.instance_map:
-#            if cls.__name__ == 'Facade':
-#                raise RuntimeError('Cannot create instances of Facade directly.')
-            IFacade.instance_map[key] = super(FacadeMeta, cls).__call__(key, *args, **kw)
-        return IFacade.instance_map[key]
-
-
-
-class Facade(IFacade):
+class Facade(IFacade, metaclass=MultitonMeta):
     """
     A base Singleton C{IFacade} implementation.
 
@@ -51,11 +37,11 @@ class Facade(IFacade):
     @see: L{MacroCommand<org.puremvc_multicore.as3.patterns.command.MacroCommand>}
     """
 
-    __metaclass__ = FacadeMeta
-
     controller = None
     model = None
     view = None
+    # the Scheduler of send_notification_later, the shared one if None
+    scheduler = None
 
 
     def __init__(self, key):
@@ -72,6 +58,194 @@ class Facade(IFacade):
         self.initialize_view()
 
 
+    @classmethod
+    def has_core(cls, key):
+        """
+        Check if a Core is registered or not
+
+        @param key: the multiton key for the Core in question
+        @return: whether a Core is registered with the given C{key}.
+        """
+        return key in IFacade.instance_map
+
+
+    @classmethod
+    def remove_core(cls, key):
+        """
+        Remove a Core.
+
+        Remove the C{Model}, C{View}, C{Controller} and C{Facade}
+        instances for the given key.
+
+        @param key: multiton key of the Core to remove
+        """
+        if key not in IFacade.instance_map:
+            return
+        Model.remove_instance(key)
+        View.remove_instance(key)
+        Controller.remove_instance(key)
+        del IFacade.instance_map[key]
+
+        # notifications can only have been scheduled if the scheduler was imported
+        scheduler = sys.modules.get('puremvc_multicore.patterns.scheduler')
+        if scheduler is not None:
+            scheduler.cancel_core(key)
+        actor = sys.modules.get('puremvc_multicore.patterns.actor')
+        if actor is not None:
+            actor.stop_core(key)
+        watchdog = sys.modules.get('puremvc_multicore.patterns.watchdog')
+        if watchdog is not None:
+            watchdog.stop_core(key)
+
+
+    def clone_core(self, key):
+        """
+        Create a new Core from this fully initialized one.
+
+        Use a Core built once through the usual C{initialize_controller},
+        C{initialize_model} and C{initialize_view} as a template and
+        stamp out further Cores from it without running those
+        initializers again. The command map and observer lists are
+        copied in bulk; only the C{IProxy} and C{IMediator} instances
+        registered with the template are copied for the new Core, and
+        get their C{on_register} call once it is fully wired up. Proxy
+        and mediator factories stay lazy in the new Core.
+
+        Proxies are copied with their data, which C{Proxy.copy_data}
+        copies deeply, so the Cores do not share it. Mediator copies
+        are shallow: their view components are shared with the
+        template until replaced, so register per-Core view state
+        through factories or replace it after cloning.
+
+        @param key: the multiton key of the new Core
+        @return: the new C{Facade}, registered under C{key}
+        """
+        if key in IFacade.instance_map:
+            raise ValueError("Core %r already exists" % (key,))
+
+        facade = copy_instance(self)
+        # the actor or open batch of this Core does not serve the copy
+        facade.__dict__.pop('notify_observers', None)
+        facade.initialize_notifier(key)
+        IFacade.instance_map[key] = facade
+        # the mediator actors and the watchdog of this Core do not serve the copy
+        originals = {}
+        actor = sys.modules.get('puremvc_multicore.patterns.actor')
+        if actor is not None:
+            originals.update(actor.original_observers(self.multiton_key))
+        watchdog = sys.modules.get('puremvc_multicore.patterns.watchdog')
+        if watchdog is not None:
+            originals.update(watchdog.original_observers(self.multiton_key))
+        try:
+            facade.controller = self.controller.clone(key)
+            facade.view = self.view.clone(key, {
+                id(self.controller): facade.controller,
+                id(self.controller.observer): facade.controller.observer,
+            }, originals)
+            facade.controller.view = facade.view
+            facade.model = self.model.clone(key)
+
+            for proxy in list(facade.model.proxy_map.values()):
+                proxy.on_register()
+            for mediator in list(facade.view.mediator_map.values()):
+                mediator.on_register()
+        except BaseException:
+            self.remove_core(key)
+            raise
+        return facade
+
+
+    @classmethod
+    def prepare_for_fork(cls, freeze=True):
+        """
+        Prepare the Cores of this process to be shared with forked workers.
+
+        Call this in a pre-fork master once all Cores are built, right
+        before forking. It imports the C{ICommand}s registered by dotted
+        import path, so workers share the imported modules, and then
+        collects garbage and moves every object that survived into the
+        permanent generation with C{gc.freeze()}. The garbage collector
+        of a worker then never visits the objects of the Cores, so it
+        does not dirty the memory pages the worker shares copy-on-write
+        with the master. The observer lists of the C{View}s are tuples
+        that are replaced rather than changed, so they stay untouched
+        as long as no observers are registered or removed.
+
+        Workers should keep the objects frozen; the master may call
+        C{gc.unfreeze()} once all workers are forked.
+
+        @param freeze: whether to call C{gc.freeze()}
+        """
+        for facade in list(IFacade.instance_map.values()):
+            if facade.controller is not None:
+                facade.controller.prewarm_commands()
+        if freeze:
+            gc.collect()
+            gc.freeze()
+
+
+    @classmethod
+    def broadcast(cls, notification_name, body=None, type=None, executor=None):
+        """
+        Send an C{INotification} to every Core interested in it.
+
+        The C{INotification} is created once and handed only to the
+        Cores whose C{View} has observers of its name, or of its name
+        and type, as found in an index of all Cores kept by the
+        C{View}s; the other Cores are not visited. Each Core receives it
+        through C{notify_observers} of its C{Facade}, so open batches
+        apply.
+
+        Cores hibernated by a C{HibernatingCoreMap} have no C{View}, so
+        they are not in the index and do not receive the notification;
+        they are not restored for it either. Look them up with
+        C{Facade(key)} first to have them notified.
+
+        @param notification_name: the name of the notification to send
+        @param body: the body of the notification (optional)
+        @param type: the type of the notification (optional)
+        @param executor: a C{concurrent.futures.Executor} notifying the Cores in parallel (optional)
+        @return: the number of Cores notified
+        """
+        keys = cls.interested_cores(notification_name, type)
+        if not keys:
+            return 0
+        notification = Notification(notification_name, body, type)
+
+        def deliver(key):
+            facade = IFacade.instance_map.get(key)
+            if facade is not None:
+                facade.notify_observers(notification)
+                return 1
+            view = View.instance_map.get(key)
+            if view is not None:
+                view.notify_observers(notification)
+                return 1
+            return 0
+
+        if executor is not None:
+            return sum(executor.map(deliver, keys))
+        return sum(deliver(key) for key in keys)
+
+
+    @classmethod
+    def interested_cores(cls, notification_name, type=None):
+        """
+        Get the Cores having observers of a notification name.
+
+        @param notification_name: the notification name
+        @param type: the notification type, to include the Cores observing only that type (optional)
+        @return: a list of multiton keys
+        """
+        interest_index = update_interest_index()
+        keys = interest_index.get(notification_name, ())
+        if type is not None:
+            typed_keys = interest_index.get((notification_name, type))
+            if typed_keys:
+                keys = typed_keys.union(keys)
+        return list(keys)
+
+
     def initialize_controller(self):
         """
         Initialize the C{Controller}.
@@ -155,11 +329,21 @@ class Facade(IFacade):
         Register an C{ICommand} with the C{Controller} by Notification name.
 
         @param notificationName: the name of the C{INotification} to associate the C{ICommand} with
-        @param command_class_ref: a reference to the Class of the C{ICommand}
+        @param command_class_ref: a reference to the Class of the C{ICommand}, or its dotted import path
         """
         self.controller.register_command(notificationName, command_class_ref)
 
 
+    def prewarm_commands(self, background=False):
+        """
+        Import the C{ICommand}s registered by dotted import path ahead of their first use.
+
+        @param background: import them in a daemon thread instead of the calling thread
+        @return: the started C{Thread} if C{background} is set, otherwise C{None}
+        """
+        return self.controller.prewarm_commands(background)
+
+
     def remove_command(self, notification_name):
         """
         Remove a previously registered C{ICommand} to C{INotification} mapping from the Controller.
@@ -188,6 +372,20 @@ class Facade(IFacade):
         self.model.register_proxy(proxy)
 
 
+    def register_proxy_factory(self, proxy_name, factory):
+        """
+        Register a factory for an C{IProxy} with the C{Model} by name.
+
+        The C{IProxy} is created and registered the first time it
+        is retrieved, so expensive proxies that are never used
+        cost nothing at startup.
+
+        @param proxy_name: the name the C{IProxy} will be retrieved by.
+        @param factory: a callable returning the C{IProxy}, usually its C{Class}.
+        """
+        self.model.register_proxy_factory(proxy_name, factory)
+
+
     def retrieve_proxy(self, proxy_name):
         """
         Retrieve an C{IProxy} from the C{Model} by name.
@@ -231,6 +429,22 @@ class Facade(IFacade):
             self.view.register_mediator(mediator)
 
 
+    def register_mediator_factory(self, mediator_name, factory, interests):
+        """
+        Register a factory for an C{IMediator} with the C{View}.
+
+        The C{IMediator} is created and registered when the first
+        C{INotification} named in C{interests} is broadcast, or when
+        it is retrieved, so unused mediators cost nothing at startup.
+
+        @param mediator_name: the name the C{IMediator} will be retrieved by
+        @param factory: a callable returning the C{IMediator}, usually its C{Class}
+        @param interests: the C{INotification} names that trigger the creation of the C{IMediator}
+        """
+        if self.view is not None:
+            self.view.register_mediator_factory(mediator_name, factory, interests)
+
+
     def retrieve_mediator(self, mediator_name):
         """
         Retrieve an C{IMediator} from the C{View}.
@@ -278,6 +492,193 @@ class Facade(IFacade):
         self.notify_observers(Notification(notification_name, body, type))
 
 
+    def batch(self, merge=False):
+        """
+        Defer the notifications of this Core until the end of a C{with} block.
+
+        The notifications are all delivered in order when the block
+        ends, or discarded if it raises. Around bulk updates whose
+        notifications carry the whole state, merge them so that
+        observers are notified once per notification name and type
+        instead of once per change::
+
+            with facade.batch(merge=True):
+                for record in records:
+                    proxy.update(record)
+
+        @param merge: a callable merging two notifications of the same name and type into one,
+        C{True} to keep the later one or C{False} to deliver them all
+        @return: the C{NotificationBatch}
+        """
+        from puremvc_multicore.patterns.batch import NotificationBatch, keep_last
+        if merge is True:
+            merge = keep_last
+        return NotificationBatch(self, merge or None)
+
+
+    def send_notification_later(self, delay, notification_name, body=None, type=None, interval=None):
+        """
+        Send an C{INotification} after a delay, once or repeatedly.
+
+        The notification is sent by the C{scheduler} of this Core,
+        or by the shared one running in a daemon thread. The observers
+        are notified on the thread of the scheduler, or on the thread
+        of the Core if it runs an actor, see C{start_actor}. Removing
+        the Core cancels its scheduled notifications.
+
+        @param delay: the delay in seconds before the notification is sent
+        @param notification_name: the name of the notification to send
+        @param body: the body of the notification (optional)
+        @param type: the type of the notification (optional)
+        @param interval: the period in seconds at which the notification is repeated (optional)
+        @return: the C{ScheduledNotification}, to C{cancel} it with
+        """
+        scheduler = self.scheduler
+        if scheduler is None:
+            # imported here, it loads threading which short-lived processes do not need
+            from puremvc_multicore.patterns.scheduler import shared_scheduler
+            scheduler = shared_scheduler()
+        return scheduler.schedule(self.multiton_key, delay, notification_name, body, type, interval)
+
+
+    def start_actor(self, max_pending=None, policy='block'):
+        """
+        Run this Core on a thread of its own, fed by a mailbox.
+
+        Notifications sent to the Core from other threads are then
+        queued and dispatched one at a time by its thread. Removing the
+        Core stops the thread once its mailbox is empty.
+
+        With C{max_pending}, the mailbox holds at most that many
+        notifications; once it is full, the C{policy} C{'block'} makes
+        the sender wait, C{'drop_oldest'} and C{'drop_newest'} drop a
+        notification, and C{'coalesce'} replaces a waiting one of the
+        same name and type.
+
+        @param max_pending: the largest number of notifications waiting, unbounded if C{None}
+        @param policy: the overflow policy of a bounded mailbox
+        @return: the running C{CoreActor}, to C{flush}, C{stop} or get the C{stats} of
+        """
+        # imported here, it loads threading which short-lived processes do not need
+        from puremvc_multicore.patterns.actor import CoreActor, get_actor
+        actor = get_actor(self.multiton_key)
+        if actor is None:
+            actor = CoreActor(self, max_pending, policy).start()
+        return actor
+
+
+    def start_mediator_actor(self, mediator_name, max_pending=None, policy='block'):
+        """
+        Run the notifications of an C{IMediator} on a thread of its own.
+
+        Its observers then queue notifications in a mailbox instead of
+        calling it, so it no longer holds up the sender; the mailbox is
+        bounded as with C{start_actor}. Removing the Core stops the
+        thread once its mailbox is empty.
+
+        @param mediator_name: the name of the mediator
+        @param max_pending: the largest number of notifications waiting, unbounded if C{None}
+        @param policy: the overflow policy of a bounded mailbox
+        @return: the running C{MediatorActor}, to C{flush}, C{stop} or get the C{stats} of
+        """
+        from puremvc_multicore.patterns.actor import MediatorActor, get_mediator_actor
+        actor = get_mediator_actor(self.multiton_key, mediator_name)
+        if actor is None:
+            mediator = self.retrieve_mediator(mediator_name)
+            if mediator is None:
+                raise KeyError("No Mediator %r in Core %r" % (mediator_name, self.multiton_key))
+            actor = MediatorActor(self.view, mediator, max_pending, policy).start()
+        return actor
+
+
+    def start_watchdog(self, budget=0.05, budgets=None, report=None, sample_interval=None, demote=None, strikes=3):
+        """
+        Time the observers of this Core against a budget.
+
+        Mediators and commands taking longer than their budget are
+        recorded as offenders, with samples of their stack if a
+        C{sample_interval} is given, and demoted once flagged C{strikes}
+        times if C{demote} is C{'async'} or C{'defer'}.
+
+        @param budget: the time an observer may take, in seconds
+        @param budgets: a dict of the budgets of some mediators or commands, by name (optional)
+        @param report: a callable given the C{Offender}, the C{INotification} and the time taken (optional)
+        @param sample_interval: the interval, in seconds, at which stacks are sampled (optional)
+        @param demote: C{'async'} or C{'defer'} to demote offenders (optional)
+        @param strikes: the number of times an offender is flagged before it is demoted
+        @return: the running C{Watchdog}, to get the C{offenders} of or C{stop}
+        """
+        from puremvc_multicore.patterns.watchdog import Watchdog, get_watchdog
+        watchdog = get_watchdog(self.multiton_key)
+        if watchdog is None:
+            watchdog = Watchdog(self, budget, budgets, report, sample_interval, demote=demote,
+                                strikes=strikes).start()
+        return watchdog
+
+
+    @classmethod
+    def spawn_core(cls, key, setup=None, forward=(), target=None, context=None, batch_size=256):
+        """
+        Create a Core of this C{Facade} class in a child process.
+
+        The Core runs with an interpreter of its own, so it does not
+        compete for the global interpreter lock with the Cores of this
+        process. It is created by the usual initializers, then given to
+        C{setup}; this process gets a C{RemoteFacade} standing in for
+        its C{Facade}, which sends notifications to it and reads the
+        data of its proxies through a pipe.
+
+        @param key: the multiton key of the Core
+        @param setup: a picklable callable given the C{Facade} to finish registrations (optional)
+        @param forward: the names of the notifications the Core sends back to this process
+        @param target: the C{Facade} of this process notified of them, started as an actor (optional)
+        @param context: the C{multiprocessing} context, the default one if C{None}
+        @param batch_size: the largest number of notifications sent in one message
+        @return: the C{RemoteFacade}
+        """
+        # imported here, it loads multiprocessing which most processes do not need
+        from puremvc_multicore.patterns.process import RemoteFacade
+        return RemoteFacade.spawn(cls, key, setup, forward, target, context, batch_size)
+
+
+    def request(self, notification_name, body=None, type=None, loop=None):
+        """
+        Send an C{INotification} expecting a response.
+
+        The observers are notified of a C{RequestNotification}; the
+        one answering it calls C{respond} or C{reject} on it, right
+        away or later on, for instance from an asynchronous C{IProxy}.
+        An exception raised while notifying the observers rejects the
+        request, unless it was already answered: the exception is then
+        raised to the caller, as by C{send_notification}.
+
+        A request no observer answers never completes. Wait for it with
+        a timeout, as in C{future.result(timeout)} or
+        C{asyncio.wait_for(future, timeout)}.
+
+        @param notification_name: the name of the notification to send
+        @param body: the body of the notification (optional)
+        @param type: the type of the notification (optional)
+        @param loop: an C{asyncio} event loop, to get an C{asyncio.Future} of it (optional)
+        @return: a C{concurrent.futures.Future}, or an C{asyncio.Future} if a C{loop} is given
+        """
+        if loop is not None:
+            future = loop.create_future()
+        else:
+            # imported here, it loads threading which short-lived processes do not need
+            from concurrent.futures import Future
+            future = Future()
+
+        note = RequestNotification(notification_name, body, type, future, loop)
+        try:
+            self.notify_observers(note)
+        except Exception as e:
+            if note.answered:
+                raise
+            note.reject(e)
+        return future
+
+
     def notify_observers(self, notification):
         """
         Notify C{Observer}s.
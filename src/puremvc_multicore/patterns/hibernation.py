@@ -0,0 +1,471 @@
+"""
+ PureMVC Multicore Port, pep8 by Oleg Butovich <obutovich@gmail.com>
+ PureMVC Python Port by Toby de Havilland <toby.de.havilland@puremvc.org>
+ PureMVC - Copyright(c) 2006-08 Futurescale, Inc., Some rights reserved.
+ Your reuse is governed by the Creative Commons Attribution 3.0 License
+"""
+from collections import OrderedDict
+import hashlib
+import os
+import pickle
+import sys
+import weakref
+from puremvc_multicore.core import Controller, Model, View
+from puremvc_multicore.interfaces import IFacade
+
+
+class FileCoreStore(object):
+    """
+    A store for hibernated Cores keeping one file per Core in a directory.
+
+    @see: L{HibernatingCoreMap<puremvc_multicore.patterns.hibernation.HibernatingCoreMap>}
+    """
+
+    directory = None
+
+    def __init__(self, directory):
+        """
+        Constructor.
+
+        @param directory: the directory to keep the files in, created if missing
+        """
+        self.directory = directory
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+
+    def path(self, key):
+        """
+        Get the file name used for a multiton key.
+
+        @param key: the multiton key of the Core
+        @return: the path of the file
+        """
+        digest = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, digest + '.core')
+
+
+    def save(self, key, data):
+        """
+        Store the snapshot of a Core.
+
+        @param key: the multiton key of the Core
+        @param data: the snapshot as C{bytes}
+        """
+        path = self.path(key)
+        with open(path + '.tmp', 'wb') as f:
+            f.write(data)
+        os.replace(path + '.tmp', path)
+
+
+    def load(self, key):
+        """
+        Load the snapshot of a Core.
+
+        @param key: the multiton key of the Core
+        @return: the snapshot as C{bytes}, or C{None} if there is none
+        """
+        try:
+            with open(self.path(key), 'rb') as f:
+                return f.read()
+        except (IOError, OSError):
+            return None
+
+
+    def delete(self, key):
+        """
+        Delete the snapshot of a Core if there is one.
+
+        @param key: the multiton key of the Core
+        """
+        try:
+            os.remove(self.path(key))
+        except (IOError, OSError):
+            pass
+
+
+    def __contains__(self, key):
+        return os.path.exists(self.path(key))
+
+
+
+class SqliteCoreStore(object):
+    """
+    A store for hibernated Cores keeping all of them in one C{sqlite3} database.
+
+    @see: L{HibernatingCoreMap<puremvc_multicore.patterns.hibernation.HibernatingCoreMap>}
+    """
+
+    connection = None
+
+    def __init__(self, path):
+        """
+        Constructor.
+
+        @param path: the database file, or C{':memory:'}
+        """
+        import sqlite3
+        self.connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        # one transaction per eviction, without waiting on fsync for each of them
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.execute('CREATE TABLE IF NOT EXISTS cores (key TEXT PRIMARY KEY, data BLOB NOT NULL)')
+
+
+    def save(self, key, data):
+        """
+        Store the snapshot of a Core.
+
+        @param key: the multiton key of the Core
+        @param data: the snapshot as C{bytes}
+        """
+        self.connection.execute('INSERT OR REPLACE INTO cores (key, data) VALUES (?, ?)', (repr(key), data))
+
+
+    def load(self, key):
+        """
+        Load the snapshot of a Core.
+
+        @param key: the multiton key of the Core
+        @return: the snapshot as C{bytes}, or C{None} if there is none
+        """
+        row = self.connection.execute('SELECT data FROM cores WHERE key = ?', (repr(key),)).fetchone()
+        if row is None:
+            return None
+        return bytes(row[0])
+
+
+    def delete(self, key):
+        """
+        Delete the snapshot of a Core if there is one.
+
+        @param key: the multiton key of the Core
+        """
+        self.connection.execute('DELETE FROM cores WHERE key = ?', (repr(key),))
+
+
+    def __contains__(self, key):
+        return self.connection.execute('SELECT 1 FROM cores WHERE key = ?', (repr(key),)).fetchone() is not None
+
+
+    def close(self):
+        self.connection.close()
+
+
+
+def proxy_data_size(facade):
+    """
+    Estimate the memory held by a Core from the shallow size of its proxies' data.
+
+    @param facade: the C{Facade} of the Core
+    @return: the estimate in bytes
+    """
+    if facade.model is None:
+        return 0
+    return sum(sys.getsizeof(proxy.get_data()) for proxy in list(facade.model.proxy_map.values()))
+
+
+
+class HibernatingCoreMap(OrderedDict):
+    """
+    An LRU-managed C{IFacade.instance_map} that evicts idle Cores to a store.
+
+    Once installed, every lookup of a Core through C{Facade(key)},
+    C{Facade.get_instance} or a C{Notifier}'s C{facade} marks it as
+    recently used. When more than C{max_cores} Cores are resident, or
+    their estimated size exceeds C{max_bytes}, the least recently used
+    ones are hibernated: their proxies (with their data), mediators and
+    C{Facade} class are pickled into the store and the Core is removed
+    from memory. The next lookup of a hibernated Core restores it
+    transparently: its C{Facade} is created again, running the usual
+    initializers, proxies that the initializers registered get their
+    data back through C{restore_data} and the other proxies and mediators
+    are registered again from the snapshot.
+
+    Commands and factories are not part of the snapshot; they are
+    expected to be registered by the initializers. A Core whose proxies
+    or mediators cannot be pickled stays resident, and so does a Core
+    running on an actor or watched by a watchdog, whose threads use it.
+
+    Hibernating a Core calls C{on_remove} on its proxies and mediators,
+    as removing them would. A C{Facade} of the Core still referenced
+    elsewhere is detached, its C{model}, C{view} and C{controller} set
+    to C{None}; restoring the Core initializes that same C{Facade}
+    again instead of creating another one.
+
+    @see: L{FileCoreStore<puremvc_multicore.patterns.hibernation.FileCoreStore>}
+    @see: L{SqliteCoreStore<puremvc_multicore.patterns.hibernation.SqliteCoreStore>}
+    """
+
+    def __init__(self, store, max_cores=None, max_bytes=None, sizeof=proxy_data_size):
+        """
+        Constructor.
+
+        @param store: the store receiving the hibernated Cores
+        @param max_cores: the number of Cores kept in memory (optional)
+        @param max_bytes: the estimated size of the Cores kept in memory (optional)
+        @param sizeof: a callable estimating the size of a Core from its C{Facade}
+        """
+        OrderedDict.__init__(self)
+        self.store = store
+        self.max_cores = max_cores
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.sizes = {}
+        self.pinned = set()
+        # the Facades of hibernated Cores, as long as they are referenced elsewhere
+        self.detached = weakref.WeakValueDictionary()
+        self.previous_map = None
+        self.hits = 0
+        self.restores = 0
+        self.evictions = 0
+        self.failures = 0
+        self.bytes_written = 0
+
+
+    def install(self):
+        """
+        Make this map the C{IFacade.instance_map}, taking over the Cores already created.
+        """
+        if IFacade.instance_map is self:
+            return
+        self.previous_map = IFacade.instance_map
+        for key, facade in self.previous_map.items():
+            OrderedDict.__setitem__(self, key, facade)
+            self.sizes[key] = self.sizeof(facade)
+        IFacade.instance_map = self
+        self.enforce_budget()
+
+
+    def uninstall(self):
+        """
+        Restore a plain C{IFacade.instance_map} holding the resident Cores.
+
+        Hibernated Cores stay in the store.
+        """
+        if IFacade.instance_map is not self:
+            return
+        instance_map = self.previous_map if self.previous_map is not None else {}
+        instance_map.clear()
+        instance_map.update(OrderedDict.items(self))
+        IFacade.instance_map = instance_map
+
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+
+    def __getitem__(self, key):
+        try:
+            facade = OrderedDict.__getitem__(self, key)
+        except KeyError:
+            facade = self.restore(key)
+            if facade is None:
+                raise
+            return facade
+        self.move_to_end(key)
+        self.hits += 1
+        return facade
+
+
+    def __setitem__(self, key, facade):
+        OrderedDict.__setitem__(self, key, facade)
+        self.sizes[key] = self.sizeof(facade)
+        self.enforce_budget(keep=key)
+
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        self.pop(key, None)
+
+
+    def pop(self, key, *default):
+        self.store.delete(key)
+        self.sizes.pop(key, None)
+        self.pinned.discard(key)
+        self.detached.pop(key, None)
+        return OrderedDict.pop(self, key, *default)
+
+
+    def __contains__(self, key):
+        return OrderedDict.__contains__(self, key) or key in self.store
+
+
+    def is_resident(self, key):
+        """
+        Check if a Core is in memory.
+
+        @param key: the multiton key of the Core
+        @return: whether the Core is resident
+        """
+        return OrderedDict.__contains__(self, key)
+
+
+    def measure(self, key=None):
+        """
+        Update the size estimate of one or all resident Cores and enforce the budget.
+
+        A single Core measured here is kept resident.
+
+        @param key: the multiton key of the Core, or C{None} for all of them
+        """
+        keys = [key] if key is not None else list(OrderedDict.keys(self))
+        for name in keys:
+            self.sizes[name] = self.sizeof(OrderedDict.__getitem__(self, name))
+        self.enforce_budget(keep=key)
+
+
+    def enforce_budget(self, keep=None):
+        """
+        Hibernate the least recently used Cores until the budget is met.
+
+        @param keep: the multiton key of a Core never to hibernate now
+        """
+        for key in list(OrderedDict.keys(self)):
+            if not self.over_budget():
+                break
+            if key != keep and key not in self.pinned:
+                self.hibernate(key)
+
+
+    def over_budget(self):
+        if self.max_cores is not None and len(self) - len(self.pinned) > self.max_cores:
+            return True
+        return self.max_bytes is not None and sum(self.sizes.values()) > self.max_bytes
+
+
+    def snapshot(self, facade):
+        """
+        Pickle the state of a Core.
+
+        @param facade: the C{Facade} of the Core
+        @return: the snapshot as C{bytes}
+        """
+        proxies = list(facade.model.proxy_map.items()) if facade.model is not None else []
+        mediators = list(facade.view.mediator_map.items()) if facade.view is not None else []
+        state = {'facade_class': type(facade), 'proxies': proxies, 'mediators': mediators}
+        return pickle.dumps(state, pickle.HIGHEST_PROTOCOL)
+
+
+    def in_use(self, key):
+        """
+        Check if threads of an actor or a watchdog use a Core.
+
+        @param key: the multiton key of the Core
+        @return: whether the Core runs on an actor or is watched
+        """
+        # either can only run if its module was imported
+        actor = sys.modules.get('puremvc_multicore.patterns.actor')
+        if actor is not None:
+            if actor.get_actor(key) is not None or any(name[0] == key for name in list(actor.mediator_actors)):
+                return True
+        watchdog = sys.modules.get('puremvc_multicore.patterns.watchdog')
+        return watchdog is not None and watchdog.get_watchdog(key) is not None
+
+
+    def hibernate(self, key):
+        """
+        Move a resident Core to the store and remove it from memory.
+
+        @param key: the multiton key of the Core
+        @return: whether the Core was hibernated; Cores that cannot be pickled are pinned in memory
+        """
+        facade = OrderedDict.__getitem__(self, key)
+        if self.in_use(key):
+            return False
+        try:
+            data = self.snapshot(facade)
+        except Exception:
+            self.failures += 1
+            self.pinned.add(key)
+            return False
+
+        self.store.save(key, data)
+        if facade.model is not None:
+            for proxy in list(facade.model.proxy_map.values()):
+                proxy.on_remove()
+        if facade.view is not None:
+            for mediator in list(facade.view.mediator_map.values()):
+                mediator.on_remove()
+        Model.remove_instance(key)
+        View.remove_instance(key)
+        Controller.remove_instance(key)
+        OrderedDict.__delitem__(self, key)
+        facade.model = facade.view = facade.controller = None
+        self.detached[key] = facade
+        self.sizes.pop(key, None)
+        self.evictions += 1
+        self.bytes_written += len(data)
+        return True
+
+
+    def restore(self, key):
+        """
+        Bring a hibernated Core back into memory.
+
+        @param key: the multiton key of the Core
+        @return: the C{Facade} of the Core, or C{None} if the store has no such Core
+        """
+        data = self.store.load(key)
+        if data is None:
+            return None
+        state = pickle.loads(data)
+
+        # the snapshot leaves the store first, so creating the Facade does not restore it again
+        self.store.delete(key)
+        facade = self.detached.pop(key, None)
+        try:
+            if facade.__class__ is state['facade_class']:
+                # initialized again in place, as the metaclass does for a new instance
+                self[key] = facade
+                facade.__init__(key)
+            else:
+                facade = state['facade_class'](key)
+            for proxy_name, proxy in state['proxies']:
+                existing = facade.model.proxy_map.get(proxy_name)
+                if existing is None and proxy_name in facade.model.proxy_factory_map:
+                    existing = facade.model.create_proxy(proxy_name)
+                if existing is not None:
+                    existing.restore_data(proxy)
+                else:
+                    facade.register_proxy(proxy)
+            for mediator_name, mediator in state['mediators']:
+                if not facade.has_mediator(mediator_name):
+                    facade.register_mediator(mediator)
+        except BaseException:
+            self.store.save(key, data)
+            Model.remove_instance(key)
+            View.remove_instance(key)
+            Controller.remove_instance(key)
+            OrderedDict.pop(self, key, None)
+            raise
+
+        self.sizes[key] = self.sizeof(facade)
+        self.restores += 1
+        self.enforce_budget(keep=key)
+        return facade
+
+
+    def stats(self):
+        """
+        Get the statistics of this map.
+
+        @return: a dict with the number of C{resident} and C{pinned} Cores, the
+        lookups of resident Cores (C{hits}), the C{restores}, C{evictions} and
+        failed evictions (C{failures}), the C{bytes_written} to the store and
+        the C{estimated_bytes} of the resident Cores
+        """
+        return {
+            'resident': len(self),
+            'pinned': len(self.pinned),
+            'hits': self.hits,
+            'restores': self.restores,
+            'evictions': self.evictions,
+            'failures': self.failures,
+            'bytes_written': self.bytes_written,
+            'estimated_bytes': sum(self.sizes.values()),
+        }
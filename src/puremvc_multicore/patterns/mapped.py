@@ -0,0 +1,221 @@
+"""
+ PureMVC Multicore Port, pep8 by Oleg Butovich <obutovich@gmail.com>
+ PureMVC Python Port by Toby de Havilland <toby.de.havilland@puremvc.org>
+ PureMVC - Copyright(c) 2006-08 Futurescale, Inc., Some rights reserved.
+ Your reuse is governed by the Creative Commons Attribution 3.0 License
+"""
+import mmap
+import os
+import struct
+from puremvc_multicore.patterns.proxy import Proxy
+
+
+class MappedProxy(Proxy):
+    """
+    A C{Proxy} whose data is a file of fixed-size records mapped in memory.
+
+    The file is mapped on the first access to the data, not when the
+    proxy is created or registered, and only the pages read are loaded.
+    The mapping is shared, so processes mapping the same file, such as
+    workers forked or started with a copy of this proxy, share its pages
+    instead of each holding a copy of the data.
+
+    C{get_data} returns a C{memoryview} of the whole file and C{records}
+    one of a range of records; both are slices of the mapping, not
+    copies. Records are decoded with the C{struct} format given to the
+    constructor; the views can also be passed to C{numpy.frombuffer}.
+
+    A pickled C{MappedProxy} holds only the path of the file, which is
+    mapped again on first access after unpickling; C{restore_data} takes
+    the path of such a copy.
+    """
+
+    path = None
+    record_format = None
+    writable = False
+    map = None
+
+    def __init__(self, proxy_name=None, path=None, record_format='B', writable=False):
+        """
+        Constructor.
+
+        @param proxy_name: the name of the proxy instance (optional)
+        @param path: the path of the file (optional)
+        @param record_format: the C{struct} format of a record
+        @param writable: map the file for writing, changes being written back to it
+        """
+        self.record_format = struct.Struct(record_format)
+        self.writable = writable
+        super(MappedProxy, self).__init__(proxy_name, path)
+
+
+    @staticmethod
+    def dump(path, record_format, records):
+        """
+        Write records to a file to be mapped by a C{MappedProxy}.
+
+        @param path: the path of the file
+        @param record_format: the C{struct} format of a record
+        @param records: an iterable of tuples of values
+        @return: the number of records written
+        """
+        packer = struct.Struct(record_format)
+        count = 0
+        with open(path, 'wb') as output:
+            for record in records:
+                output.write(packer.pack(*record))
+                count += 1
+        return count
+
+
+    def set_data(self, data):
+        """
+        Map another file, on the next access to the data.
+
+        @param data: the path of the file
+        """
+        self.close()
+        self.path = os.fspath(data)
+        self.version += 1
+
+
+    def get_data(self):
+        """
+        Get the contents of the file, mapping it if needed.
+
+        @return: a C{memoryview} of the mapped file
+        """
+        data = self.data
+        if data is None:
+            data = self.load()
+        return data
+
+
+    def restore_data(self, proxy):
+        """
+        Map the file of a copy of this proxy, such as one restored from a snapshot.
+
+        @param proxy: the copy of the C{MappedProxy}
+        """
+        if proxy.path is not None:
+            self.set_data(proxy.path)
+
+
+    def copy_data(self):
+        # a copy made by Facade.clone_core maps the file again on first access
+        return None
+
+
+    def clone_for_core(self):
+        clone = super(MappedProxy, self).clone_for_core()
+        clone.map = None
+        return clone
+
+
+    def load(self):
+        """
+        Map the file.
+
+        @return: a C{memoryview} of the mapped file
+        """
+        if self.path is None:
+            raise ValueError("No file to map for Proxy %r" % self.proxy_name)
+        with open(self.path, 'r+b' if self.writable else 'rb') as mapped_file:
+            if os.fstat(mapped_file.fileno()).st_size == 0:
+                # an empty file cannot be mapped
+                self.data = memoryview(b'')
+            else:
+                access = mmap.ACCESS_WRITE if self.writable else mmap.ACCESS_READ
+                self.map = mmap.mmap(mapped_file.fileno(), 0, access=access)
+                self.data = memoryview(self.map)
+        return self.data
+
+
+    def close(self):
+        """
+        Unmap the file.
+
+        The mapping stays open while views returned by C{get_data} or
+        C{records} are alive; it is then closed when they are collected.
+        """
+        data, self.data = self.data, None
+        map_, self.map = self.map, None
+        if data is not None:
+            data.release()
+        if map_ is not None:
+            try:
+                map_.close()
+            except BufferError:
+                pass
+
+
+    def __len__(self):
+        return len(self.get_data()) // self.record_format.size
+
+
+    def records(self, start=0, stop=None):
+        """
+        Get a range of records without copying them.
+
+        @param start: the number of the first record
+        @param stop: the number of the record after the last one, the end if C{None}
+        @return: a C{memoryview} of the records
+        """
+        start, stop, _ = slice(start, stop).indices(len(self))
+        size = self.record_format.size
+        return self.get_data()[start * size:max(start, stop) * size]
+
+
+    def record(self, index):
+        """
+        Decode a record.
+
+        @param index: the number of the record
+        @return: the tuple of its values
+        """
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Record %r out of range in Proxy %r" % (index, self.proxy_name))
+        return self.record_format.unpack_from(self.get_data(), index * self.record_format.size)
+
+
+    def iter_records(self, start=0, stop=None):
+        """
+        Decode a range of records.
+
+        @param start: the number of the first record
+        @param stop: the number of the record after the last one, the end if C{None}
+        @return: an iterator of tuples of values
+        """
+        return self.record_format.iter_unpack(self.records(start, stop))
+
+
+    def write_record(self, index, values):
+        """
+        Encode a record in place; the proxy must be writable.
+
+        @param index: the number of the record
+        @param values: the tuple of its values
+        """
+        if not self.writable:
+            raise TypeError("Proxy %r is mapped read-only" % self.proxy_name)
+        self.record_format.pack_into(self.get_data(), index * self.record_format.size, *values)
+        self.version += 1
+
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        for name in ('data', 'map'):
+            state.pop(name, None)
+        state['record_format'] = self.record_format.format
+        return state
+
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.record_format = struct.Struct(state['record_format'])
+
+
+    def on_remove(self):
+        self.close()
@@ -65,6 +65,10 @@ class Mediator(Notifier, IMediator, INotifier):
         List the C{INotification} names this
         C{Mediator} is interested in being notified of.
 
+        A C{(name, type)} tuple limits an interest to the
+        C{INotification}s of that name carrying that type, so
+        C{handle_notification} is not called for the other types.
+
         @return: List the list of C{INotification} names
         """
         return []
@@ -5,8 +5,7 @@
  Your reuse is governed by the Creative Commons Attribution 3.0 License
 """
 
-from puremvc_multicore.interfaces import INotifier
-from puremvc_multicore.patterns.facade import Facade
+from puremvc_multicore.interfaces import INotifier, IFacade
 
 
 class Notifier(INotifier):
@@ -37,9 +36,14 @@ class Notifier(INotifier):
 
     @property
     def facade(self):
-        if self.multiton_key is None:
-            raise RuntimeError("multitonKey for this Notifier not yet initialized!")
-        return Facade(self.multiton_key)
+        facade = IFacade.instance_map.get(self.multiton_key)
+        if facade is None:
+            if self.multiton_key is None:
+                raise RuntimeError("multitonKey for this Notifier not yet initialized!")
+            # imported here so that importing a Proxy or Mediator does not pull in the whole core
+            from puremvc_multicore.patterns.facade import Facade
+            facade = Facade(self.multiton_key)
+        return facade
 
 
     def send_notification(self, notification_name, body=None, type=None):
@@ -56,6 +60,55 @@ class Notifier(INotifier):
         self.facade.send_notification(notification_name, body, type)
 
 
+    def send_notification_later(self, delay, notification_name, body=None, type=None, interval=None):
+        """
+        Send an C{INotification} after a delay, once or repeatedly.
+
+        @param delay: the delay in seconds before the notification is sent
+        @param notification_name: the name of the notification to send
+        @param body: the body of the notification (optional)
+        @param type: the type of the notification (optional)
+        @param interval: the period in seconds at which the notification is repeated (optional)
+        @return: the C{ScheduledNotification}, to C{cancel} it with
+        @see: L{Facade.send_notification_later<puremvc_multicore.patterns.facade.Facade.send_notification_later>}
+        """
+        return self.facade.send_notification_later(delay, notification_name, body, type, interval)
+
+
+    def request(self, notification_name, body=None, type=None, loop=None):
+        """
+        Send an C{INotification} expecting a response.
+
+        @param notification_name: the name of the notification to send
+        @param body: the body of the notification (optional)
+        @param type: the type of the notification (optional)
+        @param loop: an C{asyncio} event loop, to get an C{asyncio.Future} of it (optional)
+        @return: the future completed by the responder
+        @see: L{Facade.request<puremvc_multicore.patterns.facade.Facade.request>}
+        """
+        return self.facade.request(notification_name, body, type, loop)
+
+
+    def respond(self, notification, result=None):
+        """
+        Answer a request with a result.
+
+        @param notification: the C{RequestNotification} being handled
+        @param result: the result of the request
+        """
+        notification.respond(result)
+
+
+    def reject(self, notification, exception):
+        """
+        Answer a request with an exception.
+
+        @param notification: the C{RequestNotification} being handled
+        @param exception: the exception raised to the sender
+        """
+        notification.reject(exception)
+
+
     def initialize_notifier(self, key):
         self.multiton_key = key
 
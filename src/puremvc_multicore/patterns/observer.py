@@ -28,8 +28,8 @@ class Observer(IObserver):
     @see: L{View<org.puremvc_multicore.as3.core.view.View>}
     @see: L{Notification<org.puremvc_multicore.as3.patterns.observer.Notification>}
     """
-    notify = None
-    context = None
+    # no per-instance dict: a core holds one Observer per mediator and command name
+    __slots__ = ('notify', 'context')
 
     def __init__(self, notify_method, notify_context = None):
         """
@@ -143,6 +143,10 @@ class Notification(INotification):
         """
         Constructor.
 
+        A name interned by the shared C{notification_registry} gives the
+        C{Notification} its C{id}, which the C{View} and the
+        C{Controller} use to look up observers and commands.
+
         @param name: name of the C{Notification} instance. (required)
         @param body: the C{Notification} body. (optional)
         @param type; the type of the C{Notification} (optional)
@@ -150,6 +154,9 @@ class Notification(INotification):
         self.name = name
         self.body = body
         self.type = type
+        # always an instance attribute, which is the fastest to read on dispatch;
+        # the tables of the Cores are indexed by the ids of the shared registry only
+        self.id = name.id if name.__class__ is NotificationName and name.registry is notification_registry else None
 
 
     def get_name(self):
@@ -212,3 +219,191 @@ class Notification(INotification):
         msg += "\nBody:"+bd
         msg += "\nType:"+ty
         return msg
+
+
+
+class RequestNotification(Notification):
+    """
+    A C{Notification} expecting a response.
+
+    It carries the future returned to the sender by C{Facade.request};
+    the observer handling it completes that future with C{respond} or
+    C{reject}, so the response goes straight back to the sender instead
+    of being broadcast as another C{Notification}. Only the first
+    response counts, later ones are ignored; C{answered} tells whether
+    there was one.
+
+    Futures of C{asyncio} are completed in the thread of their event
+    loop, so they may be answered from any thread.
+
+    @see: L{Facade.request<puremvc_multicore.patterns.facade.Facade.request>}
+    """
+
+    future = None
+    loop = None
+    answered = False
+
+    def __init__(self, name, body=None, type=None, future=None, loop=None):
+        """
+        Constructor.
+
+        @param name: name of the C{Notification} instance. (required)
+        @param body: the C{Notification} body. (optional)
+        @param type: the type of the C{Notification} (optional)
+        @param future: the C{concurrent.futures.Future} or C{asyncio.Future} to complete
+        @param loop: the event loop of an C{asyncio.Future}
+        """
+        Notification.__init__(self, name, body, type)
+        self.future = future
+        self.loop = loop
+
+
+    def respond(self, result=None):
+        """
+        Complete the request with a result.
+
+        @param result: the result of the request
+        """
+        self.complete(self.future.set_result, result)
+
+
+    def reject(self, exception):
+        """
+        Complete the request with an exception.
+
+        @param exception: the exception raised to the sender
+        """
+        self.complete(self.future.set_exception, exception)
+
+
+    def complete(self, setter, value):
+        self.answered = True
+        if self.loop is not None:
+            # asyncio futures are not thread-safe, complete them in their loop
+            future = self.future
+            def complete():
+                if not future.done():
+                    setter(value)
+            self.loop.call_soon_threadsafe(complete)
+            return
+        try:
+            setter(value)
+        except Exception:
+            # already answered
+            pass
+
+
+
+class NotificationName(str):
+    """
+    A notification name interned by a C{NotificationRegistry}.
+
+    It is an ordinary string everywhere a name is expected, and in
+    addition carries the dense integer C{id} assigned to the name by
+    its C{registry}. Ids are only valid in the registry and the process
+    that assigned them: a pickled C{NotificationName} is unpickled as a
+    plain string.
+
+    @see: L{NotificationRegistry<puremvc_multicore.patterns.observer.NotificationRegistry>}
+    """
+    id = None
+    registry = None
+
+    def __reduce__(self):
+        return str, (str(self),)
+
+
+
+class NotificationRegistry(object):
+    """
+    Assigns dense integer ids to notification names.
+
+    Interning is optional. Define the names of frequently sent
+    notifications with C{intern}, and the C{Notification}s sent with
+    them carry the id of their name: the C{View} and the C{Controller}
+    then find the observers and the command by indexing a table instead
+    of calling C{get_name} and looking the name up in a dict. Notifications
+    with plain string names are dispatched as before.
+
+    The registry also turns lists of names into bitsets, to hold sets of
+    notification names compactly.
+
+    @see: L{Notification<puremvc_multicore.patterns.observer.Notification>}
+    """
+
+    def __init__(self):
+        """
+        Constructor.
+        """
+        self.names = []
+        self.name_map = {}
+
+
+    def intern(self, name):
+        """
+        Get the interned form of a notification name, assigning it the next id if needed.
+
+        @param name: the notification name
+        @return: the C{NotificationName}
+        """
+        interned = self.name_map.get(name)
+        if interned is None:
+            interned = NotificationName(name)
+            interned.id = len(self.names)
+            interned.registry = self
+            self.names.append(interned)
+            self.name_map[name] = interned
+        return interned
+
+
+    def get_id(self, name):
+        """
+        Get the id of a notification name, interning it if needed.
+
+        @param name: the notification name
+        @return: the id of the name
+        """
+        return self.intern(name).id
+
+
+    def get_name(self, id):
+        """
+        Get the notification name interned with a given id.
+
+        @param id: the id of the name
+        @return: the C{NotificationName}
+        """
+        return self.names[id]
+
+
+    def to_bitset(self, names):
+        """
+        Get the bitset of a list of notification names, interning them if needed.
+
+        @param names: the notification names
+        @return: an C{int} with the bit of each name's id set
+        """
+        bitset = 0
+        for name in names:
+            bitset |= 1 << self.intern(name).id
+        return bitset
+
+
+    def from_bitset(self, bitset):
+        """
+        Get the notification names of a bitset.
+
+        @param bitset: an C{int} as returned by C{to_bitset}
+        @return: the list of C{NotificationName}s, by id
+        """
+        names = []
+        while bitset:
+            lowest = bitset & -bitset
+            names.append(self.names[lowest.bit_length() - 1])
+            bitset ^= lowest
+        return names
+
+
+
+# the registry shared by all Cores, so ids stay valid across them
+notification_registry = NotificationRegistry()
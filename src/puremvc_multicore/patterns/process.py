@@ -0,0 +1,573 @@
+"""
+ PureMVC Multicore Port, pep8 by Oleg Butovich <obutovich@gmail.com>
+ PureMVC Python Port by Toby de Havilland <toby.de.havilland@puremvc.org>
+ PureMVC - Copyright(c) 2006-08 Futurescale, Inc., Some rights reserved.
+ Your reuse is governed by the Creative Commons Attribution 3.0 License
+"""
+import logging
+import multiprocessing
+import pickle
+import queue
+import struct
+import threading
+from concurrent.futures import Future, TimeoutError
+from puremvc_multicore.patterns.actor import get_actor
+from puremvc_multicore.patterns.observer import Notification, Observer
+
+# buffers of at least this many bytes, such as those of numpy arrays, are sent out of band
+OUT_OF_BAND_BYTES = 64 * 1024
+
+# the longest time a RemoteFacade waits for a call, in seconds
+CALL_TIMEOUT = 30
+
+# the methods of the Core a RemoteFacade may call
+REMOTE_METHODS = ('has_proxy', 'has_mediator', 'has_command', 'proxy_data')
+
+message_header = struct.Struct('!I')
+
+logger = logging.getLogger(__name__)
+
+
+def send_message(connection, message, out_of_band_bytes=OUT_OF_BAND_BYTES):
+    """
+    Send a message through a C{multiprocessing} connection.
+
+    The message is pickled with protocol 5: large buffers of the
+    message are not copied into the pickle but sent after it as they
+    are, and received into buffers of their own.
+
+    @param connection: the C{Connection}
+    @param message: the message
+    @param out_of_band_bytes: the size from which buffers are sent out of band
+    """
+    buffers = []
+
+    def out_of_band(buffer):
+        try:
+            view = buffer.raw()
+        except BufferError:
+            # not contiguous: left to the pickle
+            return True
+        if view.nbytes < out_of_band_bytes:
+            return True
+        buffers.append(view)
+        return False
+
+    payload = pickle.dumps(message, protocol=5, buffer_callback=out_of_band)
+    sizes = [buffer.nbytes for buffer in buffers]
+    connection.send_bytes(message_header.pack(len(sizes)) + struct.pack('!%dQ' % len(sizes), *sizes) + payload)
+    for buffer in buffers:
+        connection.send_bytes(buffer)
+
+
+def receive_message(connection):
+    """
+    Receive a message sent by C{send_message}.
+
+    @param connection: the C{Connection}
+    @return: the message
+    """
+    data = connection.recv_bytes()
+    count, = message_header.unpack_from(data)
+    sizes = struct.unpack_from('!%dQ' % count, data, message_header.size)
+    buffers = []
+    for size in sizes:
+        # received into a bytearray, so arrays built on it are writable
+        buffer = bytearray(size)
+        connection.recv_bytes_into(buffer)
+        buffers.append(buffer)
+    return pickle.loads(memoryview(data)[message_header.size + 8 * count:], buffers=buffers)
+
+
+
+class CoreServer(object):
+    """
+    Runs a Core in a child process for a C{RemoteFacade}.
+
+    It handles the messages of the parent in order: batches of
+    notifications to send, requests and calls of C{REMOTE_METHODS}.
+    The notifications named in C{forward} are sent back to the parent,
+    in one batch per message handled.
+
+    @see: L{RemoteFacade<puremvc_multicore.patterns.process.RemoteFacade>}
+    """
+
+    def __init__(self, connection, facade, forward=(), out_of_band_bytes=OUT_OF_BAND_BYTES):
+        """
+        Constructor.
+
+        @param connection: the C{Connection} to the parent
+        @param facade: the C{Facade} of the Core
+        @param forward: the names of the notifications to send to the parent
+        @param out_of_band_bytes: the size from which buffers are sent out of band
+        """
+        self.connection = connection
+        self.facade = facade
+        self.out_of_band_bytes = out_of_band_bytes
+        self.lock = threading.Lock()
+        self.forwarded = []
+        self.handling = False
+        for name in forward:
+            facade.view.register_observer(name, Observer(self.forward, self))
+
+
+    def send(self, message):
+        with self.lock:
+            send_message(self.connection, message, self.out_of_band_bytes)
+
+
+    def forward(self, notification):
+        item = (notification.get_name(), notification.get_body(), notification.get_type())
+        with self.lock:
+            if self.handling:
+                self.forwarded.append(item)
+                return
+        # sent by another thread of the Core, between messages
+        self.send(('notify', [item]))
+
+
+    def flush(self):
+        with self.lock:
+            forwarded, self.forwarded = self.forwarded, []
+            self.handling = False
+        if forwarded:
+            self.send(('notify', forwarded))
+
+
+    def reply(self, request_id, succeeded, value):
+        # the notifications forwarded while answering reach the parent first
+        with self.lock:
+            forwarded, self.forwarded = self.forwarded, []
+        if forwarded:
+            self.send(('notify', forwarded))
+        try:
+            self.send(('reply', request_id, succeeded, value))
+        except Exception as exception:
+            # the result or the exception cannot be pickled
+            self.send(('reply', request_id, False, RuntimeError(repr(exception))))
+
+
+    def respond(self, request_id, future):
+        exception = future.exception()
+        if exception is not None:
+            self.reply(request_id, False, exception)
+        else:
+            self.reply(request_id, True, future.result())
+
+
+    def call(self, method, args):
+        if method not in REMOTE_METHODS:
+            raise AttributeError("Method %r cannot be called remotely" % (method,))
+        if method == 'proxy_data':
+            proxy = self.facade.retrieve_proxy(args[0])
+            if proxy is None:
+                raise KeyError("No Proxy %r in Core %r" % (args[0], self.facade.multiton_key))
+            return proxy.get_data()
+        return getattr(self.facade, method)(*args)
+
+
+    def serve(self):
+        """
+        Handle the messages of the parent until it stops the Core.
+        """
+        while True:
+            try:
+                message = receive_message(self.connection)
+            except EOFError:
+                return
+            kind = message[0]
+            if kind == 'stop':
+                return
+            with self.lock:
+                self.handling = True
+            try:
+                if kind == 'notify':
+                    for name, body, type in message[1]:
+                        try:
+                            self.facade.send_notification(name, body, type)
+                        except Exception as exception:
+                            logger.error("Notification %r failed in Core %r", name, self.facade.multiton_key,
+                                         exc_info=exception)
+                elif kind == 'request':
+                    _, request_id, name, body, type = message
+                    future = self.facade.request(name, body, type)
+                    future.add_done_callback(lambda future, request_id=request_id: self.respond(request_id, future))
+                elif kind == 'call':
+                    _, request_id, method, args = message
+                    try:
+                        result = self.call(method, args)
+                    except Exception as exception:
+                        self.reply(request_id, False, exception)
+                    else:
+                        self.reply(request_id, True, result)
+            finally:
+                self.flush()
+
+
+
+def serve_core(connection, facade_class, key, setup=None, forward=(), out_of_band_bytes=OUT_OF_BAND_BYTES):
+    """
+    Create a Core and serve it; the target of the child process.
+
+    @param connection: the C{Connection} to the parent
+    @param facade_class: the C{Facade} class of the Core
+    @param key: the multiton key of the Core
+    @param setup: a picklable callable given the C{Facade} to finish registrations (optional)
+    @param forward: the names of the notifications to send to the parent
+    @param out_of_band_bytes: the size from which buffers are sent out of band
+    """
+    try:
+        facade = facade_class(key)
+        if setup is not None:
+            setup(facade)
+        server = CoreServer(connection, facade, forward, out_of_band_bytes)
+    except BaseException as exception:
+        send_message(connection, ('ready', False, exception))
+        return
+    send_message(connection, ('ready', True, None))
+    try:
+        server.serve()
+    finally:
+        connection.close()
+
+
+
+class RemoteProxy(object):
+    """
+    Stands in the parent process for a C{Proxy} of a Core run in a child.
+
+    @see: L{RemoteFacade<puremvc_multicore.patterns.process.RemoteFacade>}
+    """
+
+    def __init__(self, facade, proxy_name):
+        """
+        Constructor.
+
+        @param facade: the C{RemoteFacade}
+        @param proxy_name: the name of the proxy
+        """
+        self.facade = facade
+        self.proxy_name = proxy_name
+
+
+    def get_proxy_name(self):
+        return self.proxy_name
+
+
+    def get_data(self):
+        """
+        Read the data of the proxy.
+
+        @return: a copy of the data, unpickled from the child
+        """
+        return self.facade.call('proxy_data', self.proxy_name)
+
+
+
+class RemoteFacade(object):
+    """
+    Stands in the parent process for the C{Facade} of a Core run in a child.
+
+    The Core is created in its own process, with a global interpreter
+    lock of its own, so Cores run in separate processes use separate
+    CPUs. Its C{Facade} class must be importable, or defined before a
+    fork, and the bodies of the notifications must be picklable.
+
+    C{send_notification} sends notifications to the Core through a pipe
+    and returns without waiting for them to be handled; in a
+    C{with remote.batch():} block they are sent together as one message.
+    Large buffers in their bodies, such as those of C{bytearray}s or
+    C{numpy} arrays, are sent out of band with pickle protocol 5 instead
+    of being copied into the pickle. C{request} returns a
+    C{concurrent.futures.Future} completed with the response of the
+    Core, and the data of its proxies is read with
+    C{retrieve_proxy(name).get_data()}.
+
+    The notifications named by C{forward} when the Core was spawned are
+    sent back by the Core. A thread reads them from the pipe and posts
+    them to the mailbox of the C{target}, which is started as an actor
+    so that its observers are not run by that thread; with no
+    C{target}, or once its actor is stopped, they are kept until C{poll}
+    is called.
+
+    C{call}, and so C{retrieve_proxy} and the C{has_} methods, wait at
+    most C{call_timeout} seconds for the Core to answer.
+
+    @see: L{Facade.spawn_core<puremvc_multicore.patterns.facade.Facade.spawn_core>}
+    """
+
+    def __init__(self, key, connection, process, target=None, batch_size=256, out_of_band_bytes=OUT_OF_BAND_BYTES,
+                 call_timeout=CALL_TIMEOUT):
+        """
+        Constructor.
+
+        @param key: the multiton key of the Core
+        @param connection: the C{Connection} to the child process
+        @param process: the child C{Process}
+        @param target: the C{Facade} notified of the forwarded notifications, started as an actor (optional)
+        @param batch_size: the largest number of notifications sent in one message
+        @param out_of_band_bytes: the size from which buffers are sent out of band
+        @param call_timeout: the longest time to wait for a call, in seconds, unbounded if C{None}
+        """
+        self.multiton_key = key
+        self.connection = connection
+        self.process = process
+        self.target = target
+        self.batch_size = batch_size
+        self.out_of_band_bytes = out_of_band_bytes
+        self.call_timeout = call_timeout
+        self.lock = threading.Lock()
+        self.outgoing = None
+        self.depth = 0
+        self.next_id = 0
+        self.futures = {}
+        self.received = queue.SimpleQueue()
+        if target is not None:
+            target.start_actor()
+        self.reader = threading.Thread(target=self.read, name='puremvc-remote-%s' % (key,))
+        self.reader.daemon = True
+        self.reader.start()
+
+
+    @classmethod
+    def spawn(cls, facade_class, key, setup=None, forward=(), target=None, context=None,
+              batch_size=256, out_of_band_bytes=OUT_OF_BAND_BYTES, call_timeout=CALL_TIMEOUT):
+        """
+        Start a Core in a child process.
+
+        @param facade_class: the C{Facade} class of the Core
+        @param key: the multiton key of the Core
+        @param setup: a picklable callable given the C{Facade} to finish registrations (optional)
+        @param forward: the names of the notifications the Core sends back
+        @param target: the C{Facade} notified of the forwarded notifications, started as an actor (optional)
+        @param context: the C{multiprocessing} context, the default one if C{None}
+        @param batch_size: the largest number of notifications sent in one message
+        @param out_of_band_bytes: the size from which buffers are sent out of band
+        @param call_timeout: the longest time to wait for a call, in seconds, unbounded if C{None}
+        @return: the C{RemoteFacade}, once the Core is created
+        """
+        context = context or multiprocessing.get_context()
+        connection, child_connection = context.Pipe()
+        process = context.Process(target=serve_core, name='puremvc-core-%s' % (key,),
+                                  args=(child_connection, facade_class, key, setup, tuple(forward), out_of_band_bytes))
+        process.daemon = True
+        process.start()
+        child_connection.close()
+        try:
+            _, started, exception = receive_message(connection)
+        except EOFError:
+            started, exception = False, RuntimeError("Core %r exited while starting" % (key,))
+        if not started:
+            connection.close()
+            process.join()
+            raise exception
+        return cls(key, connection, process, target, batch_size, out_of_band_bytes, call_timeout)
+
+
+    def send(self, message):
+        with self.lock:
+            send_message(self.connection, message, self.out_of_band_bytes)
+
+
+    def read(self):
+        while True:
+            try:
+                message = receive_message(self.connection)
+            except (EOFError, OSError):
+                break
+            if message[0] == 'reply':
+                _, request_id, succeeded, value = message
+                future = self.futures.pop(request_id, None)
+                if future is None:
+                    continue
+                if succeeded:
+                    future.set_result(value)
+                else:
+                    future.set_exception(value)
+            else:
+                # the observers of the target run on the thread of its actor, never on this one
+                actor = get_actor(self.target.multiton_key) if self.target is not None else None
+                for name, body, type in message[1]:
+                    notification = Notification(name, body, type)
+                    if actor is None:
+                        self.received.put(notification)
+                    else:
+                        actor.post(notification)
+        for request_id in list(self.futures):
+            future = self.futures.pop(request_id, None)
+            if future is not None:
+                future.set_exception(EOFError("Core %r stopped" % (self.multiton_key,)))
+
+
+    def send_notification(self, notification_name, body=None, type=None):
+        """
+        Send an C{INotification} to the Core, without waiting for it to be handled.
+
+        @param notification_name: the name of the notification to send
+        @param body: the body of the notification (optional)
+        @param type: the type of the notification (optional)
+        """
+        item = (notification_name, body, type)
+        with self.lock:
+            if self.outgoing is not None:
+                self.outgoing.append(item)
+                if len(self.outgoing) < self.batch_size:
+                    return
+                items, self.outgoing = self.outgoing, []
+            else:
+                items = [item]
+            send_message(self.connection, ('notify', items), self.out_of_band_bytes)
+
+
+    def batch(self):
+        """
+        Send the notifications of a C{with} block to the Core as one message.
+
+        @return: a context manager
+        """
+        return RemoteBatch(self)
+
+
+    def flush(self):
+        """
+        Send the notifications batched so far.
+        """
+        with self.lock:
+            items, self.outgoing = self.outgoing, ([] if self.outgoing is not None else None)
+            if items:
+                send_message(self.connection, ('notify', items), self.out_of_band_bytes)
+
+
+    def track(self):
+        future = Future()
+        with self.lock:
+            self.next_id += 1
+            request_id = self.next_id
+            self.futures[request_id] = future
+        return request_id, future
+
+
+    def request(self, notification_name, body=None, type=None):
+        """
+        Send an C{INotification} expecting a response to the Core.
+
+        Notifications batched so far are sent first.
+
+        @param notification_name: the name of the notification to send
+        @param body: the body of the notification (optional)
+        @param type: the type of the notification (optional)
+        @return: a C{concurrent.futures.Future} of the response
+        """
+        self.flush()
+        request_id, future = self.track()
+        self.send(('request', request_id, notification_name, body, type))
+        return future
+
+
+    def call(self, method, *args, **kw):
+        """
+        Call one of the C{REMOTE_METHODS} of the Core and wait for the result.
+
+        @param method: the name of the method
+        @param args: its arguments
+        @param kw: C{timeout}, the longest time to wait in seconds, C{call_timeout} if not given
+        @return: the result
+        @raise TimeoutError: if the Core does not answer in time
+        """
+        self.flush()
+        request_id, future = self.track()
+        self.send(('call', request_id, method, args))
+        try:
+            return future.result(kw.get('timeout', self.call_timeout))
+        except TimeoutError:
+            self.futures.pop(request_id, None)
+            raise
+
+
+    def retrieve_proxy(self, proxy_name):
+        """
+        Get a stand-in for a proxy of the Core.
+
+        @param proxy_name: the name of the proxy
+        @return: a C{RemoteProxy}, or C{None} if the Core has no such proxy
+        """
+        if not self.call('has_proxy', proxy_name):
+            return None
+        return RemoteProxy(self, proxy_name)
+
+
+    def has_proxy(self, proxy_name):
+        return self.call('has_proxy', proxy_name)
+
+
+    def has_mediator(self, mediator_name):
+        return self.call('has_mediator', mediator_name)
+
+
+    def has_command(self, notification_name):
+        return self.call('has_command', notification_name)
+
+
+    def poll(self):
+        """
+        Deliver the forwarded notifications kept for want of a running C{target}.
+
+        @return: the list of C{INotification}s received since the last poll
+        """
+        notifications = []
+        while True:
+            try:
+                notifications.append(self.received.get_nowait())
+            except queue.Empty:
+                return notifications
+
+
+    def stop(self, timeout=None):
+        """
+        Stop the Core once it has handled the notifications sent to it.
+
+        @param timeout: the longest time to wait for the child process, in seconds (optional)
+        """
+        try:
+            self.flush()
+            self.send(('stop',))
+        except (OSError, ValueError):
+            # already stopped
+            pass
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join()
+        self.reader.join()
+        self.connection.close()
+
+
+
+class RemoteBatch(object):
+    """
+    Batches the notifications sent through a C{RemoteFacade} in a C{with} block.
+
+    @see: L{RemoteFacade.batch<puremvc_multicore.patterns.process.RemoteFacade.batch>}
+    """
+
+    def __init__(self, facade):
+        self.facade = facade
+
+
+    def __enter__(self):
+        facade = self.facade
+        with facade.lock:
+            facade.depth += 1
+            if facade.outgoing is None:
+                facade.outgoing = []
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        facade = self.facade
+        facade.flush()
+        with facade.lock:
+            facade.depth -= 1
+            if not facade.depth:
+                facade.outgoing = None
+        return False
@@ -4,6 +4,7 @@
  PureMVC - Copyright(c) 2006-08 Futurescale, Inc., Some rights reserved.
  Your reuse is governed by the Creative Commons Attribution 3.0 License
 """
+import copy
 from puremvc_multicore.interfaces import IProxy, INotifier
 from puremvc_multicore.patterns.notifier import Notifier
 
@@ -30,6 +31,8 @@ class Proxy(Notifier, IProxy, INotifier):
     NAME = None
     proxy_name = None
     data = None
+    # bumped on every change of the data, see mark_changed
+    version = 0
 
     def __init__(self, proxy_name=None, data=None):
         """
@@ -62,6 +65,18 @@ class Proxy(Notifier, IProxy, INotifier):
         @param data: the Proxy data object
         """
         self.data = data
+        self.version += 1
+
+
+    def mark_changed(self):
+        """
+        Record a change made to the Proxy data in place.
+
+        Proxies computed from this one notice changes by its C{version},
+        which C{set_data} bumps; call this after changing the data
+        object itself instead of replacing it.
+        """
+        self.version += 1
 
 
     def get_data(self):
@@ -73,6 +88,51 @@ class Proxy(Notifier, IProxy, INotifier):
         return self.data
 
 
+    def restore_data(self, proxy):
+        """
+        Take the data of a copy of this Proxy, such as one restored from a snapshot.
+
+        Override this when C{get_data} does not return what C{set_data}
+        takes.
+
+        @param proxy: the copy of the Proxy
+        """
+        self.set_data(proxy.get_data())
+
+
+    def copy_data(self):
+        """
+        Get the data of a copy of this Proxy.
+
+        Copies of a Core made by C{Facade.clone_core} get a deep copy of
+        the data, so that the Cores do not share it. Data that cannot be
+        copied, such as data holding locks or connections, is shared.
+        Override this for data meant to be shared.
+
+        @return: the data of the copy
+        """
+        try:
+            return copy.deepcopy(self.data)
+        except TypeError:
+            return self.data
+
+
+    def clone_for_core(self):
+        """
+        Get a copy of this Proxy for a Core copied by C{Facade.clone_core}.
+
+        The copy shares the other attributes of this Proxy, but holds
+        the data returned by C{copy_data}. Override this to copy other
+        state of the Proxy.
+
+        @return: the copy
+        """
+        clone = self.__class__.__new__(self.__class__)
+        clone.__dict__.update(self.__dict__)
+        clone.data = self.copy_data()
+        return clone
+
+
     def on_register(self):
         """
         Called by the Model when the Proxy is registered
@@ -0,0 +1,247 @@
+"""
+ PureMVC Multicore Port, pep8 by Oleg Butovich <obutovich@gmail.com>
+ PureMVC Python Port by Toby de Havilland <toby.de.havilland@puremvc.org>
+ PureMVC - Copyright(c) 2006-08 Futurescale, Inc., Some rights reserved.
+ Your reuse is governed by the Creative Commons Attribution 3.0 License
+"""
+import sys
+import threading
+from puremvc_multicore.patterns.mediator import Mediator
+from puremvc_multicore.patterns.observer import Notification, Observer
+from puremvc_multicore.patterns.proxy import Proxy
+
+# the ReactiveMediators handling a notification, innermost last, per thread
+tracking = threading.local()
+
+
+class ReactiveProxy(Proxy):
+    """
+    A C{Proxy} whose data fields notify the mediators reading them.
+
+    The data is a dict of fields. Reading a field with C{get} while a
+    C{ReactiveMediator} handles a notification makes that mediator
+    depend on the field. Changing the field with C{set}, C{update} or
+    C{set_data} then sends a C{CHANGED} notification of the changed
+    fields through the C{Facade}, so that batches, actors and watchdogs
+    apply to it, typed with the name of the proxy. The proxy observes
+    that type and hands the mediators depending on the changed fields,
+    and no other, a C{CHANGED} notification whose body is the tuple of
+    changed fields the mediator read; a mediator running on an actor
+    gets it in its mailbox.
+
+    Dependencies are kept until the mediator is removed, or until it
+    calls C{forget_dependencies}.
+
+    @see: L{ReactiveMediator<puremvc_multicore.patterns.reactive.ReactiveMediator>}
+    """
+
+    CHANGED = 'ReactiveProxyChanged'
+
+    dependents = None
+
+    def __init__(self, proxy_name=None, data=None):
+        """
+        Constructor.
+
+        @param proxy_name: the name of the proxy instance (optional)
+        @param data: the dict of fields (optional)
+        """
+        self.dependents = {}
+        super(ReactiveProxy, self).__init__(proxy_name, data if data is not None else {})
+
+
+    def get(self, field, default=None):
+        """
+        Read a field, making the mediator handling a notification depend on it.
+
+        @param field: the name of the field
+        @param default: the value returned if the field is not set
+        @return: the value of the field
+        """
+        stack = getattr(tracking, 'stack', None)
+        if stack:
+            mediator = stack[-1]
+            self.dependents.setdefault(field, {})[mediator] = True
+            mediator.sources[self] = True
+        return self.data.get(field, default)
+
+
+    def set(self, field, value):
+        """
+        Change a field, notifying the mediators depending on it.
+
+        @param field: the name of the field
+        @param value: the new value
+        """
+        self.update({field: value})
+
+
+    def update(self, fields):
+        """
+        Change several fields, notifying each mediator depending on them once.
+
+        Fields set to a value equal to the current one are not changed.
+
+        @param fields: a dict of the new values, by field name
+        """
+        data = self.data
+        changed = []
+        for field, value in fields.items():
+            if field not in data or data[field] != value:
+                data[field] = value
+                changed.append(field)
+        if changed:
+            self.version += 1
+        self.changed(changed)
+
+
+    def set_data(self, data):
+        """
+        Replace all fields, notifying the mediators depending on the changed ones.
+
+        @param data: the dict of fields
+        """
+        previous = self.data or {}
+        self.data = data
+        self.version += 1
+        self.changed([field for field in set(previous) | set(data)
+                      if field not in previous or field not in data or previous[field] != data[field]])
+
+
+    def changed(self, fields):
+        """
+        Notify the mediators depending on some fields that they changed.
+
+        @param fields: the names of the changed fields
+        """
+        dependents = self.dependents
+        if dependents and any(field in dependents for field in fields):
+            self.send_notification(self.CHANGED, tuple(fields), self.proxy_name)
+
+
+    def notify_dependents(self, notification):
+        """
+        Hand the mediators depending on changed fields the ones they read.
+
+        @param notification: the C{CHANGED} notification of this proxy
+        """
+        notified = {}
+        for field in notification.get_body():
+            for mediator in self.dependents.get(field, ()):
+                notified.setdefault(mediator, []).append(field)
+        # imported by the Core only once an actor was started
+        actor_module = sys.modules.get('puremvc_multicore.patterns.actor')
+        for mediator, mediator_fields in notified.items():
+            note = Notification(self.CHANGED, tuple(mediator_fields), self.proxy_name)
+            actor = None
+            if actor_module is not None:
+                actor = actor_module.get_mediator_actor(mediator.multiton_key, mediator.get_mediator_name())
+            if actor is not None:
+                actor.post(note)
+            else:
+                mediator.handle_notification(note)
+
+
+    def forget(self, mediator):
+        """
+        Drop the dependencies of a mediator on this proxy.
+
+        @param mediator: the C{ReactiveMediator}
+        """
+        for field, mediators in list(self.dependents.items()):
+            mediators.pop(mediator, None)
+            if not mediators:
+                del self.dependents[field]
+
+
+    def on_register(self):
+        # a copy made by Facade.clone_core starts without the dependents of its template
+        self.dependents = {}
+        view = self.facade.view
+        # and replaces the observer of its template, which the copied View still holds
+        for obsvr in view.typed_observer_map.get((self.CHANGED, self.proxy_name), ()):
+            if isinstance(obsvr.get_notify_context(), ReactiveProxy):
+                view.remove_observer(self.CHANGED, obsvr.get_notify_context(), self.proxy_name)
+        view.register_observer(self.CHANGED, Observer(self.notify_dependents, self), self.proxy_name)
+
+
+    def on_remove(self):
+        for mediator in {mediator for mediators in self.dependents.values() for mediator in mediators}:
+            mediator.sources.pop(self, None)
+        self.dependents = {}
+        view = self.facade.view
+        observers = view.typed_observer_map.get((self.CHANGED, self.proxy_name), ())
+        if any(obsvr.compare_notify_context(self) for obsvr in observers):
+            view.remove_observer(self.CHANGED, self, self.proxy_name)
+
+
+
+class ReactiveMediator(Mediator):
+    """
+    A C{Mediator} tracking the C{ReactiveProxy} fields it reads.
+
+    The C{handle_notification} method of subclasses is wrapped so that
+    the fields it reads become dependencies of the mediator; it is then
+    called again with a C{ReactiveProxy.CHANGED} notification when one
+    of them changes. Fields read elsewhere can be tracked with C{track}.
+
+    @see: L{ReactiveProxy<puremvc_multicore.patterns.reactive.ReactiveProxy>}
+    """
+
+    sources = None
+
+    def __init__(self, mediator_name=None, view_component=None):
+        """
+        Constructor.
+
+        @param mediator_name: the name of the mediator (optional)
+        @param view_component: the view component (optional)
+        """
+        super(ReactiveMediator, self).__init__(mediator_name, view_component)
+        self.sources = {}
+
+
+    def __init_subclass__(cls, **kwargs):
+        super(ReactiveMediator, cls).__init_subclass__(**kwargs)
+        handle_notification = cls.__dict__.get('handle_notification')
+        if handle_notification is not None:
+            def tracked_handle_notification(self, notification):
+                return self.track(handle_notification, self, notification)
+            tracked_handle_notification.__doc__ = handle_notification.__doc__
+            cls.handle_notification = tracked_handle_notification
+
+
+    def track(self, function, *args):
+        """
+        Call a function, making this mediator depend on the fields it reads.
+
+        @param function: the callable
+        @param args: the arguments of the call
+        @return: the result of the call
+        """
+        stack = getattr(tracking, 'stack', None)
+        if stack is None:
+            stack = tracking.stack = []
+        stack.append(self)
+        try:
+            return function(*args)
+        finally:
+            stack.pop()
+
+
+    def forget_dependencies(self):
+        """
+        Drop all dependencies of this mediator.
+        """
+        for proxy in list(self.sources):
+            proxy.forget(self)
+        self.sources = {}
+
+
+    def on_register(self):
+        # a copy made by Facade.clone_core starts without the sources of its template
+        self.sources = {}
+
+
+    def on_remove(self):
+        self.forget_dependencies()
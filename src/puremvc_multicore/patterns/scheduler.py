@@ -0,0 +1,345 @@
+"""
+ PureMVC Multicore Port, pep8 by Oleg Butovich <obutovich@gmail.com>
+ PureMVC Python Port by Toby de Havilland <toby.de.havilland@puremvc.org>
+ PureMVC - Copyright(c) 2006-08 Futurescale, Inc., Some rights reserved.
+ Your reuse is governed by the Creative Commons Attribution 3.0 License
+"""
+import heapq
+import itertools
+import logging
+import threading
+import time
+import weakref
+from puremvc_multicore.interfaces import IFacade
+
+# every Scheduler created, so that removing a Core cancels its timers in all of them
+schedulers = weakref.WeakSet()
+
+logger = logging.getLogger(__name__)
+
+
+class ScheduledNotification(object):
+    """
+    A notification waiting in a C{Scheduler} to be sent to a Core.
+
+    Returned by C{Scheduler.schedule} and C{Facade.send_notification_later},
+    it is the handle to cancel the notification with.
+
+    @see: L{Scheduler<puremvc_multicore.patterns.scheduler.Scheduler>}
+    """
+    __slots__ = ('scheduler', 'multiton_key', 'name', 'body', 'type', 'when', 'interval', 'cancelled')
+
+    def __init__(self, scheduler, multiton_key, name, body, type, when, interval):
+        self.scheduler = scheduler
+        self.multiton_key = multiton_key
+        self.name = name
+        self.body = body
+        self.type = type
+        self.when = when
+        self.interval = interval
+        self.cancelled = False
+
+
+    def cancel(self):
+        """
+        Cancel the notification, or its further repetitions.
+        """
+        self.scheduler.cancel(self)
+
+
+    def fire(self):
+        """
+        Send the notification through the C{Facade} of its Core.
+
+        Nothing is sent if the Core does not exist.
+        """
+        facade = IFacade.instance_map.get(self.multiton_key)
+        if facade is not None:
+            facade.send_notification(self.name, self.body, self.type)
+
+
+
+class Scheduler(object):
+    """
+    Sends notifications to Cores after a delay, once or repeatedly.
+
+    The pending notifications of all Cores are kept in one heap, so a
+    single thread, or a single timer of an C{asyncio} event loop, serves
+    any number of them. A cancelled notification stays in the heap until
+    it is due or until cancelled ones make up half of the heap, so
+    cancelling is cheap.
+
+    A C{Scheduler} given an event loop sends its notifications from the
+    loop. Otherwise call C{start} to send them from a daemon thread, or
+    call C{run_pending} from your own loop. The notifications are sent
+    with C{send_notification} of the Core's C{Facade}, in that thread:
+    the observers of the Core run there, unless the Core runs a
+    C{CoreActor}, which takes the notifications in its mailbox and
+    dispatches them on the thread of the Core. An observer failing does
+    not stop the others due; the error is passed to C{on_error}.
+
+    @see: L{Facade.send_notification_later<puremvc_multicore.patterns.facade.Facade.send_notification_later>}
+    """
+
+    def __init__(self, loop=None, clock=time.monotonic):
+        """
+        Constructor.
+
+        @param loop: an C{asyncio} event loop to send the notifications from (optional)
+        @param clock: the clock measuring the delays, in seconds
+        """
+        self.loop = loop
+        self.clock = clock
+        self.heap = []
+        self.counter = itertools.count()
+        self.condition = threading.Condition()
+        self.core_timers = {}
+        self.cancelled = 0
+        self.thread = None
+        self.handle = None
+        self.stopped = False
+        schedulers.add(self)
+
+
+    def schedule(self, multiton_key, delay, notification_name, body=None, type=None, interval=None):
+        """
+        Schedule a notification.
+
+        @param multiton_key: the multiton key of the Core to send the notification to
+        @param delay: the delay in seconds before the notification is sent
+        @param notification_name: the name of the notification to send
+        @param body: the body of the notification (optional)
+        @param type: the type of the notification (optional)
+        @param interval: the period in seconds at which the notification is repeated (optional)
+        @return: the C{ScheduledNotification}
+        """
+        if interval is not None and interval <= 0:
+            raise ValueError("interval must be positive, not %r" % (interval,))
+        timer = ScheduledNotification(self, multiton_key, notification_name, body, type,
+                                      self.clock() + delay, interval)
+        with self.condition:
+            self.core_timers.setdefault(multiton_key, set()).add(timer)
+            self.push(timer)
+        return timer
+
+
+    def push(self, timer):
+        earliest = not self.heap or timer.when < self.heap[0][0]
+        heapq.heappush(self.heap, (timer.when, next(self.counter), timer))
+        if earliest:
+            self.wake()
+
+
+    def wake(self):
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self.arm)
+        else:
+            self.condition.notify()
+
+
+    def cancel(self, timer):
+        """
+        Cancel a scheduled notification.
+
+        @param timer: the C{ScheduledNotification}
+        """
+        with self.condition:
+            if timer.cancelled:
+                return
+            timer.cancelled = True
+            timers = self.core_timers.get(timer.multiton_key)
+            if timers is not None:
+                timers.discard(timer)
+                if not timers:
+                    del self.core_timers[timer.multiton_key]
+            self.cancelled += 1
+            if self.cancelled * 2 > len(self.heap):
+                self.heap = [entry for entry in self.heap if not entry[2].cancelled]
+                heapq.heapify(self.heap)
+                self.cancelled = 0
+
+
+    def cancel_core(self, multiton_key):
+        """
+        Cancel all notifications scheduled for a Core.
+
+        @param multiton_key: the multiton key of the Core
+        """
+        with self.condition:
+            for timer in list(self.core_timers.get(multiton_key, ())):
+                self.cancel(timer)
+
+
+    def pending(self, multiton_key=None):
+        """
+        Count the scheduled notifications.
+
+        @param multiton_key: count only those of this Core (optional)
+        @return: the number of scheduled notifications
+        """
+        with self.condition:
+            if multiton_key is not None:
+                return len(self.core_timers.get(multiton_key, ()))
+            return len(self.heap) - self.cancelled
+
+
+    def next_delay(self):
+        """
+        Get the time until the next notification is due.
+
+        @return: the delay in seconds, or C{None} if none is scheduled
+        """
+        with self.condition:
+            heap = self.heap
+            while heap and heap[0][2].cancelled:
+                heapq.heappop(heap)
+                self.cancelled -= 1
+            if not heap:
+                return None
+            return heap[0][0] - self.clock()
+
+
+    def run_pending(self):
+        """
+        Send the notifications that are due.
+
+        @return: the number of notifications sent
+        """
+        now = self.clock()
+        due = []
+        with self.condition:
+            heap = self.heap
+            while heap and heap[0][0] <= now:
+                timer = heapq.heappop(heap)[2]
+                if timer.cancelled:
+                    self.cancelled -= 1
+                    continue
+                if timer.interval is None:
+                    # sent once, it can no longer be cancelled
+                    timer.cancelled = True
+                    timers = self.core_timers[timer.multiton_key]
+                    timers.discard(timer)
+                    if not timers:
+                        del self.core_timers[timer.multiton_key]
+                else:
+                    # rescheduled before sending, so a handler may cancel it
+                    timer.when += timer.interval
+                    if timer.when <= now:
+                        timer.when = now + timer.interval
+                    heapq.heappush(heap, (timer.when, next(self.counter), timer))
+                due.append(timer)
+
+        for timer in due:
+            try:
+                timer.fire()
+            except Exception as exception:
+                self.on_error(timer, exception)
+        return len(due)
+
+
+    def on_error(self, timer, exception):
+        """
+        Report an error raised sending a scheduled notification.
+
+        The error is logged; override this to report it elsewhere.
+
+        @param timer: the C{ScheduledNotification}
+        @param exception: the exception raised
+        """
+        logger.error("Scheduled notification %r of Core %r failed", timer.name, timer.multiton_key,
+                     exc_info=exception)
+
+
+    def start(self):
+        """
+        Start the daemon thread sending the notifications.
+
+        @return: the C{Thread}
+        """
+        with self.condition:
+            if self.thread is None:
+                self.stopped = False
+                self.thread = threading.Thread(target=self.run, name='puremvc-scheduler')
+                self.thread.daemon = True
+                self.thread.start()
+            return self.thread
+
+
+    def stop(self):
+        """
+        Stop the thread or the event loop timer sending the notifications.
+
+        The scheduled notifications are kept.
+        """
+        with self.condition:
+            self.stopped = True
+            thread, self.thread = self.thread, None
+            self.condition.notify()
+        if self.handle is not None:
+            self.handle.cancel()
+            self.handle = None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+
+    def run(self):
+        while True:
+            with self.condition:
+                while not self.stopped:
+                    delay = self.next_delay()
+                    if delay is not None and delay <= 0:
+                        break
+                    self.condition.wait(delay)
+                if self.stopped:
+                    return
+            self.run_pending()
+
+
+    def arm(self):
+        """
+        Set the event loop timer to the next notification.
+        """
+        if self.handle is not None:
+            self.handle.cancel()
+            self.handle = None
+        delay = self.next_delay()
+        if delay is not None and not self.stopped:
+            self.handle = self.loop.call_later(max(delay, 0), self.on_timer)
+
+
+    def on_timer(self):
+        self.handle = None
+        self.run_pending()
+        self.arm()
+
+
+
+# created on first use, see shared_scheduler
+shared = None
+shared_lock = threading.Lock()
+
+
+def shared_scheduler():
+    """
+    Get the C{Scheduler} used by Cores that have none of their own.
+
+    It is created and its thread is started on first use.
+
+    @return: the shared C{Scheduler}
+    """
+    global shared
+    with shared_lock:
+        if shared is None:
+            shared = Scheduler()
+            shared.start()
+    return shared
+
+
+def cancel_core(multiton_key):
+    """
+    Cancel the notifications scheduled for a Core in all schedulers.
+
+    @param multiton_key: the multiton key of the Core
+    """
+    for scheduler in list(schedulers):
+        scheduler.cancel_core(multiton_key)
@@ -0,0 +1,277 @@
+"""
+ PureMVC Multicore Port, pep8 by Oleg Butovich <obutovich@gmail.com>
+ PureMVC Python Port by Toby de Havilland <toby.de.havilland@puremvc.org>
+ PureMVC - Copyright(c) 2006-08 Futurescale, Inc., Some rights reserved.
+ Your reuse is governed by the Creative Commons Attribution 3.0 License
+"""
+import copy
+import threading
+import types
+import weakref
+from puremvc_multicore.patterns.proxy import Proxy
+
+
+def read_only(data):
+    """
+    Get a read-only view of shared data.
+
+    Dicts are wrapped in a C{MappingProxyType}, lists become tuples,
+    sets frozensets and C{bytearray}s read-only C{memoryview}s; other
+    objects are returned as they are. Only the top level is protected:
+    the values of a dict or list stay as mutable as they were.
+
+    @param data: the data
+    @return: the read-only view
+    """
+    if isinstance(data, dict):
+        return types.MappingProxyType(data)
+    if isinstance(data, list):
+        return tuple(data)
+    if isinstance(data, set):
+        return frozenset(data)
+    if isinstance(data, bytearray):
+        return memoryview(data).toreadonly()
+    return data
+
+
+def writable_copy(data):
+    """
+    Get a shallow copy of shared data that can be changed.
+
+    @param data: the data, or a read-only view of it
+    @return: the copy
+    """
+    if isinstance(data, types.MappingProxyType):
+        return dict(data)
+    if isinstance(data, tuple):
+        return list(data)
+    if isinstance(data, frozenset):
+        return set(data)
+    if isinstance(data, memoryview):
+        return bytearray(data)
+    return copy.copy(data)
+
+
+class SharedProxyRegistry(object):
+    """
+    Holds data shared read-only by proxies of many Cores.
+
+    Each shared data object is registered once under a name, or given
+    as a factory called when the data is first mounted, and is then
+    mounted into the C{Model} of any number of Cores as a
+    C{SharedProxy}. All mounts return the same object, so memory grows
+    with the distinct data, not with the number of Cores. The object is
+    the C{read_only} view of the data: a dict, list, set or
+    C{bytearray} cannot be changed through it, other objects must not
+    be changed in place.
+
+    @see: L{SharedProxy<puremvc_multicore.patterns.shared.SharedProxy>}
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.data = {}
+        self.factories = {}
+        self.mounted = {}
+
+
+    def register(self, name, data=None, factory=None):
+        """
+        Register shared data.
+
+        @param name: the name of the shared data
+        @param data: the data, not to be changed once shared; dicts, lists, sets and C{bytearray}s are held as C{read_only} views
+        @param factory: a callable without arguments loading the data, instead of C{data}
+        """
+        if (data is None) == (factory is None):
+            raise ValueError("Shared data %r needs either data or a factory" % (name,))
+        with self.lock:
+            self.data.pop(name, None)
+            self.factories.pop(name, None)
+            if factory is not None:
+                self.factories[name] = factory
+            else:
+                self.data[name] = read_only(data)
+            self.mounted.setdefault(name, weakref.WeakSet())
+
+
+    def unregister(self, name):
+        """
+        Drop shared data; mounted proxies keep the data they hold.
+
+        @param name: the name of the shared data
+        """
+        with self.lock:
+            self.data.pop(name, None)
+            self.factories.pop(name, None)
+            self.mounted.pop(name, None)
+
+
+    def has(self, name):
+        """
+        Check if shared data is registered.
+
+        @param name: the name of the shared data
+        @return: whether it is registered
+        """
+        return name in self.data or name in self.factories
+
+
+    def acquire(self, name, proxy):
+        """
+        Get shared data for a proxy mounting it, loading it if needed.
+
+        @param name: the name of the shared data
+        @param proxy: the C{SharedProxy}
+        @return: the data
+        """
+        with self.lock:
+            data = self.data.get(name)
+            if data is None:
+                factory = self.factories.get(name)
+                if factory is None:
+                    raise KeyError("No shared data registered as %r" % (name,))
+                data = self.data[name] = read_only(factory())
+            self.mounted[name].add(proxy)
+            return data
+
+
+    def release(self, name, proxy):
+        """
+        Record that a proxy no longer holds shared data.
+
+        @param name: the name of the shared data
+        @param proxy: the C{SharedProxy}
+        """
+        with self.lock:
+            mounted = self.mounted.get(name)
+            if mounted is not None:
+                mounted.discard(proxy)
+
+
+    def mounts(self, name):
+        """
+        Count the proxies holding shared data.
+
+        @param name: the name of the shared data
+        @return: the number of proxies
+        """
+        return len(self.mounted.get(name, ()))
+
+
+    def mount(self, facade, name, proxy_name=None, proxy_class=None):
+        """
+        Register a C{SharedProxy} of shared data with a Core.
+
+        @param facade: the C{Facade} of the Core
+        @param name: the name of the shared data
+        @param proxy_name: the name of the proxy, C{name} if C{None}
+        @param proxy_class: the C{SharedProxy} subclass to create (optional); a subclass
+        setting this registry as its C{registry} keeps its proxies picklable
+        @return: the proxy
+        """
+        proxy = (proxy_class or SharedProxy)(proxy_name or name, name)
+        if proxy.registry is not self:
+            proxy.registry = self
+        facade.register_proxy(proxy)
+        return proxy
+
+
+
+# the registry of SharedProxy and its subclasses, unless they set another
+shared_proxies = SharedProxyRegistry()
+
+
+
+class SharedProxy(Proxy):
+    """
+    A C{Proxy} of a Core holding data shared with other Cores.
+
+    Each Core mounts its own C{SharedProxy}, so notifications sent by
+    the proxy reach the right Core, but the data is the read-only view
+    held by the C{registry}, which is loaded once for all of them.
+
+    Changing the data is copy-on-write: C{set_data} gives the proxy
+    data of its own, and C{detach} a writable shallow copy of the shared
+    data to change; the other Cores keep the shared data. C{set_data(None)}
+    mounts the shared data again. A pickled C{SharedProxy} holding the
+    shared data, such as one of a hibernated Core, does not carry it.
+
+    @see: L{SharedProxyRegistry<puremvc_multicore.patterns.shared.SharedProxyRegistry>}
+    """
+
+    registry = shared_proxies
+
+    shared_name = None
+    shared = False
+
+    def __init__(self, proxy_name=None, shared_name=None):
+        """
+        Constructor.
+
+        @param proxy_name: the name of the proxy instance (optional)
+        @param shared_name: the name of the shared data, the name of the proxy if C{None}
+        """
+        super(SharedProxy, self).__init__(proxy_name)
+        self.shared_name = shared_name or self.proxy_name
+
+
+    def attach(self):
+        """
+        Hold the shared data, dropping data of its own.
+        """
+        self.data = self.registry.acquire(self.shared_name, self)
+        self.shared = True
+        self.version += 1
+
+
+    def detach(self):
+        """
+        Hold a writable shallow copy of the shared data, to be changed.
+
+        @return: the copy
+        """
+        data = writable_copy(self.get_data())
+        self.set_data(data)
+        return data
+
+
+    def set_data(self, data):
+        """
+        Hold data of its own, or the shared data again if C{None}.
+
+        @param data: the data
+        """
+        if data is None:
+            self.attach()
+            return
+        if self.shared:
+            self.registry.release(self.shared_name, self)
+            self.shared = False
+        super(SharedProxy, self).set_data(data)
+
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        if self.shared:
+            state.pop('data', None)
+            state.pop('shared', None)
+        return state
+
+
+    def copy_data(self):
+        # a copy made by Facade.clone_core shares the shared data, not data of its own
+        if self.shared:
+            return self.data
+        return super(SharedProxy, self).copy_data()
+
+
+    def on_register(self):
+        # a copy made by Facade.clone_core mounts the shared data too
+        if self.shared or self.data is None:
+            self.attach()
+
+
+    def on_remove(self):
+        if self.shared:
+            self.registry.release(self.shared_name, self)
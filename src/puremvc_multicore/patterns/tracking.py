@@ -0,0 +1,236 @@
+"""
+ PureMVC Multicore Port, pep8 by Oleg Butovich <obutovich@gmail.com>
+ PureMVC Python Port by Toby de Havilland <toby.de.havilland@puremvc.org>
+ PureMVC - Copyright(c) 2006-08 Futurescale, Inc., Some rights reserved.
+ Your reuse is governed by the Creative Commons Attribution 3.0 License
+"""
+import copy
+from puremvc_multicore.patterns.proxy import Proxy
+
+# the original value of a key that did not exist at the last diff
+MISSING = object()
+
+
+class Diff(object):
+    """
+    The changes made to a C{TrackingProxy} between two notifications.
+
+    @see: L{TrackingProxy<puremvc_multicore.patterns.tracking.TrackingProxy>}
+    """
+    __slots__ = ('inserts', 'updates', 'deletes')
+
+    def __init__(self, inserts=None, updates=None, deletes=None):
+        """
+        Constructor.
+
+        @param inserts: a dict of the values of the added keys
+        @param updates: a dict of the new values of the changed keys
+        @param deletes: a tuple of the removed keys
+        """
+        self.inserts = inserts if inserts is not None else {}
+        self.updates = updates if updates is not None else {}
+        self.deletes = deletes if deletes is not None else ()
+
+
+    def apply(self, target):
+        """
+        Apply the changes to a copy of the data.
+
+        @param target: a dict equal to the data before the changes
+        @return: C{target}
+        """
+        for key in self.deletes:
+            del target[key]
+        target.update(self.inserts)
+        target.update(self.updates)
+        return target
+
+
+    def __len__(self):
+        return len(self.inserts) + len(self.updates) + len(self.deletes)
+
+
+    def __eq__(self, other):
+        if not isinstance(other, Diff):
+            return NotImplemented
+        return (self.inserts == other.inserts and self.updates == other.updates
+                and set(self.deletes) == set(other.deletes))
+
+
+    def __repr__(self):
+        return 'Diff(inserts=%r, updates=%r, deletes=%r)' % (self.inserts, self.updates, self.deletes)
+
+
+
+class TrackingProxy(Proxy):
+    """
+    A C{Proxy} whose data is a dict, sending what changed rather than all of it.
+
+    Changes made through C{set}, C{update}, C{delete} and C{set_data}
+    are recorded, and C{flush} sends a C{CHANGED} notification, typed
+    with the name of the proxy, whose body is a C{Diff} of the keys
+    inserted, updated and deleted since the previous one. Mediators can
+    C{apply} it to their own copy instead of comparing the whole data.
+
+    Changes to the same key are merged: a key inserted then deleted
+    before a flush does not appear at all, and a key set back to its
+    original value is not reported. Values changed in place must be
+    marked with C{touch}.
+
+    With C{AUTO_FLUSH} each change is sent at once; set it to C{False}
+    to call C{flush} once after a series of changes, such as at the end
+    of a command.
+    """
+
+    CHANGED = 'TrackingProxyChanged'
+    AUTO_FLUSH = True
+
+    originals = None
+    touched = None
+
+    def __init__(self, proxy_name=None, data=None):
+        """
+        Constructor.
+
+        @param proxy_name: the name of the proxy instance (optional)
+        @param data: the dict (optional)
+        """
+        self.originals = {}
+        self.touched = set()
+        super(TrackingProxy, self).__init__(proxy_name, data if data is not None else {})
+
+
+    def get(self, key, default=None):
+        """
+        Get a value.
+
+        @param key: the key
+        @param default: the value returned if the key is not set
+        @return: the value
+        """
+        return self.data.get(key, default)
+
+
+    def record(self, key):
+        if key not in self.originals:
+            self.originals[key] = self.data.get(key, MISSING)
+
+
+    def set(self, key, value):
+        """
+        Set a value.
+
+        @param key: the key
+        @param value: the value
+        """
+        self.record(key)
+        self.data[key] = value
+        self.changed()
+
+
+    def update(self, values):
+        """
+        Set several values.
+
+        @param values: a dict of values
+        """
+        for key, value in values.items():
+            self.record(key)
+            self.data[key] = value
+        self.changed()
+
+
+    def delete(self, key):
+        """
+        Remove a key.
+
+        @param key: the key
+        @return: its value
+        """
+        self.record(key)
+        value = self.data.pop(key)
+        self.changed()
+        return value
+
+
+    def touch(self, key):
+        """
+        Report a value changed in place as updated.
+
+        @param key: the key
+        """
+        self.record(key)
+        self.touched.add(key)
+        self.changed()
+
+
+    def clone_for_core(self):
+        clone = super(TrackingProxy, self).clone_for_core()
+        clone.originals = copy.deepcopy(self.originals)
+        clone.touched = set(self.touched)
+        return clone
+
+
+    def set_data(self, data):
+        """
+        Replace the dict, recording the keys that differ.
+
+        @param data: the new dict
+        """
+        previous = self.data
+        if previous is not None:
+            for key, value in previous.items():
+                if key not in data or (data[key] is not value and data[key] != value):
+                    self.record(key)
+            for key in data:
+                if key not in previous:
+                    self.record(key)
+        super(TrackingProxy, self).set_data(data)
+        if previous is not None:
+            self.changed()
+
+
+    def changed(self):
+        self.version += 1
+        if self.AUTO_FLUSH:
+            self.flush()
+
+
+    def diff(self):
+        """
+        Get the changes recorded since the last flush, without clearing them.
+
+        @return: the C{Diff}
+        """
+        data = self.data
+        diff = Diff()
+        deletes = []
+        for key, original in self.originals.items():
+            if key not in data:
+                if original is not MISSING:
+                    deletes.append(key)
+            elif original is MISSING:
+                diff.inserts[key] = data[key]
+            else:
+                value = data[key]
+                if key in self.touched or (value is not original and value != original):
+                    diff.updates[key] = value
+        diff.deletes = tuple(deletes)
+        return diff
+
+
+    def flush(self):
+        """
+        Send the changes recorded since the last flush, if any.
+
+        @return: the C{Diff} sent, or C{None}
+        """
+        if not self.originals:
+            return None
+        diff = self.diff()
+        self.originals = {}
+        self.touched = set()
+        if not diff or self.multiton_key is None:
+            return None
+        self.send_notification(self.CHANGED, diff, self.proxy_name)
+        return diff
@@ -0,0 +1,379 @@
+"""
+ PureMVC Multicore Port, pep8 by Oleg Butovich <obutovich@gmail.com>
+ PureMVC Python Port by Toby de Havilland <toby.de.havilland@puremvc.org>
+ PureMVC - Copyright(c) 2006-08 Futurescale, Inc., Some rights reserved.
+ Your reuse is governed by the Creative Commons Attribution 3.0 License
+"""
+import sys
+import threading
+import time
+import traceback
+from puremvc_multicore.core import LazyMediatorObserver
+from puremvc_multicore.patterns.actor import Actor
+from puremvc_multicore.patterns.observer import Observer, RequestNotification
+
+# the running Watchdogs, by multiton key
+watchdogs = {}
+
+# how a Watchdog demotes an offender
+ASYNC = 'async'
+DEFER = 'defer'
+
+
+class Offender(object):
+    """
+    An observer of a Core that took longer than its budget.
+
+    Mediators are named by their mediator name, commands by the name
+    of the notification they are registered for, and other observers
+    by the class of their notify context.
+
+    @see: L{Watchdog<puremvc_multicore.patterns.watchdog.Watchdog>}
+    """
+    __slots__ = ('kind', 'name', 'budget', 'count', 'worst', 'total', 'notification_name', 'samples', 'demoted')
+
+    def __init__(self, kind, name, budget):
+        """
+        Constructor.
+
+        @param kind: C{'mediator'}, C{'command'} or C{'observer'}
+        @param name: the name of the offender
+        @param budget: its budget, in seconds
+        """
+        self.kind = kind
+        self.name = name
+        self.budget = budget
+        self.count = 0
+        self.worst = 0.0
+        self.total = 0.0
+        self.notification_name = None
+        self.samples = []
+        self.demoted = None
+
+
+    def __repr__(self):
+        return 'Offender(%r, %r, count=%d, worst=%.1fms, budget=%.1fms)' % (
+            self.kind, self.name, self.count, self.worst * 1e3, self.budget * 1e3)
+
+
+
+class Watchdog(object):
+    """
+    Times the observers of a Core against a budget.
+
+    Once started, the C{View} of the Core notifies its observers through
+    the watchdog, which times each of them: a mediator's
+    C{handle_notification}, or the execution of a command. The time
+    spent notifying the observers of the notifications they send in
+    turn is taken off, those observers being timed on their own. One
+    taking longer than its budget, from C{budgets} by name or C{budget}
+    otherwise, is recorded as an C{Offender} and passed to C{report},
+    if given.
+
+    With a C{sample_interval}, a thread looks at the observers still
+    running at that interval and records the stack of those past their
+    budget, so that the offender shows where it spends its time, not
+    only that it is slow.
+
+    With C{demote}, an offender flagged C{strikes} times no longer holds
+    up the sender: with C{ASYNC} its notifications are handed to a
+    thread of the watchdog, with C{DEFER} they are kept until
+    C{deliver_deferred} is called, for instance when the application is
+    idle. Demoted mediators are notified in order; stopping the
+    watchdog restores them.
+
+    @see: L{Facade.start_watchdog<puremvc_multicore.patterns.facade.Facade.start_watchdog>}
+    """
+
+    def __init__(self, facade, budget=0.05, budgets=None, report=None, sample_interval=None, max_samples=5,
+                 demote=None, strikes=3):
+        """
+        Constructor.
+
+        @param facade: the C{Facade} of the Core
+        @param budget: the time an observer may take, in seconds
+        @param budgets: a dict of the budgets of some observers, by name (optional)
+        @param report: a callable given the C{Offender}, the C{INotification} and the time taken (optional)
+        @param sample_interval: the interval, in seconds, at which stacks are sampled (optional)
+        @param max_samples: the largest number of stacks kept per offender
+        @param demote: C{ASYNC} or C{DEFER} to demote offenders (optional)
+        @param strikes: the number of times an offender is flagged before it is demoted
+        """
+        if demote not in (None, ASYNC, DEFER):
+            raise ValueError("Unknown demotion %r" % (demote,))
+        self.facade = facade
+        self.view = facade.view
+        self.multiton_key = facade.multiton_key
+        self.budget = budget
+        self.budgets = dict(budgets or {})
+        self.min_budget = min([budget] + list(self.budgets.values()))
+        self.report = report
+        self.sample_interval = sample_interval
+        self.max_samples = max_samples
+        self.demote = demote
+        self.strikes = strikes
+        self.offenders = {}
+        self.running = {}
+        self.demoted = []
+        self.deferred = []
+        self.lock = threading.Lock()
+        self.actor = None
+        self.sampler = None
+        self.stopped = threading.Event()
+
+
+    def start(self):
+        """
+        Start watching the Core.
+
+        @return: this watchdog
+        """
+        if self.multiton_key in watchdogs:
+            raise RuntimeError("Core %r already has a watchdog" % (self.multiton_key,))
+        watchdogs[self.multiton_key] = self
+        self.view.notify_observers = self.notify_observers
+        if self.sample_interval is not None:
+            self.sampler = threading.Thread(target=self.sample, name='puremvc-watchdog-%s' % (self.multiton_key,))
+            self.sampler.daemon = True
+            self.sampler.start()
+        return self
+
+
+    def stop(self):
+        """
+        Stop watching the Core and restore its demoted observers.
+
+        Deferred notifications are dropped, unless delivered first.
+        """
+        if watchdogs.get(self.multiton_key) is self:
+            del watchdogs[self.multiton_key]
+        if self.view.__dict__.get('notify_observers') == self.notify_observers:
+            del self.view.notify_observers
+        with self.lock:
+            demoted, self.demoted = self.demoted, []
+            self.deferred = []
+        for key, replacement, original in demoted:
+            swap_observer(self.view, key, replacement, original)
+        self.stopped.set()
+        if self.actor is not None:
+            self.actor.stop_thread(False)
+
+
+    def notify_observers(self, notification):
+        """
+        Notify the observers of an C{INotification}, timing each of them.
+
+        @param notification: the C{INotification}
+        """
+        running = self.running
+        ident = threading.get_ident()
+        # the observer whose notification this one is sent from, if any
+        outer = running.get(ident)
+        clock = time.perf_counter
+        min_budget = self.min_budget
+        begin = clock()
+        try:
+            for obsvr in self.view.observers_for(notification):
+                start = clock()
+                # the last item adds up the time of the observers notified in turn
+                current = [obsvr, notification, start, 0.0]
+                running[ident] = current
+                obsvr.notify_observer(notification)
+                elapsed = clock() - start - current[3]
+                if elapsed > min_budget:
+                    self.check(obsvr, notification, elapsed)
+        finally:
+            if outer is None:
+                running.pop(ident, None)
+            else:
+                outer[3] += clock() - begin
+                running[ident] = outer
+
+
+    def name_of(self, obsvr, notification):
+        """
+        Get what an observer is called in the budgets and offenders.
+
+        @param obsvr: the C{IObserver}
+        @param notification: the C{INotification} it is notified of
+        @return: a tuple of the kind and the name
+        """
+        context = obsvr.get_notify_context()
+        if context is self.facade.controller:
+            return 'command', notification.get_name()
+        if isinstance(context, LazyMediatorObserver):
+            return 'mediator', context.mediator_name
+        if hasattr(context, 'get_mediator_name'):
+            return 'mediator', context.get_mediator_name()
+        return 'observer', type(context).__name__
+
+
+    def offender(self, kind, name):
+        offender = self.offenders.get((kind, name))
+        if offender is None:
+            offender = Offender(kind, name, self.budgets.get(name, self.budget))
+            offender = self.offenders.setdefault((kind, name), offender)
+        return offender
+
+
+    def check(self, obsvr, notification, elapsed):
+        kind, name = self.name_of(obsvr, notification)
+        if elapsed <= self.budgets.get(name, self.budget):
+            return
+        with self.lock:
+            offender = self.offender(kind, name)
+            offender.count += 1
+            offender.total += elapsed
+            offender.worst = max(offender.worst, elapsed)
+            offender.notification_name = notification.get_name()
+        if self.report is not None:
+            self.report(offender, notification, elapsed)
+        if self.demote is not None and offender.demoted is None and offender.count >= self.strikes:
+            self.demote_observer(offender, obsvr, notification)
+
+
+    def demote_observer(self, offender, obsvr, notification):
+        """
+        Have an offender notified asynchronously or later on.
+
+        @param offender: the C{Offender}
+        @param obsvr: its C{IObserver}
+        @param notification: the C{INotification} it was too slow for
+        """
+        notify = obsvr.get_notify_method()
+
+        def postpone(notification):
+            self.postpone(notify, notification)
+
+        replacement = Observer(postpone, obsvr.get_notify_context())
+        # commands share the observer of the Controller: demote only the one of this name
+        key = notification.get_name() if offender.kind == 'command' else None
+        with self.lock:
+            if offender.demoted is not None or self.stopped.is_set():
+                return
+            offender.demoted = self.demote
+            self.demoted.append((key, replacement, obsvr))
+            if self.demote == ASYNC and self.actor is None:
+                self.actor = Actor('puremvc-demoted-%s' % (self.multiton_key,))
+                self.actor.deliver = deliver
+                self.actor.start_thread()
+        swap_observer(self.view, key, obsvr, replacement)
+
+
+    def postpone(self, notify, notification):
+        if self.demote == ASYNC:
+            self.actor.post((notify, notification))
+        else:
+            with self.lock:
+                self.deferred.append((notify, notification))
+
+
+    def deliver_deferred(self):
+        """
+        Notify the demoted observers of the notifications kept for them.
+
+        @return: the number of notifications delivered
+        """
+        with self.lock:
+            deferred, self.deferred = self.deferred, []
+        for item in deferred:
+            deliver(item)
+        return len(deferred)
+
+
+    def sample(self):
+        interval = self.sample_interval
+        while not self.stopped.wait(interval):
+            frames = sys._current_frames()
+            now = time.perf_counter()
+            for ident, (obsvr, notification, start, nested) in list(self.running.items()):
+                frame = frames.get(ident)
+                elapsed = now - start - nested
+                if frame is None or elapsed <= self.min_budget:
+                    continue
+                kind, name = self.name_of(obsvr, notification)
+                if elapsed <= self.budgets.get(name, self.budget):
+                    continue
+                with self.lock:
+                    offender = self.offender(kind, name)
+                    if len(offender.samples) < self.max_samples:
+                        offender.samples.append(''.join(traceback.format_stack(frame)))
+            del frames
+
+
+    def worst_offenders(self, count=10):
+        """
+        Get the offenders that took the longest.
+
+        @param count: the number of offenders
+        @return: a list of C{Offender}s, the slowest first
+        """
+        offenders = [offender for offender in self.offenders.values() if offender.count]
+        return sorted(offenders, key=lambda offender: offender.worst, reverse=True)[:count]
+
+
+
+def deliver(item):
+    notify, notification = item
+    try:
+        notify(notification)
+    except Exception as exception:
+        if isinstance(notification, RequestNotification) and not notification.answered:
+            notification.reject(exception)
+        else:
+            raise
+
+
+def swap_observer(view, notification_name, old, new):
+    """
+    Replace an observer in the observer lists of a C{View}.
+
+    @param view: the C{View}
+    @param notification_name: the name of the only list to change, or C{None} for all
+    @param old: the C{IObserver} to replace
+    @param new: the C{IObserver} taking its place
+    """
+    for observer_map in (view.observer_map, view.typed_observer_map):
+        for key, observers in list(observer_map.items()):
+            if notification_name is not None and key != notification_name:
+                continue
+            if any(obsvr is old for obsvr in observers):
+                observer_map[key] = tuple(new if obsvr is old else obsvr for obsvr in observers)
+    view.observer_table = None
+
+
+
+def get_watchdog(multiton_key):
+    """
+    Get the watchdog of a Core.
+
+    @param multiton_key: the multiton key of the Core
+    @return: the C{Watchdog}, or C{None} if the Core is not watched
+    """
+    return watchdogs.get(multiton_key)
+
+
+def original_observers(multiton_key):
+    """
+    Get the observers the demoted observers of a Core stand in for.
+
+    @param multiton_key: the multiton key of the Core
+    @return: a map of the C{id()}s of the demoted observers to the observers they replace,
+    for C{View.clone}
+    """
+    watchdog = watchdogs.get(multiton_key)
+    if watchdog is None:
+        return {}
+    with watchdog.lock:
+        return dict((id(replacement), original) for key, replacement, original in watchdog.demoted)
+
+
+def stop_core(multiton_key):
+    """
+    Stop the watchdog of a removed Core.
+
+    @param multiton_key: the multiton key of the Core
+    """
+    watchdog = watchdogs.get(multiton_key)
+    if watchdog is not None:
+        watchdog.stop()
@@ -1,7 +1,7 @@
 import unittest
 from puremvc_multicore.core import Controller
 from puremvc_multicore.interfaces import IController
-from puremvc_multicore.patterns.observer import Notification
+from puremvc_multicore.patterns.observer import Notification, notification_registry
 import utils.controller
 
 
@@ -59,3 +59,44 @@ class ControllerTest(unittest.TestCase):
         controller.remove_command('hasCommandTest')
 
         self.assertEqual(False, controller.has_command('hasCommandTest'))
+
+    def testRegisterAndExecuteCommandByPath(self):
+        """ControllerTest: Test register_command() with a dotted import path"""
+        controller = Controller('test')
+        controller.register_command('ControllerPathTest', 'utils.controller.ControllerTestCommand')
+
+        self.assertEqual(True, controller.has_command('ControllerPathTest'))
+
+        vo = utils.controller.ControllerTestVO(12)
+        controller.execute_command(Notification('ControllerPathTest', vo))
+
+        self.assertEqual(True, vo.result == 24)
+        self.assertEqual(True, controller.command_map['ControllerPathTest'] is utils.controller.ControllerTestCommand)
+
+        controller.remove_command('ControllerPathTest')
+
+    def testPrewarmCommands(self):
+        """ControllerTest: Test prewarm_commands() in the background"""
+        controller = Controller('test')
+        controller.register_command('ControllerPrewarmTest', 'utils.controller:ControllerTestCommand')
+
+        controller.prewarm_commands(background=True).join()
+
+        self.assertEqual(True, controller.command_map['ControllerPrewarmTest'] is utils.controller.ControllerTestCommand)
+
+        controller.remove_command('ControllerPrewarmTest')
+
+    def testExecuteCommandByInternedName(self):
+        """ControllerTest: Test execute_command() with an interned notification name"""
+        controller = Controller('test')
+        note_name = notification_registry.intern('ControllerInternedTest')
+        controller.register_command('ControllerInternedTest', utils.controller.ControllerTestCommand)
+
+        vo = utils.controller.ControllerTestVO(12)
+        controller.execute_command(Notification(note_name, vo))
+        self.assertEqual(True, vo.result == 24)
+
+        controller.remove_command(note_name)
+        vo = utils.controller.ControllerTestVO(12)
+        controller.execute_command(Notification(note_name, vo))
+        self.assertEqual(True, vo.result == 0)
@@ -71,3 +71,38 @@ class ModelTest(unittest.TestCase):
         model.remove_proxy(utils.model.ModelTestProxy.NAME)
 
         self.assertEqual(True, testProxy.get_data() == utils.model.ModelTestProxy.ON_REMOVE_CALLED)
+
+    def testRegisterProxyFactory(self):
+        """ModelTest: Test register_proxy_factory() creates the proxy on first retrieve_proxy()"""
+
+        model = Model('test')
+        utils.model.ModelTestLazyProxy.instances = 0
+        model.register_proxy_factory(utils.model.ModelTestLazyProxy.NAME, utils.model.ModelTestLazyProxy)
+
+        self.assertEqual(0, utils.model.ModelTestLazyProxy.instances)
+
+        testProxy = model.retrieve_proxy(utils.model.ModelTestLazyProxy.NAME)
+
+        self.assertEqual(True, isinstance(testProxy, utils.model.ModelTestLazyProxy))
+        self.assertEqual(True, testProxy.get_data() == utils.model.ModelTestProxy.ON_REGISTER_CALLED)
+        self.assertEqual(True, model.retrieve_proxy(utils.model.ModelTestLazyProxy.NAME) is testProxy)
+        self.assertEqual(1, utils.model.ModelTestLazyProxy.instances)
+
+        model.remove_proxy(utils.model.ModelTestLazyProxy.NAME)
+
+    def testHasProxyFactory(self):
+        """ModelTest: Test has_proxy() and remove_proxy() with a proxy factory"""
+
+        model = Model('test')
+        utils.model.ModelTestLazyProxy.instances = 0
+        model.register_proxy_factory(utils.model.ModelTestLazyProxy.NAME, utils.model.ModelTestLazyProxy)
+
+        self.assertEqual(True, model.has_proxy(utils.model.ModelTestLazyProxy.NAME))
+        self.assertEqual(1, utils.model.ModelTestLazyProxy.instances)
+
+        model.remove_proxy(utils.model.ModelTestLazyProxy.NAME)
+        model.register_proxy_factory(utils.model.ModelTestLazyProxy.NAME, utils.model.ModelTestLazyProxy)
+
+        self.assertEqual(None, model.remove_proxy(utils.model.ModelTestLazyProxy.NAME))
+        self.assertEqual(False, model.has_proxy(utils.model.ModelTestLazyProxy.NAME))
+        self.assertEqual(1, utils.model.ModelTestLazyProxy.instances)
@@ -1,9 +1,9 @@
 import unittest
 import utils.view
-from puremvc_multicore.core import View
+from puremvc_multicore.core import View, interest_index, update_interest_index
 from puremvc_multicore.interfaces import IView
 from puremvc_multicore.patterns.mediator import Mediator
-from puremvc_multicore.patterns.observer import Observer, Notification
+from puremvc_multicore.patterns.observer import Observer, Notification, notification_registry
 
 
 class ViewTest(unittest.TestCase):
@@ -25,6 +25,8 @@ class ViewTest(unittest.TestCase):
         View('test').remove_mediator(utils.view.ViewTestMediator3.NAME)
         View('test').remove_mediator(utils.view.ViewTestMediator4.NAME)
         View('test').remove_mediator(utils.view.ViewTestMediator5.NAME)
+        View('test').remove_mediator(utils.view.ViewTestLazyMediator.NAME)
+        View('test').remove_mediator(utils.view.ViewTestTypedMediator.NAME)
 
     def assertNotNone(self):
         """ViewTest: Test instance not null"""
@@ -52,6 +54,139 @@ class ViewTest(unittest.TestCase):
 
         self.assertEqual(True, self.viewTestVar == 10)
 
+    def testNotifyObserversByInternedName(self):
+        """ViewTest: Test notify_observers() with an interned notification name"""
+
+        self.viewTestVar = 0
+        def viewTestMethod(note):
+            self.viewTestVar += note.get_body()
+
+        view = View('test')
+        view.register_observer('ViewInternedTestNote', Observer(viewTestMethod, self))
+
+        note_name = notification_registry.intern('ViewInternedTestNote')
+        view.notify_observers(Notification(note_name, 10))
+        view.notify_observers(Notification('ViewInternedTestNote', 1))
+        self.assertEqual(11, self.viewTestVar)
+
+        view.remove_observer(note_name, self)
+        view.notify_observers(Notification(note_name, 10))
+        self.assertEqual(11, self.viewTestVar)
+
+    def testRemoveMediatorOfInternedInterests(self):
+        """ViewTest: Test remove_mediator() with interests sent by interned names"""
+        view = View('test')
+        view.register_mediator(utils.view.ViewTestMediator2(self))
+
+        self.lastNotification = None
+        view.notify_observers(Notification(notification_registry.intern(self.NOTE2)))
+        self.assertEqual(self.NOTE2, self.lastNotification)
+
+        view.remove_mediator(utils.view.ViewTestMediator2.NAME)
+        self.lastNotification = None
+        view.notify_observers(Notification(notification_registry.intern(self.NOTE2)))
+        self.assertEqual(None, self.lastNotification)
+        self.assertEqual(False, self.NOTE1 in view.observer_map)
+        self.__cleanup()
+
+    def testRegisterMediatorDoesNotIntern(self):
+        """ViewTest: Test register_mediator() leaves the names of its interests plain"""
+        view = View('test')
+        view.register_mediator(utils.view.ViewTestMediator2(self))
+        self.assertEqual(None, notification_registry.name_map.get(self.NOTE1))
+        self.__cleanup()
+
+    def testRemoveMediatorRemovesAllItsObservers(self):
+        """ViewTest: Test remove_mediator() removes observers registered besides its interests"""
+        view = View('test')
+        mediator = utils.view.ViewTestMediator2(self)
+        view.register_mediator(mediator)
+        view.register_observer('ViewTestExtraNote', Observer(mediator.handle_notification, mediator))
+        view.register_observer('ViewTestExtraNote', Observer(mediator.handle_notification, mediator), 'typed')
+
+        view.remove_mediator(utils.view.ViewTestMediator2.NAME)
+        self.assertEqual(False, 'ViewTestExtraNote' in view.observer_map)
+        self.assertEqual(False, ('ViewTestExtraNote', 'typed') in view.typed_observer_map)
+        self.__cleanup()
+
+    def testInterestIndex(self):
+        """ViewTest: Test the interest_index follows the observer lists of the Views"""
+        view = View('test')
+        other = View('test_interest_index')
+        view.register_observer('ViewIndexTestNote', Observer(None, self))
+        other.register_observer('ViewIndexTestNote', Observer(None, self), 'type')
+        self.assertEqual({'test'}, update_interest_index()['ViewIndexTestNote'])
+        self.assertEqual({'test_interest_index'}, interest_index[('ViewIndexTestNote', 'type')])
+
+        other.register_observer('ViewIndexTestNote', Observer(None, other))
+        other.remove_observer('ViewIndexTestNote', self, 'type')
+        update_interest_index()
+        self.assertEqual({'test', 'test_interest_index'}, interest_index['ViewIndexTestNote'])
+        self.assertEqual(False, ('ViewIndexTestNote', 'type') in interest_index)
+
+        View.remove_instance('test_interest_index')
+        self.assertEqual({'test'}, update_interest_index()['ViewIndexTestNote'])
+        view.remove_observer('ViewIndexTestNote', self)
+        self.assertEqual(False, 'ViewIndexTestNote' in update_interest_index())
+
+        view.register_mediator(utils.view.ViewTestMediator2(self))
+        self.assertEqual(True, 'test' in update_interest_index()[self.NOTE1])
+        view.remove_mediator(utils.view.ViewTestMediator2.NAME)
+        self.assertEqual(False, 'test' in update_interest_index().get(self.NOTE1, ()))
+
+    def testRegisterAndNotifyTypedObserver(self):
+        """ViewTest: Test register_observer() with a notification type"""
+
+        self.viewTestVar = 0
+        def viewTestMethod(note):
+            self.viewTestVar += note.get_body()
+
+        view = View('test')
+        view.register_observer('ViewTypedTestNote', Observer(viewTestMethod, self), 'wanted')
+
+        view.notify_observers(Notification('ViewTypedTestNote', 10, 'wanted'))
+        view.notify_observers(Notification('ViewTypedTestNote', 1, 'other'))
+        view.notify_observers(Notification('ViewTypedTestNote', 1))
+        self.assertEqual(10, self.viewTestVar)
+
+        view.remove_observer('ViewTypedTestNote', self, 'wanted')
+        view.notify_observers(Notification('ViewTypedTestNote', 10, 'wanted'))
+        self.assertEqual(10, self.viewTestVar)
+        self.assertEqual(False, ('ViewTypedTestNote', 'wanted') in view.typed_observer_map)
+
+    def testMediatorTypedInterests(self):
+        """ViewTest: Test register_mediator() and remove_mediator() with (name, type) interests"""
+        view = View('test')
+        view.register_mediator(utils.view.ViewTestTypedMediator(self))
+
+        self.counter = 0
+        view.notify_observers(Notification(self.NOTE1, None, 'other'))
+        view.notify_observers(Notification(self.NOTE1))
+        self.assertEqual(0, self.counter)
+
+        view.notify_observers(Notification(self.NOTE1, None, 'typed'))
+        view.notify_observers(Notification(self.NOTE2, None, 'other'))
+        self.assertEqual(2, self.counter)
+
+        view.remove_mediator(utils.view.ViewTestTypedMediator.NAME)
+        view.notify_observers(Notification(self.NOTE1, None, 'typed'))
+        self.assertEqual(2, self.counter)
+        self.assertEqual(False, (self.NOTE1, 'typed') in view.typed_observer_map)
+
+    def testMediatorPlainAndTypedInterests(self):
+        """ViewTest: Test a mediator interested in a name and in that name with a type is notified once"""
+        view = View('test')
+        view.register_mediator(utils.view.ViewTestPlainAndTypedMediator(self))
+
+        self.counter = 0
+        note = Notification(self.NOTE3, None, 'typed')
+        self.assertEqual(1, len(view.observers_for(note)))
+        view.notify_observers(note)
+        self.assertEqual(1, self.counter)
+        view.notify_observers(Notification(self.NOTE3))
+        self.assertEqual(2, self.counter)
+        view.remove_mediator(utils.view.ViewTestPlainAndTypedMediator.NAME)
+
     def testRegisterAndRetrieveMediator(self):
         """ViewTest: Test register_mediator() and retrieve_mediator()"""
         view = View('test')
@@ -231,3 +366,68 @@ class ViewTest(unittest.TestCase):
         self.assertTrue(self.NOTE5 in view.observer_map)
         view.notify_observers(Notification(self.NOTE5))
         self.assertFalse(self.NOTE5 in view.observer_map)
+
+
+    def testRegisterMediatorFactoryAndNotify(self):
+        """ViewTest: Test register_mediator_factory() creates the mediator on the first notification"""
+        view = View('test')
+        utils.view.ViewTestLazyMediator.instances = 0
+
+        view.register_mediator_factory(utils.view.ViewTestLazyMediator.NAME,
+                                       lambda: utils.view.ViewTestLazyMediator(self),
+                                       [self.NOTE1])
+
+        self.assertEqual(True, view.has_mediator(utils.view.ViewTestLazyMediator.NAME))
+        self.assertEqual(0, utils.view.ViewTestLazyMediator.instances)
+
+        self.counter = 0
+        view.notify_observers(Notification(self.NOTE2))
+        self.assertEqual(0, utils.view.ViewTestLazyMediator.instances)
+
+        view.notify_observers(Notification(self.NOTE1))
+        self.assertEqual(1, utils.view.ViewTestLazyMediator.instances)
+        self.assertEqual(True, self.onRegisterCalled)
+        self.assertEqual(1, self.counter)
+        self.assertEqual(True, self.lastNotification == self.NOTE1)
+
+        view.notify_observers(Notification(self.NOTE1))
+        view.notify_observers(Notification(self.NOTE2))
+        self.assertEqual(1, utils.view.ViewTestLazyMediator.instances)
+        self.assertEqual(3, self.counter)
+        self.assertEqual(True, self.lastNotification == self.NOTE2)
+
+        self.__cleanup()
+
+    def testRegisterMediatorFactoryAndRemove(self):
+        """ViewTest: Test remove_mediator() of a mediator factory that was never used"""
+        view = View('test')
+        utils.view.ViewTestLazyMediator.instances = 0
+
+        view.register_mediator_factory(utils.view.ViewTestLazyMediator.NAME,
+                                       lambda: utils.view.ViewTestLazyMediator(self),
+                                       [self.NOTE3])
+
+        self.assertEqual(True, view.remove_mediator(utils.view.ViewTestLazyMediator.NAME) is None)
+        self.assertEqual(False, view.has_mediator(utils.view.ViewTestLazyMediator.NAME))
+        self.assertEqual(False, self.NOTE3 in view.observer_map)
+
+        view.notify_observers(Notification(self.NOTE3))
+        self.assertEqual(0, utils.view.ViewTestLazyMediator.instances)
+
+    def testRetrieveMediatorFromFactory(self):
+        """ViewTest: Test retrieve_mediator() creates the mediator of a factory"""
+        view = View('test')
+
+        view.register_mediator_factory(utils.view.ViewTestLazyMediator.NAME,
+                                       lambda: utils.view.ViewTestLazyMediator(self),
+                                       [self.NOTE3])
+
+        mediator = view.retrieve_mediator(utils.view.ViewTestLazyMediator.NAME)
+        self.assertEqual(True, isinstance(mediator, utils.view.ViewTestLazyMediator))
+        self.assertEqual(False, self.NOTE3 in view.observer_map)
+
+        self.counter = 0
+        view.notify_observers(Notification(self.NOTE1))
+        self.assertEqual(1, self.counter)
+
+        self.__cleanup()
@@ -0,0 +1,48 @@
+import os
+import subprocess
+import sys
+from nose.tools import eq_, ok_
+import puremvc_multicore
+
+SRC = os.path.dirname(os.path.dirname(os.path.abspath(puremvc_multicore.__file__)))
+
+
+def loaded_modules(statement):
+    """Run C{statement} in a fresh interpreter and return the modules it loaded"""
+    script = statement + '\nimport sys\nprint(" ".join(sorted(sys.modules)))'
+    env = dict(os.environ, PYTHONPATH=SRC)
+    output = subprocess.check_output([sys.executable, '-S', '-c', script], env=env)
+    return set(output.decode().split())
+
+
+def package_modules(statement):
+    return set(name for name in loaded_modules(statement) if name.startswith('puremvc_multicore'))
+
+
+def testPackageImportIsLazy():
+    """ImportTest: Test importing the package loads no submodules"""
+    eq_(package_modules('import puremvc_multicore'), set(['puremvc_multicore']))
+
+
+def testProxyImportSkipsCore():
+    """ImportTest: Test importing Proxy and Mediator does not load the Facade and the core actors"""
+    for module in ('puremvc_multicore.patterns.proxy', 'puremvc_multicore.patterns.mediator', 'puremvc_multicore.patterns.command'):
+        modules = package_modules('import ' + module)
+        ok_('puremvc_multicore.patterns.facade' not in modules, module)
+        ok_('puremvc_multicore.core' not in modules, module)
+
+
+def testFacadeImportSkipsStdlib():
+    """ImportTest: Test importing the Facade does not load threading or importlib"""
+    modules = loaded_modules('import puremvc_multicore.patterns.facade')
+    ok_('threading' not in modules)
+    ok_('importlib' not in modules)
+
+
+def testLazyAttributes():
+    """ImportTest: Test lazily loaded attributes of the package"""
+    from puremvc_multicore.patterns.facade import Facade
+    from puremvc_multicore.patterns.proxy import Proxy
+    ok_(puremvc_multicore.Facade is Facade)
+    ok_(puremvc_multicore.patterns.proxy.Proxy is Proxy)
+    ok_('Facade' in dir(puremvc_multicore))
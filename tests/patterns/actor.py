@@ -0,0 +1,243 @@
+import logging
+import threading
+from concurrent.futures import Future
+from nose.tools import *
+from puremvc_multicore.patterns.actor import BLOCK, COALESCE, DROP_NEWEST, DROP_OLDEST, BoundedMailbox, MailboxFull, get_actor, get_mediator_actor
+from puremvc_multicore.patterns.command import SimpleCommand
+from puremvc_multicore.patterns.facade import Facade
+from puremvc_multicore.patterns.mediator import Mediator
+from puremvc_multicore.patterns.observer import Notification, RequestNotification
+
+
+class CountMediator(Mediator):
+    NAME = 'CountMediator'
+
+    def __init__(self):
+        super(CountMediator, self).__init__(CountMediator.NAME, [])
+        self.count = 0
+        self.threads = set()
+
+    def list_notification_interests(self):
+        return ['ADD', 'ADDED']
+
+    def handle_notification(self, note):
+        self.threads.add(threading.current_thread().name)
+        if note.get_name() == 'ADD':
+            # not atomic: correct only if notifications are handled one at a time
+            count = self.count
+            self.count = count + note.get_body()
+        else:
+            self.view_component.append(note.get_body())
+
+
+class AddCommand(SimpleCommand):
+    def execute(self, note):
+        if note.get_body() == 'fail':
+            raise ValueError('fail')
+        self.facade.send_notification('ADDED', note.get_body())
+        self.respond(note, note.get_body() * 2)
+
+
+def create_core(key):
+    facade = Facade(key)
+    mediator = CountMediator()
+    facade.register_mediator(mediator)
+    facade.register_command('DOUBLE', AddCommand)
+    return facade, mediator
+
+
+def test_actor_mailbox():
+    facade, mediator = create_core('test_actor_mailbox')
+    actor = facade.start_actor()
+    ok_(facade.start_actor() is actor)
+    ok_(get_actor('test_actor_mailbox') is actor)
+
+    def produce():
+        for _ in range(2000):
+            facade.send_notification('ADD', 1)
+
+    producers = [threading.Thread(target=produce) for _ in range(4)]
+    for producer in producers:
+        producer.start()
+    for producer in producers:
+        producer.join()
+    ok_(actor.flush(5))
+    eq_(mediator.count, 8000)
+    eq_(mediator.threads, set(['puremvc-core-test_actor_mailbox']))
+    eq_(actor.pending(), 0)
+
+    future = facade.request('DOUBLE', 21)
+    eq_(future.result(5), 42)
+    eq_(mediator.view_component, [21])
+    failed = facade.request('DOUBLE', 'fail')
+    assert_raises(ValueError, failed.result, 5)
+    eq_(actor.errors, 1)
+
+    actor.stop()
+    ok_('notify_observers' not in facade.__dict__)
+    ok_(get_actor('test_actor_mailbox') is None)
+    facade.send_notification('ADD', 1)
+    eq_(mediator.count, 8001)
+    ok_(threading.current_thread().name in mediator.threads)
+    Facade.remove_core('test_actor_mailbox')
+
+
+def test_actor_removed_with_core():
+    facade, mediator = create_core('test_actor_removed')
+    actor = facade.start_actor()
+    facade.send_notification('ADD', 5)
+    thread = actor.thread
+    Facade.remove_core('test_actor_removed')
+    thread.join(5)
+    ok_(not thread.is_alive())
+    eq_(mediator.count, 5)
+    ok_(get_actor('test_actor_removed') is None)
+
+
+def test_actor_logs_errors():
+    facade, mediator = create_core('test_actor_logs')
+    actor = facade.start_actor()
+    records = []
+    handler = logging.Handler()
+    handler.emit = records.append
+    logger = logging.getLogger('puremvc_multicore.patterns.actor')
+    logger.addHandler(handler)
+    try:
+        facade.send_notification('DOUBLE', 'fail')
+        facade.send_notification('ADD', 3)
+        ok_(actor.flush(5))
+    finally:
+        logger.removeHandler(handler)
+    eq_(len(records), 1)
+    ok_(isinstance(records[0].exc_info[1], ValueError))
+    eq_(actor.errors, 1)
+    eq_(mediator.count, 3)
+    Facade.remove_core('test_actor_logs')
+
+
+class GatedMediator(Mediator):
+    """Holds up the notifications it handles until its gate opens"""
+
+    def __init__(self, name):
+        super(GatedMediator, self).__init__(name, [])
+        self.gate = threading.Event()
+
+    def list_notification_interests(self):
+        return ['TICK']
+
+    def handle_notification(self, note):
+        self.gate.wait(5)
+        self.view_component.append(note.get_body())
+
+
+def test_mailbox_policies():
+    mailbox = BoundedMailbox(2, DROP_NEWEST)
+    for body in range(4):
+        mailbox.put(Notification('TICK', body))
+    eq_([mailbox.get().get_body() for _ in range(2)], [0, 1])
+
+    mailbox = BoundedMailbox(2, DROP_OLDEST)
+    for body in range(4):
+        mailbox.put(Notification('TICK', body))
+    eq_([mailbox.get().get_body() for _ in range(2)], [2, 3])
+
+    mailbox = BoundedMailbox(2, COALESCE)
+    mailbox.put(Notification('TICK', 0, 'a'))
+    mailbox.put(Notification('TOCK', 1))
+    mailbox.put(Notification('TICK', 2, 'a'))
+    mailbox.put(Notification('TOCK', 3))
+    eq_([mailbox.get().get_body() for _ in range(2)], [2, 3])
+    stats = mailbox.stats()
+    eq_(stats['coalesced'], 2)
+    eq_(stats['high_water'], 2)
+    eq_(stats['depth'], 0)
+
+    mailbox = BoundedMailbox(1, DROP_NEWEST)
+    mailbox.put(Notification('TICK'))
+    future = Future()
+    mailbox.put(RequestNotification('ASK', future=future))
+    assert_raises(MailboxFull, future.result, 0)
+    eq_(mailbox.stats()['dropped'], 1)
+    assert_raises(ValueError, BoundedMailbox, 1, 'spill')
+
+
+def test_mailbox_blocks():
+    mailbox = BoundedMailbox(1, BLOCK)
+    mailbox.put(Notification('TICK', 0))
+    sender = threading.Thread(target=mailbox.put, args=(Notification('TICK', 1),))
+    sender.start()
+    sender.join(0.05)
+    ok_(sender.is_alive())
+    eq_(mailbox.get().get_body(), 0)
+    sender.join(5)
+    eq_(mailbox.get().get_body(), 1)
+    eq_(mailbox.stats()['blocked'], 1)
+
+
+def test_bounded_actor():
+    facade = Facade('test_bounded_actor')
+    mediator = GatedMediator('gated')
+    facade.register_mediator(mediator)
+    actor = facade.start_actor(max_pending=4, policy=DROP_OLDEST)
+    for body in range(10):
+        facade.send_notification('TICK', body)
+    mediator.gate.set()
+    ok_(actor.flush(5))
+    stats = actor.stats()
+    ok_(stats['high_water'] <= 4)
+    eq_(stats['received'], 10)
+    eq_(len(mediator.view_component) + stats['dropped'], 10)
+    eq_(mediator.view_component[-1], 9)
+    Facade.remove_core('test_bounded_actor')
+
+
+def test_mediator_actor():
+    facade, counter = create_core('test_mediator_actor')
+    mediator = GatedMediator('gated')
+    facade.register_mediator(mediator)
+    assert_raises(KeyError, facade.start_mediator_actor, 'missing')
+    actor = facade.start_mediator_actor('gated', max_pending=3, policy=COALESCE)
+    ok_(facade.start_mediator_actor('gated') is actor)
+    ok_(get_mediator_actor('test_mediator_actor', 'gated') is actor)
+
+    # the slow mediator no longer holds up the sender nor the other observers
+    for body in range(5):
+        facade.send_notification('TICK', body)
+        facade.send_notification('ADD', 1)
+    eq_(counter.count, 5)
+    eq_(mediator.view_component, [])
+    mediator.gate.set()
+    ok_(actor.flush(5))
+    eq_(mediator.view_component[-1], 4)
+    stats = actor.stats()
+    eq_(len(mediator.view_component) + stats['coalesced'], 5)
+
+    actor.stop()
+    ok_(get_mediator_actor('test_mediator_actor', 'gated') is None)
+    facade.send_notification('TICK', 5)
+    eq_(mediator.view_component[-1], 5)
+
+    actor = facade.start_mediator_actor('gated')
+    thread = actor.thread
+    Facade.remove_core('test_mediator_actor')
+    thread.join(5)
+    ok_(not thread.is_alive())
+
+
+def test_mediator_actor_cloned_core():
+    template, counter = create_core('test_mediator_actor_clone')
+    actor = template.start_mediator_actor(CountMediator.NAME)
+    clone = template.clone_core('test_mediator_actor_clone_copy')
+    copy = clone.retrieve_mediator(CountMediator.NAME)
+    copy.view_component = []
+
+    # the copy is notified directly, not through the actor of the template
+    clone.send_notification('ADDED', 'to clone')
+    eq_(copy.view_component, ['to clone'])
+    ok_(actor.flush(5))
+    eq_(counter.view_component, [])
+    template.send_notification('ADDED', 'to template')
+    ok_(actor.flush(5))
+    eq_(counter.view_component, ['to template'])
+    Facade.remove_core('test_mediator_actor_clone_copy')
+    Facade.remove_core('test_mediator_actor_clone')
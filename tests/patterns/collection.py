@@ -0,0 +1,133 @@
+import pickle
+from nose.tools import *
+from puremvc_multicore.patterns.collection import CollectionProxy, HashIndex, MultiKeyIndex, SortedIndex
+from puremvc_multicore.patterns.facade import Facade
+from puremvc_multicore.patterns.mediator import Mediator
+
+
+class TaskProxy(CollectionProxy):
+    NAME = 'TaskProxy'
+    INDEXES = {
+        'status': HashIndex('status'),
+        'owner_status': HashIndex('owner', 'status'),
+        'due': SortedIndex('due'),
+        'tags': MultiKeyIndex('tags'),
+    }
+
+
+class OpenTasksMediator(Mediator):
+    NAME = 'OpenTasksMediator'
+
+    def list_notification_interests(self):
+        return [(TaskProxy.CHANGED, TaskProxy.NAME)]
+
+    def handle_notification(self, note):
+        change = note.get_body()
+        self.view_component.append((change.kind, change.primary_key, change.affects('status', 'open')))
+
+
+def create_core(key):
+    facade = Facade(key)
+    facade.register_proxy(TaskProxy(data=[
+        {'id': 1, 'owner': 'ann', 'status': 'open', 'due': 5, 'tags': ['ui']},
+        {'id': 2, 'owner': 'bob', 'status': 'done', 'due': 3, 'tags': ['ui', 'db']},
+        {'id': 3, 'owner': 'ann', 'status': 'open', 'due': 9, 'tags': []},
+    ]))
+    changes = []
+    facade.register_mediator(OpenTasksMediator(OpenTasksMediator.NAME, changes))
+    return facade, facade.retrieve_proxy(TaskProxy.NAME), changes
+
+
+def ids(records):
+    return [record['id'] for record in records]
+
+
+def test_collection_lookups():
+    facade, proxy, changes = create_core('test_collection_lookups')
+    eq_(len(proxy), 3)
+    eq_(ids(proxy.get_data()), [1, 2, 3])
+    eq_(ids(proxy.find('status', 'open')), [1, 3])
+    eq_(proxy.count('status', 'closed'), 0)
+    eq_(ids(proxy.find('owner_status', ('ann', 'open'))), [1, 3])
+    eq_(ids(proxy.find('tags', 'ui')), [1, 2])
+    eq_(ids(proxy.range('due', 4)), [1, 3])
+    eq_(ids(proxy.range('due', 3, 9, include_high=False)), [2, 1])
+    eq_(ids(proxy.find('due', 9)), [3])
+    Facade.remove_core('test_collection_lookups')
+
+
+def test_collection_changes():
+    facade, proxy, changes = create_core('test_collection_changes')
+
+    proxy.insert({'id': 4, 'owner': 'bob', 'status': 'open', 'due': 1, 'tags': ['db']})
+    eq_(ids(proxy.find('status', 'open')), [1, 3, 4])
+    eq_(ids(proxy.range('due', high=3)), [4, 2])
+    assert_raises(KeyError, proxy.insert, {'id': 4})
+
+    previous = proxy.get(1)
+    record = proxy.update(1, {'status': 'done', 'tags': ['db']})
+    ok_(previous is not record)
+    eq_(previous['status'], 'open')
+    eq_(ids(proxy.find('status', 'open')), [3, 4])
+    eq_(ids(proxy.find('status', 'done')), [2, 1])
+    eq_(ids(proxy.find('tags', 'ui')), [2])
+    eq_(ids(proxy.find('tags', 'db')), [2, 4, 1])
+
+    proxy.update(2, {'due': 10})
+    eq_(ids(proxy.range('due')), [4, 1, 3, 2])
+    proxy.update(3, {'due': 0})
+    proxy.delete(4)
+    eq_(ids(proxy.find('owner_status', ('bob', 'open'))), [])
+    eq_(ids(proxy.range('due')), [3, 1, 2])
+    assert_raises(ValueError, proxy.update, 3, {'id': 5})
+
+    eq_(changes, [('insert', 4, True), ('update', 1, True), ('update', 2, False),
+                  ('update', 3, True), ('delete', 4, True)])
+    eq_(facade.retrieve_proxy(TaskProxy.NAME).indexes['status'].entries['open'], {3: True})
+    Facade.remove_core('test_collection_changes')
+
+
+def test_collection_failed_change():
+    facade, proxy, changes = create_core('test_collection_failed_change')
+
+    # a due date the sorted index cannot compare leaves the records and the other indexes as they were
+    assert_raises(TypeError, proxy.insert, {'id': 4, 'owner': 'cid', 'status': 'open', 'due': 'x', 'tags': ['db']})
+    ok_(4 not in proxy)
+    eq_(ids(proxy.find('status', 'open')), [1, 3])
+    eq_(proxy.count('owner_status', ('cid', 'open')), 0)
+    assert_raises(TypeError, proxy.update, 2, {'status': 'open', 'due': 'x'})
+    eq_(proxy.get(2)['status'], 'done')
+    eq_(ids(proxy.find('status', 'open')), [1, 3])
+    eq_(ids(proxy.find('status', 'done')), [2])
+    eq_(ids(proxy.range('due')), [2, 1, 3])
+    eq_(changes, [])
+    Facade.remove_core('test_collection_failed_change')
+
+
+def test_collection_index_added():
+    proxy = TaskProxy(data=[{'id': 1, 'owner': 'ann', 'status': 'open', 'due': 5, 'tags': []}])
+    proxy.add_index('owner', HashIndex('owner'))
+    eq_(ids(proxy.find('owner', 'ann')), [1])
+    ok_('owner' not in TaskProxy.INDEXES)
+    eq_(len(TaskProxy.INDEXES['status']), 0)
+
+    copy = pickle.loads(pickle.dumps(proxy))
+    eq_(ids(copy.get_data()), [1])
+    eq_(ids(copy.find('owner', 'ann')), [1])
+
+
+def test_collection_cloned_core():
+    facade, proxy, changes = create_core('test_collection_cloned_core')
+    clone = facade.clone_core('test_collection_cloned_core_clone')
+    copy = clone.retrieve_proxy(TaskProxy.NAME)
+    copy.insert({'id': 4, 'owner': 'cy', 'status': 'open', 'due': 1, 'tags': ['ui']})
+    copy.delete(1)
+
+    # the template keeps its records and indexes
+    eq_(ids(proxy.get_data()), [1, 2, 3])
+    eq_(ids(proxy.find('status', 'open')), [1, 3])
+    eq_(ids(proxy.range('due')), [2, 1, 3])
+    eq_(ids(copy.find('status', 'open')), [3, 4])
+    eq_(ids(copy.find('tags', 'ui')), [2, 4])
+    Facade.remove_core('test_collection_cloned_core_clone')
+    Facade.remove_core('test_collection_cloned_core')
@@ -0,0 +1,141 @@
+from nose.tools import *
+from puremvc_multicore.patterns import columnar
+from puremvc_multicore.patterns.columnar import ColumnarProxy
+from puremvc_multicore.patterns.facade import Facade
+from puremvc_multicore.patterns.mediator import Mediator
+
+
+class ChangeMediator(Mediator):
+    NAME = 'ChangeMediator'
+
+    def list_notification_interests(self):
+        return [ColumnarProxy.CHANGED]
+
+    def handle_notification(self, note):
+        self.view_component.append((note.get_type(), note.get_body()))
+
+
+def create_core(key):
+    facade = Facade(key)
+    proxy = ColumnarProxy('orders', dtypes={'amount': 'f8'})
+    proxy.set_records([
+        {'id': 1, 'city': 'Oslo', 'amount': 10},
+        {'id': 2, 'city': 'Rome', 'amount': 30},
+        {'id': 3, 'city': 'Oslo', 'amount': 20},
+        {'id': 4, 'city': 'Lima', 'amount': 5},
+    ])
+    facade.register_proxy(proxy)
+    changes = []
+    facade.register_mediator(ChangeMediator(ChangeMediator.NAME, changes))
+    return facade, proxy, changes
+
+
+def test_columnar_queries():
+    facade, proxy, changes = create_core('test_columnar_queries')
+    eq_(len(proxy), 4)
+
+    oslo = proxy.where(('city', '==', 'Oslo'))
+    eq_(proxy.count(oslo), 2)
+    eq_(list(proxy.select(oslo)['id']), [1, 3])
+    eq_(proxy.aggregate('amount', 'sum', oslo), 30)
+    eq_(proxy.aggregate('amount', 'mean'), 16.25)
+    eq_(proxy.aggregate('amount', 'max', proxy.where(('city', 'in', ['Lima', 'Rome']))), 30)
+    eq_(proxy.aggregate('amount', 'min', proxy.where(('amount', '>', 100))), None)
+
+    large = proxy.where(('amount', '>=', 10), ('city', '!=', 'Rome'))
+    eq_(proxy.records(large, ['id']), [{'id': 1}, {'id': 3}])
+    eq_(list(proxy.select(proxy.order('amount', reverse=True))['id']), [2, 3, 1, 4])
+    eq_(proxy.records(slice(1, 2)), [{'id': 2, 'city': 'Rome', 'amount': 30.0}])
+    eq_(changes, [])
+    Facade.remove_core('test_columnar_queries')
+
+
+def test_columnar_changes():
+    facade, proxy, changes = create_core('test_columnar_changes')
+
+    proxy.append_records([{'id': 5, 'city': 'Rome', 'amount': 1}])
+    eq_(len(proxy), 5)
+    eq_((changes[-1][0], changes[-1][1].kind, changes[-1][1].rows), ('orders', 'append', slice(4, 5)))
+
+    rome = proxy.where(('city', '==', 'Rome'))
+    proxy.update(rome, {'amount': 0})
+    eq_(changes[-1][1].kind, 'update')
+    eq_(changes[-1][1].columns, ('amount',))
+    eq_(list(changes[-1][1].rows), [0, 1, 0, 0, 1])
+    eq_(list(proxy.column('amount')), [10, 0, 20, 5, 0])
+
+    proxy.sort('amount')
+    eq_(list(proxy.column('id')), [2, 5, 4, 1, 3])
+    eq_(list(changes[-1][1].rows), [1, 4, 3, 0, 2])
+
+    proxy.delete(proxy.where(('amount', '==', 0)))
+    eq_(list(proxy.column('id')), [4, 1, 3])
+    eq_(changes[-1][1].kind, 'delete')
+    eq_(len(changes), 4)
+
+    assert_raises(ValueError, proxy.append, {'id': [6]})
+    Facade.remove_core('test_columnar_changes')
+
+
+def test_columnar_rows():
+    facade, proxy, changes = create_core('test_columnar_rows')
+    proxy.append({'id': [5, 6], 'city': ['Rome', 'Oslo'], 'amount': [1, 2]})
+
+    # row numbers in an int8 column are not taken for a mask
+    rows = columnar.make_column([0, 2], 'int8')
+    eq_(proxy.count(rows), 2)
+    eq_(list(proxy.select(rows)['id']), [1, 3])
+    proxy.delete(rows)
+    eq_(list(proxy.column('id')), [2, 4, 5, 6])
+    eq_(list(changes[-1][1].rows), [1, 0, 1, 0, 0, 0])
+
+    # masks and row numbers delete the same rows, and the change always holds a mask
+    proxy.delete([True, False, False, False])
+    eq_(list(proxy.column('id')), [4, 5, 6])
+    proxy.delete([1])
+    eq_(list(proxy.column('id')), [4, 6])
+    eq_(list(changes[-1][1].rows), [0, 1, 0])
+    proxy.delete(slice(0, 1))
+    proxy.delete([])
+    eq_(list(proxy.column('id')), [6])
+    masks = [change.rows for name, change in changes if change.kind == 'delete']
+    ok_(all(len(mask) == count for mask, count in zip(masks, [6, 4, 3, 2, 1])))
+    ok_(all(columnar.numpy is not None and mask.dtype == bool or isinstance(mask, columnar.RowMask)
+            for mask in masks))
+    Facade.remove_core('test_columnar_rows')
+
+
+def without_numpy(test):
+    numpy, columnar.numpy = columnar.numpy, None
+    try:
+        test()
+    finally:
+        columnar.numpy = numpy
+
+
+def test_columnar_queries_without_numpy():
+    without_numpy(test_columnar_queries)
+
+
+def test_columnar_changes_without_numpy():
+    without_numpy(test_columnar_changes)
+
+
+def test_columnar_rows_without_numpy():
+    without_numpy(test_columnar_rows)
+
+
+def test_columnar_masks_without_numpy():
+    def test():
+        facade, proxy, changes = create_core('test_columnar_masks')
+        mask = [True, False, True, False]
+        eq_(proxy.count(mask), 2)
+        eq_(list(proxy.select(mask)['id']), [1, 3])
+        eq_(proxy.aggregate('amount', 'sum', mask), 30)
+        proxy.update(mask, {'amount': 0})
+        eq_(list(proxy.column('amount')), [0, 30, 0, 5])
+        proxy.update([1], {'amount': 1})
+        eq_(list(proxy.column('amount')), [0, 1, 0, 5])
+        eq_(proxy.count([0, 1, 3]), 3)
+        Facade.remove_core('test_columnar_masks')
+    without_numpy(test)
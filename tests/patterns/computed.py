@@ -0,0 +1,112 @@
+from nose.tools import *
+from puremvc_multicore.patterns.computed import AppendOnlyProxy, ComputedProxy
+from puremvc_multicore.patterns.facade import Facade
+from puremvc_multicore.patterns.proxy import Proxy
+
+
+class TotalProxy(ComputedProxy):
+    NAME = 'TotalProxy'
+    DEPENDENCIES = ('OrdersProxy', 'RateProxy')
+
+    def __init__(self):
+        super(TotalProxy, self).__init__()
+        self.computed = 0
+        self.updated = 0
+
+    def compute(self, orders, rate):
+        self.computed += 1
+        return sum(orders) * rate
+
+    def update_appended(self, value, appended):
+        self.updated += 1
+        return value + sum(appended['OrdersProxy']) * self.facade.retrieve_proxy('RateProxy').get_data()
+
+
+class LabelProxy(ComputedProxy):
+    NAME = 'LabelProxy'
+    DEPENDENCIES = ('TotalProxy',)
+
+    def compute(self, total):
+        return 'total: %s' % total
+
+
+def create_core(key):
+    facade = Facade(key)
+    facade.register_proxy(AppendOnlyProxy('OrdersProxy', [1, 2, 3]))
+    facade.register_proxy(Proxy('RateProxy', 2))
+    facade.register_proxy(TotalProxy())
+    return facade
+
+
+def test_computed_lazily():
+    facade = create_core('test_computed_lazily')
+    total = facade.retrieve_proxy(TotalProxy.NAME)
+    eq_(total.computed, 0)
+
+    eq_(total.get_data(), 12)
+    eq_(total.get_data(), 12)
+    eq_(total.computed, 1)
+
+    facade.retrieve_proxy('RateProxy').set_data(3)
+    facade.retrieve_proxy('RateProxy').set_data(10)
+    eq_(total.computed, 1)
+    eq_(total.get_data(), 60)
+    eq_(total.computed, 2)
+    Facade.remove_core('test_computed_lazily')
+
+
+def test_computed_incrementally():
+    facade = create_core('test_computed_incrementally')
+    orders = facade.retrieve_proxy('OrdersProxy')
+    total = facade.retrieve_proxy(TotalProxy.NAME)
+    eq_(total.get_data(), 12)
+
+    orders.append(4)
+    orders.extend([5, 6])
+    eq_(total.get_data(), 42)
+    eq_((total.computed, total.updated), (1, 1))
+
+    orders.set_data([1])
+    eq_(total.get_data(), 2)
+    eq_((total.computed, total.updated), (2, 1))
+
+    # changed in place: computed from scratch, not as an empty append
+    orders.get_data()[0] = 100
+    orders.mark_changed()
+    eq_(total.get_data(), 200)
+    eq_((total.computed, total.updated), (3, 1))
+
+    orders.append(1)
+    facade.retrieve_proxy('RateProxy').set_data(1)
+    eq_(total.get_data(), 101)
+    eq_((total.computed, total.updated), (4, 1))
+    Facade.remove_core('test_computed_incrementally')
+
+
+def test_computed_chain():
+    facade = create_core('test_computed_chain')
+    facade.register_proxy(LabelProxy())
+    label = facade.retrieve_proxy(LabelProxy.NAME)
+    eq_(label.get_data(), 'total: 12')
+
+    facade.retrieve_proxy('OrdersProxy').append(4)
+    eq_(label.get_data(), 'total: 20')
+
+    rate = facade.retrieve_proxy('RateProxy')
+    rate.data = 3
+    eq_(label.get_data(), 'total: 20')
+    rate.mark_changed()
+    eq_(label.get_data(), 'total: 30')
+    Facade.remove_core('test_computed_chain')
+
+
+def test_computed_source_replaced():
+    facade = create_core('test_computed_source_replaced')
+    total = facade.retrieve_proxy(TotalProxy.NAME)
+    eq_(total.get_data(), 12)
+
+    facade.remove_proxy('RateProxy')
+    assert_raises(KeyError, total.get_data)
+    facade.register_proxy(Proxy('RateProxy', 1))
+    eq_(total.get_data(), 6)
+    Facade.remove_core('test_computed_source_replaced')
@@ -115,3 +115,30 @@ def testHasCommand():
     ok_(not fcde.has_command('facadeHasCommandTest'))
 
 
+
+
+def testRegisterProxyFactory():
+    """FacadeTest: Test register_proxy_factory() and retrieve_proxy()"""
+    fcde = Facade('test')
+    fcde.register_proxy_factory('lazyColors', lambda: Proxy('lazyColors', ['red', 'green', 'blue']))
+    ok_(fcde.has_proxy('lazyColors'))
+
+    pxy = fcde.retrieve_proxy('lazyColors')
+    ok_(isinstance(pxy, IProxy))
+    eq_(pxy.get_data(), ['red', 'green', 'blue'])
+
+    fcde.remove_proxy('lazyColors')
+    ok_(not fcde.has_proxy('lazyColors'))
+
+
+def testRegisterMediatorFactory():
+    """FacadeTest: Test register_mediator_factory() and has_mediator()"""
+    fcde = Facade('test')
+    fcde.register_mediator_factory('lazyMediator', lambda: Mediator('lazyMediator', object()), ['lazyNote'])
+    ok_(fcde.has_mediator('lazyMediator'))
+
+    fcde.send_notification('lazyNote')
+    ok_(isinstance(fcde.view.mediator_map.get('lazyMediator'), Mediator))
+
+    fcde.remove_mediator('lazyMediator')
+    ok_(not fcde.has_mediator('lazyMediator'))
@@ -1,5 +1,11 @@
+import copy
+import threading
 from nose.tools import *
+from puremvc_multicore.core import Controller, Model, View
+from puremvc_multicore.patterns.command import SimpleCommand
 from puremvc_multicore.patterns.facade import Facade
+from puremvc_multicore.patterns.mediator import Mediator
+from puremvc_multicore.patterns.observer import Notification
 from puremvc_multicore.patterns.proxy import Proxy
 
 
@@ -48,4 +54,309 @@ def test_custom_facade_proxy():
     facade = CustomFacade('test_custom_facade_proxy')
     facade.register_proxy(CustomProxy())
     proxy = facade.retrieve_proxy('_CustomProxy_')
-    eq_(proxy.get_data(), 5)
\ No newline at end of file
+    eq_(proxy.get_data(), 5)
+
+def test_get_instance():
+    facade = Facade.get_instance('test_get_instance')
+    ok_(facade is Facade('test_get_instance'))
+    ok_(Facade.get_instance('test_get_instance') is facade)
+    ok_(facade.controller is Controller.get_instance('test_get_instance'))
+    ok_(facade.model is Model.get_instance('test_get_instance'))
+    ok_(facade.view is View.get_instance('test_get_instance'))
+
+
+def test_remove_core():
+    facade = Facade('test_remove_core')
+    ok_(Facade.has_core('test_remove_core'))
+
+    Facade.remove_core('test_remove_core')
+    ok_(not Facade.has_core('test_remove_core'))
+    ok_(not Model.has_instance('test_remove_core'))
+    ok_(Facade('test_remove_core') is not facade)
+    Facade.remove_core('test_remove_core')
+
+
+class FacadeLookupProxy(Proxy):
+    def on_register(self):
+        self.set_data(self.facade)
+
+
+class InitializingFacade(Facade):
+    def initialize_model(self):
+        super(InitializingFacade, self).initialize_model()
+        self.register_proxy(FacadeLookupProxy())
+
+
+def test_facade_lookup_during_initialization():
+    facade = InitializingFacade('test_facade_lookup_during_initialization')
+    ok_(facade.retrieve_proxy('FacadeLookupProxy').get_data() is facade)
+    Facade.remove_core('test_facade_lookup_during_initialization')
+
+
+def test_prepare_for_fork():
+    import gc
+    facade = Facade('test_prepare_for_fork')
+    facade.register_command('PREPARE_FOR_FORK', 'puremvc_multicore.patterns.command.SimpleCommand')
+    try:
+        Facade.prepare_for_fork()
+        ok_(gc.get_freeze_count() > 0)
+    finally:
+        gc.unfreeze()
+    from puremvc_multicore.patterns.command import SimpleCommand
+    ok_(facade.controller.command_map['PREPARE_FOR_FORK'] is SimpleCommand)
+    Facade.remove_core('test_prepare_for_fork')
+
+
+class TemplateCommand(SimpleCommand):
+    def execute(self, note):
+        note.get_body().append(self.facade.multiton_key)
+
+
+class TemplateProxy(Proxy):
+    def on_register(self):
+        self.set_data(self.multiton_key)
+
+
+class TemplateMediator(Mediator):
+    def list_notification_interests(self):
+        return ['TEMPLATE_NOTE']
+
+    def handle_notification(self, note):
+        note.get_body().append((self.get_mediator_name(), self.multiton_key))
+
+
+class TemplateFacade(Facade):
+    initializations = 0
+
+    def initialize_controller(self):
+        super(TemplateFacade, self).initialize_controller()
+        TemplateFacade.initializations += 1
+        self.register_command('TEMPLATE_COMMAND', TemplateCommand)
+
+    def initialize_model(self):
+        super(TemplateFacade, self).initialize_model()
+        self.register_proxy(TemplateProxy())
+        self.register_proxy_factory('LazyTemplateProxy', lambda: TemplateProxy('LazyTemplateProxy'))
+
+    def initialize_view(self):
+        super(TemplateFacade, self).initialize_view()
+        self.register_mediator(TemplateMediator())
+        self.register_mediator_factory('LazyTemplateMediator', lambda: TemplateMediator('LazyTemplateMediator'), ['TEMPLATE_NOTE'])
+
+
+def test_clone_core():
+    template = TemplateFacade('test_clone_core_template')
+    TemplateFacade.initializations = 0
+    facade = template.clone_core('test_clone_core')
+
+    ok_(isinstance(facade, TemplateFacade))
+    ok_(Facade('test_clone_core') is facade)
+    eq_(TemplateFacade.initializations, 0)
+    ok_(facade.controller is not template.controller)
+    ok_(facade.controller.view is facade.view)
+
+    body = []
+    facade.send_notification('TEMPLATE_COMMAND', body)
+    eq_(body, ['test_clone_core'])
+
+    proxy = facade.retrieve_proxy('TemplateProxy')
+    ok_(proxy is not template.retrieve_proxy('TemplateProxy'))
+    eq_(proxy.get_data(), 'test_clone_core')
+    eq_(facade.retrieve_proxy('LazyTemplateProxy').get_data(), 'test_clone_core')
+    ok_('LazyTemplateProxy' in template.model.proxy_factory_map)
+
+    body = []
+    facade.send_notification('TEMPLATE_NOTE', body)
+    eq_(sorted(body), [('LazyTemplateMediator', 'test_clone_core'), ('TemplateMediator', 'test_clone_core')])
+    ok_(template.view.mediator_map.get('LazyTemplateMediator') is None)
+
+    body = []
+    template.send_notification('TEMPLATE_NOTE', body)
+    eq_(sorted(body), [('LazyTemplateMediator', 'test_clone_core_template'), ('TemplateMediator', 'test_clone_core_template')])
+
+    facade.remove_mediator('TemplateMediator')
+    ok_(template.has_mediator('TemplateMediator'))
+
+    assert_raises(ValueError, template.clone_core, 'test_clone_core')
+
+    # the data of the proxies is copied, not shared
+    template.register_proxy(Proxy('list', [[1]]))
+    clone = template.clone_core('test_clone_core_data')
+    clone.retrieve_proxy('list').get_data()[0].append(2)
+    eq_(template.retrieve_proxy('list').get_data(), [[1]])
+    Facade.remove_core('test_clone_core_data')
+
+    # data that cannot be copied is shared, and copy.copy of a proxy stays shallow
+    lock = threading.Lock()
+    template.register_proxy(Proxy('lock', lock))
+    clone = template.clone_core('test_clone_core_lock')
+    ok_(clone.retrieve_proxy('lock').get_data() is lock)
+    ok_(copy.copy(template.retrieve_proxy('list')).get_data() is template.retrieve_proxy('list').get_data())
+    Facade.remove_core('test_clone_core_lock')
+    Facade.remove_core('test_clone_core')
+    Facade.remove_core('test_clone_core_template')
+
+
+class DoubleCommand(SimpleCommand):
+    def execute(self, note):
+        if note.get_body() < 0:
+            self.reject(note, ValueError(note.get_body()))
+        else:
+            self.respond(note, note.get_body() * 2)
+
+
+class FailingCommand(SimpleCommand):
+    def execute(self, note):
+        raise KeyError(note.get_body())
+
+
+class AnswerThenFailCommand(SimpleCommand):
+    def execute(self, note):
+        self.respond(note, 'answer')
+        raise KeyError(note.get_body())
+
+
+def test_request():
+    facade = Facade('test_request')
+    facade.register_command('DOUBLE', DoubleCommand)
+    facade.register_command('FAIL', FailingCommand)
+
+    eq_(facade.request('DOUBLE', 21).result(0), 42)
+    ok_(isinstance(facade.request('DOUBLE', -1).exception(0), ValueError))
+    ok_(isinstance(facade.request('FAIL', 1).exception(0), KeyError))
+    ok_(not facade.request('UNHANDLED').done())
+
+    # an exception raised once the request is answered reaches the caller
+    facade.register_command('ANSWER_THEN_FAIL', AnswerThenFailCommand)
+    assert_raises(KeyError, facade.request, 'ANSWER_THEN_FAIL', 1)
+    Facade.remove_core('test_request')
+
+
+class AsyncMediator(Mediator):
+    NAME = 'AsyncMediator'
+
+    def list_notification_interests(self):
+        return ['FETCH']
+
+    def handle_notification(self, note):
+        # answered later, from another thread
+        import threading
+        threading.Thread(target=self.respond, args=(note, note.get_body() + 1)).start()
+
+
+def test_request_asyncio():
+    import asyncio
+    facade = Facade('test_request_asyncio')
+    facade.register_mediator(AsyncMediator(AsyncMediator.NAME))
+
+    async def fetch():
+        return await facade.request('FETCH', 1, loop=asyncio.get_running_loop())
+
+    eq_(asyncio.run(fetch()), 2)
+    Facade.remove_core('test_request_asyncio')
+
+
+class BatchMediator(Mediator):
+    NAME = 'BatchMediator'
+
+    def list_notification_interests(self):
+        return ['CHANGED', 'OTHER']
+
+    def handle_notification(self, note):
+        self.view_component.append((note.get_name(), note.get_body(), note.get_type()))
+
+
+def test_batch():
+    facade = Facade('test_batch')
+    received = []
+    facade.register_mediator(BatchMediator(BatchMediator.NAME, received))
+
+    with facade.batch():
+        for i in range(3):
+            facade.send_notification('CHANGED', i)
+        facade.send_notification('OTHER', 'x')
+        eq_(received, [])
+    eq_(received, [('CHANGED', 0, None), ('CHANGED', 1, None), ('CHANGED', 2, None), ('OTHER', 'x', None)])
+
+    del received[:]
+    with facade.batch(merge=True):
+        for i in range(100):
+            facade.send_notification('CHANGED', i)
+        facade.send_notification('OTHER', 'x')
+        facade.send_notification('CHANGED', 'typed', 'type')
+        eq_(received, [])
+    eq_(received, [('CHANGED', 99, None), ('OTHER', 'x', None), ('CHANGED', 'typed', 'type')])
+
+    del received[:]
+    try:
+        with facade.batch():
+            facade.send_notification('CHANGED', 1)
+            raise KeyError()
+    except KeyError:
+        pass
+    eq_(received, [])
+    ok_('notify_observers' not in facade.__dict__)
+
+    facade.send_notification('CHANGED', 2)
+    eq_(received, [('CHANGED', 2, None)])
+    Facade.remove_core('test_batch')
+
+
+def test_nested_batch():
+    facade = Facade('test_nested_batch')
+    received = []
+    facade.register_mediator(BatchMediator(BatchMediator.NAME, received))
+
+    with facade.batch(merge=lambda previous, note: Notification(note.get_name(), previous.get_body() + note.get_body())):
+        facade.send_notification('CHANGED', 1)
+        with facade.batch(merge=False):
+            facade.send_notification('CHANGED', 2)
+            facade.send_notification('CHANGED', 3)
+        eq_(received, [])
+    eq_(received, [('CHANGED', 6, None)])
+    Facade.remove_core('test_nested_batch')
+
+
+class ConfigMediator(Mediator):
+    NAME = 'ConfigMediator'
+
+    def list_notification_interests(self):
+        return ['CONFIG_RELOAD']
+
+    def handle_notification(self, note):
+        self.view_component.append((self.multiton_key, note))
+
+
+def test_broadcast():
+    received = []
+    for i in range(3):
+        Facade('test_broadcast_%d' % i).register_mediator(ConfigMediator(ConfigMediator.NAME, received))
+    Facade('test_broadcast_none')
+    clone = Facade('test_broadcast_0').clone_core('test_broadcast_clone')
+
+    eq_(sorted(Facade.interested_cores('CONFIG_RELOAD')),
+        ['test_broadcast_0', 'test_broadcast_1', 'test_broadcast_2', 'test_broadcast_clone'])
+    eq_(Facade.broadcast('CONFIG_RELOAD', {'debug': True}), 4)
+    eq_(sorted(key for key, note in received),
+        ['test_broadcast_0', 'test_broadcast_1', 'test_broadcast_2', 'test_broadcast_clone'])
+    eq_(len(set(id(note) for key, note in received)), 1)
+    eq_(received[0][1].get_body(), {'debug': True})
+
+    Facade.remove_core('test_broadcast_1')
+    clone.remove_mediator(ConfigMediator.NAME)
+    del received[:]
+    with Facade('test_broadcast_2').batch():
+        eq_(Facade.broadcast('CONFIG_RELOAD'), 2)
+        eq_([key for key, note in received], ['test_broadcast_0'])
+    eq_(sorted(key for key, note in received), ['test_broadcast_0', 'test_broadcast_2'])
+
+    from concurrent.futures import ThreadPoolExecutor
+    del received[:]
+    with ThreadPoolExecutor(2) as executor:
+        eq_(Facade.broadcast('CONFIG_RELOAD', executor=executor), 2)
+    eq_(len(received), 2)
+    eq_(Facade.broadcast('NOBODY'), 0)
+
+    for key in ('test_broadcast_0', 'test_broadcast_2', 'test_broadcast_none', 'test_broadcast_clone'):
+        Facade.remove_core(key)
+    eq_(Facade.interested_cores('CONFIG_RELOAD'), [])
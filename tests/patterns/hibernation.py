@@ -0,0 +1,238 @@
+import os
+import shutil
+import tempfile
+from nose.tools import *
+from puremvc_multicore.core import Model
+from puremvc_multicore.interfaces import IFacade
+from puremvc_multicore.patterns.facade import Facade
+from puremvc_multicore.patterns.hibernation import FileCoreStore, HibernatingCoreMap, SqliteCoreStore, proxy_data_size
+from puremvc_multicore.patterns.mapped import MappedProxy
+from puremvc_multicore.patterns.mediator import Mediator
+from puremvc_multicore.patterns.proxy import Proxy
+
+
+class TenantProxy(Proxy):
+    NAME = 'TenantProxy'
+
+    def __init__(self):
+        super(TenantProxy, self).__init__(TenantProxy.NAME, [])
+
+
+class TenantMediator(Mediator):
+    NAME = 'TenantMediator'
+
+    def __init__(self):
+        super(TenantMediator, self).__init__(TenantMediator.NAME)
+
+
+class TenantFacade(Facade):
+    def initialize_model(self):
+        super(TenantFacade, self).initialize_model()
+        self.register_proxy(TenantProxy())
+
+    def initialize_view(self):
+        super(TenantFacade, self).initialize_view()
+        self.register_mediator(TenantMediator())
+
+
+class MappedFacade(Facade):
+    PATH = None
+
+    def initialize_model(self):
+        super(MappedFacade, self).initialize_model()
+        self.register_proxy(MappedProxy('prices', self.PATH, '<q'))
+
+
+def installed(cores):
+    """Install C{cores} over an empty instance map, so the Cores of other tests stay out of its budget"""
+    previous = IFacade.instance_map
+    IFacade.instance_map = {}
+    cores.install()
+    return previous
+
+
+def uninstall(cores, previous):
+    cores.uninstall()
+    previous.update(IFacade.instance_map)
+    IFacade.instance_map = previous
+
+
+def check_hibernation(store):
+    keys = ['tenant_%d' % i for i in range(3)]
+    cores = HibernatingCoreMap(store, max_cores=2)
+    previous = installed(cores)
+    try:
+        for key in keys:
+            facade = TenantFacade(key)
+            facade.retrieve_proxy(TenantProxy.NAME).get_data().append(key)
+            facade.register_proxy(Proxy('extra', {'key': key}))
+
+        ok_(not cores.is_resident('tenant_0'))
+        ok_('tenant_0' in store)
+        ok_(not Model.has_instance('tenant_0'))
+        ok_(Facade.has_core('tenant_0'))
+
+        facade = Facade('tenant_0')
+        ok_(isinstance(facade, TenantFacade))
+        ok_(cores.is_resident('tenant_0'))
+        ok_('tenant_0' not in store)
+        eq_(facade.retrieve_proxy(TenantProxy.NAME).get_data(), ['tenant_0'])
+        eq_(facade.retrieve_proxy('extra').get_data(), {'key': 'tenant_0'})
+        ok_(facade.has_mediator(TenantMediator.NAME))
+        ok_(not cores.is_resident('tenant_1'))
+
+        stats = cores.stats()
+        eq_(stats['resident'], 2)
+        eq_(stats['evictions'], 2)
+        eq_(stats['restores'], 1)
+        ok_(stats['bytes_written'] > 0)
+
+        Facade.remove_core('tenant_1')
+        ok_(not Facade.has_core('tenant_1'))
+        ok_('tenant_1' not in store)
+    finally:
+        uninstall(cores, previous)
+        for key in keys:
+            Facade.remove_core(key)
+    ok_(IFacade.instance_map is not cores)
+
+
+def test_hibernation_sqlite():
+    check_hibernation(SqliteCoreStore(':memory:'))
+
+
+def test_hibernation_files():
+    directory = tempfile.mkdtemp()
+    try:
+        check_hibernation(FileCoreStore(directory))
+    finally:
+        shutil.rmtree(directory)
+
+
+def test_hibernation_memory_budget():
+    cores = HibernatingCoreMap(SqliteCoreStore(':memory:'), max_bytes=10000)
+    previous = installed(cores)
+    try:
+        Facade('budget_small')
+        ok_(cores.is_resident('budget_small'))
+        facade = Facade('budget_large')
+        facade.register_proxy(Proxy('large', list(range(5000))))
+        cores.measure('budget_large')
+        ok_(cores.is_resident('budget_large'))
+        ok_(not cores.is_resident('budget_small'))
+    finally:
+        uninstall(cores, previous)
+        Facade.remove_core('budget_small')
+        Facade.remove_core('budget_large')
+
+
+def test_hibernation_pins_unpicklable_cores():
+    cores = HibernatingCoreMap(SqliteCoreStore(':memory:'), max_cores=1)
+    previous = installed(cores)
+    try:
+        Facade('pinned').register_proxy(Proxy('lock', lambda: None))
+        Facade('pinned_other')
+        ok_(cores.is_resident('pinned'))
+        eq_(cores.stats()['failures'], 1)
+        eq_(cores.stats()['pinned'], 1)
+    finally:
+        uninstall(cores, previous)
+        Facade.remove_core('pinned')
+        Facade.remove_core('pinned_other')
+
+
+def test_hibernation_mapped_proxy():
+    directory = tempfile.mkdtemp()
+    cores = HibernatingCoreMap(SqliteCoreStore(':memory:'), max_cores=1)
+    previous = installed(cores)
+    try:
+        MappedFacade.PATH = os.path.join(directory, 'old.bin')
+        MappedProxy.dump(MappedFacade.PATH, '<q', [(1,), (2,)])
+        path = os.path.join(directory, 'new.bin')
+        MappedProxy.dump(path, '<q', [(3,), (4,), (5,)])
+
+        proxy = MappedFacade('mapped').retrieve_proxy('prices')
+        eq_(proxy.record(0), (1,))
+        proxy.set_data(path)
+        Facade('mapped_other')
+        ok_(not cores.is_resident('mapped'))
+
+        proxy = Facade('mapped').retrieve_proxy('prices')
+        ok_(cores.is_resident('mapped'))
+        eq_(proxy.path, path)
+        eq_(list(proxy.iter_records()), [(3,), (4,), (5,)])
+        proxy.close()
+    finally:
+        uninstall(cores, previous)
+        Facade.remove_core('mapped')
+        Facade.remove_core('mapped_other')
+        shutil.rmtree(directory)
+
+
+class PingMediator(Mediator):
+    NAME = 'PingMediator'
+
+    def list_notification_interests(self):
+        return ['HIBERNATION_PING']
+
+
+def test_hibernation_broadcast_skips_hibernated_cores():
+    cores = HibernatingCoreMap(SqliteCoreStore(':memory:'), max_cores=1)
+    previous = installed(cores)
+    try:
+        Facade('ping_0').register_mediator(PingMediator(PingMediator.NAME))
+        Facade('ping_1').register_mediator(PingMediator(PingMediator.NAME))
+        ok_(not cores.is_resident('ping_0'))
+        eq_(Facade.interested_cores('HIBERNATION_PING'), ['ping_1'])
+        eq_(Facade.broadcast('HIBERNATION_PING'), 1)
+        ok_(not cores.is_resident('ping_0'))
+
+        Facade('ping_0')
+        eq_(Facade.interested_cores('HIBERNATION_PING'), ['ping_0'])
+    finally:
+        uninstall(cores, previous)
+        Facade.remove_core('ping_0')
+        Facade.remove_core('ping_1')
+
+
+class ClosingProxy(Proxy):
+    removed = []
+
+    def on_remove(self):
+        ClosingProxy.removed.append(self.multiton_key)
+
+
+def test_hibernation_detaches_facades():
+    cores = HibernatingCoreMap(SqliteCoreStore(':memory:'), max_cores=1)
+    previous = installed(cores)
+    try:
+        held = TenantFacade('held')
+        held.register_proxy(ClosingProxy('closing', [1, 2, 3]))
+        Facade('held_other')
+        ok_(not cores.is_resident('held'))
+        eq_(ClosingProxy.removed, ['held'])
+        eq_((held.model, held.view, held.controller), (None, None, None))
+
+        # restoring the Core brings the Facade still referenced back
+        ok_(Facade('held') is held)
+        eq_(held.retrieve_proxy('closing').get_data(), [1, 2, 3])
+        ok_(held.has_mediator(TenantMediator.NAME))
+        eq_(cores.sizes['held'], proxy_data_size(held))
+    finally:
+        uninstall(cores, previous)
+        Facade.remove_core('held')
+        Facade.remove_core('held_other')
+
+
+def test_hibernation_keeps_cores_in_use():
+    cores = HibernatingCoreMap(SqliteCoreStore(':memory:'), max_cores=1)
+    previous = installed(cores)
+    try:
+        Facade('in_use').start_actor()
+        Facade('in_use_other')
+        ok_(cores.is_resident('in_use'))
+        ok_(not cores.hibernate('in_use'))
+    finally:
+        uninstall(cores, previous)
+        Facade.remove_core('in_use')
+        Facade.remove_core('in_use_other')
@@ -0,0 +1,110 @@
+import mmap
+import os
+import pickle
+import shutil
+import tempfile
+from nose.tools import *
+from puremvc_multicore.patterns.facade import Facade
+from puremvc_multicore.patterns.mapped import MappedProxy
+
+RECORD = '<qd'
+
+
+def create_file(directory, count=100):
+    path = os.path.join(directory, 'prices.bin')
+    MappedProxy.dump(path, RECORD, ((i, i * 0.5) for i in range(count)))
+    return path
+
+
+def test_mapped_lazily():
+    directory = tempfile.mkdtemp()
+    try:
+        facade = Facade('test_mapped_lazily')
+        proxy = MappedProxy('prices', create_file(directory), RECORD)
+        facade.register_proxy(proxy)
+        eq_(proxy.data, None)
+
+        eq_(len(proxy), 100)
+        ok_(isinstance(proxy.map, mmap.mmap))
+        eq_(proxy.record(3), (3, 1.5))
+        eq_(proxy.record(-1), (99, 49.5))
+        assert_raises(IndexError, proxy.record, 100)
+
+        view = proxy.records(10, 12)
+        ok_(isinstance(view, memoryview))
+        ok_(view.obj is proxy.map)
+        eq_(len(view), 32)
+        eq_(list(proxy.iter_records(98)), [(98, 49.0), (99, 49.5)])
+        eq_(len(proxy.records(50, 10)), 0)
+        assert_raises(TypeError, proxy.write_record, 0, (0, 0.0))
+
+        facade.remove_proxy('prices')
+        eq_(bytes(view[:8]), (10).to_bytes(8, 'little'))
+        del view
+        Facade.remove_core('test_mapped_lazily')
+    finally:
+        shutil.rmtree(directory)
+
+
+def test_mapped_writable():
+    directory = tempfile.mkdtemp()
+    try:
+        path = create_file(directory, 10)
+        proxy = MappedProxy('prices', path, RECORD, writable=True)
+        version = proxy.version
+        proxy.write_record(2, (2, 100.0))
+        ok_(proxy.version > version)
+        proxy.close()
+        eq_(proxy.data, None)
+
+        eq_(MappedProxy('copy', path, RECORD).record(2), (2, 100.0))
+    finally:
+        shutil.rmtree(directory)
+
+
+def test_mapped_pickle():
+    directory = tempfile.mkdtemp()
+    try:
+        proxy = MappedProxy('prices', create_file(directory), RECORD)
+        eq_(proxy.record(1), (1, 0.5))
+
+        copy = pickle.loads(pickle.dumps(proxy))
+        eq_(copy.data, None)
+        eq_(copy.record(1), (1, 0.5))
+        eq_(copy.record_format.size, 16)
+        proxy.close()
+        copy.close()
+
+        empty = os.path.join(directory, 'empty.bin')
+        open(empty, 'wb').close()
+        proxy.set_data(empty)
+        eq_(len(proxy), 0)
+    finally:
+        shutil.rmtree(directory)
+
+
+def test_mapped_cloned_core():
+    directory = tempfile.mkdtemp()
+    try:
+        path = create_file(directory)
+        os.mkdir(os.path.join(directory, 'other'))
+        other = create_file(os.path.join(directory, 'other'), 10)
+        template = Facade('test_mapped_cloned_core')
+        proxy = MappedProxy('prices', path, RECORD)
+        template.register_proxy(proxy)
+        eq_(proxy.record(3), (3, 1.5))
+
+        # the copy maps the file on its own, so closing it leaves the template mapped
+        clone = template.clone_core('test_mapped_cloned_core_clone')
+        copy = clone.retrieve_proxy('prices')
+        eq_(copy.data, None)
+        eq_(copy.record(4), (4, 2.0))
+        ok_(copy.map is not proxy.map)
+        copy.set_data(other)
+        eq_(len(copy), 10)
+        eq_(proxy.record(3), (3, 1.5))
+        Facade.remove_core('test_mapped_cloned_core_clone')
+        eq_(proxy.record(5), (5, 2.5))
+        Facade.remove_core('test_mapped_cloned_core')
+    finally:
+        shutil.rmtree(directory)
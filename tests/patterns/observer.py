@@ -1,5 +1,6 @@
+import pickle
 from nose.tools import eq_, ok_
-from puremvc_multicore.patterns.observer import Observer, Notification
+from puremvc_multicore.patterns.observer import Observer, Notification, NotificationRegistry, notification_registry
 
 
 class ObserverTester(object):
@@ -41,6 +42,12 @@ def testCompareNotifyContext():
     ok_(observer.compare_notify_context(tester))
 
 
+def testObserverHasNoDict():
+    """ObserverTest: Test Observer instances hold no per-instance dict"""
+    observer = Observer(ObserverTester().observerTestMethod)
+    ok_(not hasattr(observer, '__dict__'))
+
+
 def testNameAccessors():
     """NotificationTest: Test Name Accessors"""
     note = Notification('TestNote')
@@ -62,3 +69,46 @@ def testConstructor():
     eq_(note.get_name(), 'TestNote')
     eq_(note.get_body(), 5)
     eq_(note.get_type(), 'TestNoteType')
+
+
+def testNotificationRegistry():
+    """NotificationRegistryTest: Test intern() and bitsets"""
+    registry = NotificationRegistry()
+    first = registry.intern('RegistryTestNote1')
+    second = registry.intern('RegistryTestNote2')
+
+    eq_(first, 'RegistryTestNote1')
+    eq_(first.id, 0)
+    eq_(second.id, 1)
+    ok_(registry.intern('RegistryTestNote1') is first)
+    ok_(registry.get_name(1) is second)
+    eq_(registry.get_id('RegistryTestNote3'), 2)
+
+    bitset = registry.to_bitset(['RegistryTestNote1', 'RegistryTestNote3'])
+    eq_(bitset, 5)
+    eq_(registry.from_bitset(bitset), ['RegistryTestNote1', 'RegistryTestNote3'])
+
+
+def testNotificationId():
+    """NotificationTest: Test the id of an interned name"""
+    name = notification_registry.intern('IdTestNote1')
+    note = Notification(name, 5)
+
+    eq_(note.id, name.id)
+    eq_(note.get_name(), 'IdTestNote1')
+    ok_(Notification('IdTestNote1').id is None)
+
+    # the ids of another registry do not index the tables of the Cores
+    registry = NotificationRegistry()
+    private = registry.intern('IdTestNote1')
+    ok_(private.registry is registry)
+    ok_(Notification(private).id is None)
+
+
+def testNotificationNamePickle():
+    """NotificationTest: Test a pickled interned name loses its id"""
+    name = notification_registry.intern('PickleTestNote')
+    copy = pickle.loads(pickle.dumps(name))
+    eq_(copy, 'PickleTestNote')
+    ok_(copy.__class__ is str)
+    ok_(Notification(copy).id is None)
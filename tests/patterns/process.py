@@ -0,0 +1,135 @@
+import multiprocessing
+import os
+import threading
+import time
+from nose.tools import *
+from puremvc_multicore.patterns.actor import get_actor
+from puremvc_multicore.patterns.command import SimpleCommand
+from puremvc_multicore.patterns.facade import Facade
+from puremvc_multicore.patterns.mediator import Mediator
+from puremvc_multicore.patterns.process import receive_message, send_message
+from puremvc_multicore.patterns.proxy import Proxy
+
+
+class TotalCommand(SimpleCommand):
+    def execute(self, note):
+        proxy = self.facade.retrieve_proxy('total')
+        proxy.set_data(proxy.get_data() + note.get_body())
+        if proxy.get_data() >= 100:
+            self.facade.send_notification('TOTAL_REACHED', proxy.get_data())
+
+
+class EchoCommand(SimpleCommand):
+    def execute(self, note):
+        body = note.get_body()
+        if body == 'fail':
+            raise ValueError('fail')
+        if isinstance(body, bytearray):
+            body[0] = 1
+            self.facade.send_notification('ECHOED', body)
+        self.respond(note, (os.getpid(), len(body)))
+
+
+class SleepCommand(SimpleCommand):
+    def execute(self, note):
+        time.sleep(note.get_body())
+
+
+class WorkerFacade(Facade):
+    def initialize_controller(self):
+        super(WorkerFacade, self).initialize_controller()
+        self.register_command('ADD', TotalCommand)
+        self.register_command('ECHO', EchoCommand)
+        self.register_command('SLEEP', SleepCommand)
+
+    def initialize_model(self):
+        super(WorkerFacade, self).initialize_model()
+        self.register_proxy(Proxy('total', 0))
+
+
+class ReceiverMediator(Mediator):
+    def list_notification_interests(self):
+        return ['TOTAL_REACHED', 'ECHOED']
+
+    def handle_notification(self, note):
+        self.view_component.append((note.get_name(), note.get_body(), threading.current_thread().name))
+
+
+def add_limit_proxy(facade):
+    facade.register_proxy(Proxy('limit', 100))
+
+
+def fail_setup(facade):
+    raise KeyError('no setup')
+
+
+def test_messages():
+    parent, child = multiprocessing.Pipe()
+    small = bytearray(b'x' * 100)
+    large = bytearray(b'y' * 100000)
+    send_message(parent, ('notify', [('A', small, None), ('B', large, 't')]), 1024)
+    message = receive_message(child)
+    eq_(message[1][0], ('A', small, None))
+    eq_(message[1][1], ('B', large, 't'))
+    message[1][1][1][0] = 0
+    parent.close()
+    child.close()
+
+
+def test_remote_core():
+    received = []
+    target = Facade('test_remote_core_parent')
+    target.register_mediator(ReceiverMediator('receiver', received))
+    remote = WorkerFacade.spawn_core('test_remote_core', add_limit_proxy, forward=['TOTAL_REACHED', 'ECHOED'],
+                                     target=target, batch_size=16)
+    try:
+        ok_(get_actor('test_remote_core_parent') is not None)
+        ok_(not Facade.has_core('test_remote_core'))
+        ok_(remote.has_proxy('limit'))
+        ok_(remote.has_command('ADD'))
+        ok_(not remote.has_mediator('receiver'))
+        eq_(remote.retrieve_proxy('nothing'), None)
+        eq_(remote.retrieve_proxy('limit').get_data(), 100)
+
+        with remote.batch():
+            for _ in range(40):
+                remote.send_notification('ADD', 2)
+        eq_(remote.retrieve_proxy('total').get_data(), 80)
+        for _ in range(10):
+            remote.send_notification('ADD', 2)
+
+        pid, size = remote.request('ECHO', bytearray(200000)).result(10)
+        ok_(pid != os.getpid())
+        eq_(size, 200000)
+        assert_raises(ValueError, remote.request('ECHO', 'fail').result, 10)
+        assert_raises(AttributeError, remote.call, 'remove_proxy', 'total')
+        remote.send_notification('SLEEP', 0.5)
+        assert_raises(TimeoutError, remote.call, 'has_proxy', 'total', timeout=0.05)
+        eq_(remote.futures, {})
+        eq_(remote.retrieve_proxy('total').get_data(), 100)
+    finally:
+        remote.stop(10)
+    ok_(not remote.process.is_alive())
+    ok_(get_actor('test_remote_core_parent').flush(10))
+    eq_([name for name, body, thread in received], ['TOTAL_REACHED', 'ECHOED'])
+    eq_(set(thread for name, body, thread in received), set(['puremvc-core-test_remote_core_parent']))
+    eq_(received[0][1], 100)
+    eq_(received[1][1][0], 1)
+    eq_(len(received[1][1]), 200000)
+    Facade.remove_core('test_remote_core_parent')
+
+
+def test_remote_core_poll():
+    remote = WorkerFacade.spawn_core('test_remote_core_poll', forward=['TOTAL_REACHED'])
+    try:
+        remote.send_notification('ADD', 150)
+        eq_(remote.retrieve_proxy('total').get_data(), 150)
+        notifications = remote.poll()
+        eq_([(note.get_name(), note.get_body()) for note in notifications], [('TOTAL_REACHED', 150)])
+        eq_(remote.poll(), [])
+    finally:
+        remote.stop(10)
+
+
+def test_remote_core_setup_fails():
+    assert_raises(KeyError, WorkerFacade.spawn_core, 'test_remote_core_setup_fails', fail_setup)
@@ -0,0 +1,94 @@
+from nose.tools import *
+from puremvc_multicore.patterns.facade import Facade
+from puremvc_multicore.patterns.reactive import ReactiveMediator, ReactiveProxy
+
+
+class ProfileProxy(ReactiveProxy):
+    NAME = 'ProfileProxy'
+
+
+class FieldMediator(ReactiveMediator):
+    """Renders one field of the profile"""
+
+    def __init__(self, field, received):
+        super(FieldMediator, self).__init__('FieldMediator_' + field, received)
+        self.field = field
+
+    def list_notification_interests(self):
+        return ['RENDER']
+
+    def handle_notification(self, note):
+        value = self.facade.retrieve_proxy(ProfileProxy.NAME).get(self.field)
+        self.view_component.append((self.field, note.get_name(), note.get_body(), value))
+
+
+def create_core(key):
+    facade = Facade(key)
+    proxy = ProfileProxy(data={'name': 'Ann', 'city': 'Oslo', 'age': 30})
+    facade.register_proxy(proxy)
+    received = []
+    facade.register_mediator(FieldMediator('name', received))
+    facade.register_mediator(FieldMediator('city', received))
+    facade.send_notification('RENDER')
+    del received[:]
+    return facade, proxy, received
+
+
+def test_reactive_fields():
+    facade, proxy, received = create_core('test_reactive_fields')
+
+    proxy.set('age', 31)
+    eq_(received, [])
+
+    proxy.set('city', 'Bergen')
+    eq_(received, [('city', ReactiveProxy.CHANGED, ('city',), 'Bergen')])
+
+    del received[:]
+    proxy.set('city', 'Bergen')
+    eq_(received, [])
+
+    proxy.update({'name': 'Bo', 'city': 'Oslo', 'age': 32})
+    eq_(sorted(received), [('city', ReactiveProxy.CHANGED, ('city',), 'Oslo'),
+                           ('name', ReactiveProxy.CHANGED, ('name',), 'Bo')])
+
+    del received[:]
+    proxy.set_data({'name': 'Bo', 'city': 'Rome'})
+    eq_(received, [('city', ReactiveProxy.CHANGED, ('city',), 'Rome')])
+    Facade.remove_core('test_reactive_fields')
+
+
+def test_reactive_mediator_removed():
+    facade, proxy, received = create_core('test_reactive_mediator_removed')
+
+    facade.remove_mediator('FieldMediator_city')
+    proxy.set('city', 'Bergen')
+    eq_(received, [])
+    ok_('city' not in proxy.dependents)
+
+    proxy.get('city')
+    ok_('city' not in proxy.dependents)
+    Facade.remove_core('test_reactive_mediator_removed')
+
+
+def test_reactive_through_facade():
+    facade, proxy, received = create_core('test_reactive_through_facade')
+    with facade.batch():
+        proxy.set('city', 'Bergen')
+        eq_(received, [])
+    eq_(received, [('city', ReactiveProxy.CHANGED, ('city',), 'Bergen')])
+
+    # a mediator running on an actor gets the change in its mailbox
+    actor = facade.start_mediator_actor('FieldMediator_city')
+    proxy.set('city', 'Rome')
+    ok_(actor.flush(5))
+    eq_(received[-1], ('city', ReactiveProxy.CHANGED, ('city',), 'Rome'))
+    actor.stop()
+
+    clone = facade.clone_core('test_reactive_through_facade_clone')
+    observers = clone.view.typed_observer_map[(ReactiveProxy.CHANGED, ProfileProxy.NAME)]
+    eq_([obsvr.get_notify_context() for obsvr in observers], [clone.retrieve_proxy(ProfileProxy.NAME)])
+    Facade.remove_core('test_reactive_through_facade_clone')
+
+    facade.remove_proxy(ProfileProxy.NAME)
+    ok_((ReactiveProxy.CHANGED, ProfileProxy.NAME) not in facade.view.typed_observer_map)
+    Facade.remove_core('test_reactive_through_facade')
@@ -0,0 +1,168 @@
+import logging
+import threading
+from nose.tools import *
+from puremvc_multicore.patterns.facade import Facade
+from puremvc_multicore.patterns.mediator import Mediator
+from puremvc_multicore.patterns.scheduler import Scheduler
+
+
+class Clock(object):
+    now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TickMediator(Mediator):
+    NAME = 'TickMediator'
+
+    def __init__(self):
+        super(TickMediator, self).__init__(TickMediator.NAME, [])
+
+    def list_notification_interests(self):
+        return ['TICK', 'TIMEOUT']
+
+    def handle_notification(self, note):
+        self.view_component.append((note.get_name(), note.get_body()))
+
+
+def create_core(key, scheduler):
+    facade = Facade(key)
+    facade.scheduler = scheduler
+    facade.register_mediator(TickMediator())
+    return facade, facade.retrieve_mediator(TickMediator.NAME).view_component
+
+
+def test_send_notification_later():
+    clock = Clock()
+    scheduler = Scheduler(clock=clock)
+    facade, received = create_core('test_send_notification_later', scheduler)
+
+    facade.send_notification_later(5, 'TIMEOUT', 'late')
+    tick = facade.send_notification_later(1, 'TICK', 'tick', interval=2)
+    eq_(scheduler.pending('test_send_notification_later'), 2)
+
+    clock.now = 0.5
+    eq_(scheduler.run_pending(), 0)
+    clock.now = 1
+    eq_(scheduler.run_pending(), 1)
+    clock.now = 5
+    eq_(scheduler.run_pending(), 2)
+    eq_(received, [('TICK', 'tick'), ('TICK', 'tick'), ('TIMEOUT', 'late')])
+
+    tick.cancel()
+    clock.now = 20
+    eq_(scheduler.run_pending(), 0)
+    eq_(scheduler.pending(), 0)
+    Facade.remove_core('test_send_notification_later')
+
+
+def test_remove_core_cancels_notifications():
+    clock = Clock()
+    scheduler = Scheduler(clock=clock)
+    facade, received = create_core('test_remove_core_cancels', scheduler)
+
+    facade.send_notification_later(1, 'TICK', interval=1)
+    Facade.remove_core('test_remove_core_cancels')
+    eq_(scheduler.pending(), 0)
+
+    clock.now = 2
+    eq_(scheduler.run_pending(), 0)
+
+
+class FireMediator(Mediator):
+    def list_notification_interests(self):
+        return ['FIRE']
+
+    def handle_notification(self, note):
+        self.view_component.set()
+
+
+def test_shared_scheduler():
+    facade = Facade('test_shared_scheduler')
+    fired = threading.Event()
+    facade.register_mediator(FireMediator('FireMediator', fired))
+    facade.send_notification_later(0.01, 'FIRE')
+    ok_(fired.wait(5))
+    Facade.remove_core('test_shared_scheduler')
+
+
+def test_asyncio_scheduler():
+    import asyncio
+
+    async def run():
+        scheduler = Scheduler(loop=asyncio.get_running_loop())
+        facade, received = create_core('test_asyncio_scheduler', scheduler)
+        facade.send_notification_later(0.02, 'TIMEOUT', 2)
+        facade.send_notification_later(0.01, 'TICK', 1)
+        await asyncio.sleep(0.1)
+        scheduler.stop()
+        Facade.remove_core('test_asyncio_scheduler')
+        return received
+
+    eq_(asyncio.run(run()), [('TICK', 1), ('TIMEOUT', 2)])
+
+
+class FailingMediator(Mediator):
+    def list_notification_interests(self):
+        return ['TICK']
+
+    def handle_notification(self, note):
+        if note.get_body() == 'fail':
+            raise ValueError('fail')
+        self.view_component.append(threading.current_thread().name)
+
+
+class RecordingScheduler(Scheduler):
+    def on_error(self, timer, exception):
+        self.errors.append((timer.name, exception))
+
+
+def test_scheduler_errors_and_actor():
+    clock = Clock()
+    scheduler = RecordingScheduler(clock=clock)
+    scheduler.errors = []
+    facade = Facade('test_scheduler_errors')
+    facade.scheduler = scheduler
+    threads = []
+    facade.register_mediator(FailingMediator('FailingMediator', threads))
+
+    # a failing observer is reported and does not stop the notifications due after it
+    facade.send_notification_later(1, 'TICK', 'fail')
+    facade.send_notification_later(2, 'TICK')
+    clock.now = 2
+    eq_(scheduler.run_pending(), 2)
+    eq_([name for name, exception in scheduler.errors], ['TICK'])
+    ok_(isinstance(scheduler.errors[0][1], ValueError))
+    eq_(threads, [threading.current_thread().name])
+
+    # a Core running an actor is notified on its own thread
+    actor = facade.start_actor()
+    facade.send_notification_later(1, 'TICK')
+    clock.now = 3
+    eq_(scheduler.run_pending(), 1)
+    ok_(actor.flush(5))
+    eq_(threads[-1], 'puremvc-core-test_scheduler_errors')
+    Facade.remove_core('test_scheduler_errors')
+
+
+def test_scheduler_logs_errors():
+    clock = Clock()
+    scheduler = Scheduler(clock=clock)
+    facade = Facade('test_scheduler_logs')
+    facade.scheduler = scheduler
+    facade.register_mediator(FailingMediator('FailingMediator', []))
+    facade.send_notification_later(1, 'TICK', 'fail')
+    clock.now = 1
+    records = []
+    handler = logging.Handler()
+    handler.emit = records.append
+    logger = logging.getLogger('puremvc_multicore.patterns.scheduler')
+    logger.addHandler(handler)
+    try:
+        eq_(scheduler.run_pending(), 1)
+    finally:
+        logger.removeHandler(handler)
+    eq_(len(records), 1)
+    ok_(isinstance(records[0].exc_info[1], ValueError))
+    Facade.remove_core('test_scheduler_logs')
@@ -0,0 +1,102 @@
+import operator
+import pickle
+from nose.tools import *
+from puremvc_multicore.patterns.facade import Facade
+from puremvc_multicore.patterns.mediator import Mediator
+from puremvc_multicore.patterns.shared import SharedProxy, SharedProxyRegistry
+
+
+class LoadedMediator(Mediator):
+    NAME = 'LoadedMediator'
+
+    def list_notification_interests(self):
+        return ['LOADED']
+
+    def handle_notification(self, note):
+        self.view_component.append(note.get_body())
+
+
+def create_cores(prefix, registry, count=3):
+    cores = []
+    for i in range(count):
+        facade = Facade('%s_%d' % (prefix, i))
+        received = []
+        facade.register_mediator(LoadedMediator(LoadedMediator.NAME, received))
+        cores.append((facade, registry.mount(facade, 'countries', 'CountryProxy'), received))
+    return cores
+
+
+def remove_cores(cores):
+    for facade, proxy, received in cores:
+        Facade.remove_core(facade.multiton_key)
+
+
+def test_shared_mounts():
+    registry = SharedProxyRegistry()
+    loads = []
+    registry.register('countries', factory=lambda: loads.append(1) or {'no': 'Norway', 'it': 'Italy'})
+    eq_(loads, [])
+    cores = create_cores('test_shared_mounts', registry)
+    eq_(loads, [1])
+    eq_(registry.mounts('countries'), 3)
+
+    data = cores[0][1].get_data()
+    for facade, proxy, received in cores:
+        ok_(facade.retrieve_proxy('CountryProxy') is proxy)
+        ok_(proxy.get_data() is data)
+        proxy.send_notification('LOADED', facade.multiton_key)
+        eq_(received, [facade.multiton_key])
+
+    # the shared data is read-only, a detached copy is not
+    assert_raises(TypeError, operator.setitem, data, 'se', 'Sweden')
+    facade, proxy, received = cores[1]
+    proxy.detach()['se'] = 'Sweden'
+    ok_('se' not in data)
+    eq_(len(proxy.get_data()), 3)
+    eq_(registry.mounts('countries'), 2)
+    proxy.set_data(None)
+    ok_(proxy.get_data() is data)
+
+    Facade.remove_core(cores[2][0].multiton_key)
+    del cores[2], facade, proxy
+    eq_(registry.mounts('countries'), 2)
+    cores[0][0].remove_proxy('CountryProxy')
+    eq_(registry.mounts('countries'), 1)
+    remove_cores(cores)
+    eq_(loads, [1])
+
+
+class CountryProxy(SharedProxy):
+    registry = SharedProxyRegistry()
+
+
+def test_shared_clone_and_pickle():
+    registry = CountryProxy.registry
+    registry.register('countries', {'no': 'Norway'})
+
+    facade = Facade('test_shared_clone')
+    proxy = registry.mount(facade, 'countries', 'CountryProxy', CountryProxy)
+    ok_('registry' not in proxy.__dict__)
+    clone = facade.clone_core('test_shared_clone_copy')
+    cloned = clone.retrieve_proxy('CountryProxy')
+    ok_(cloned is not proxy)
+    ok_(cloned.get_data() is proxy.get_data())
+    eq_(registry.mounts('countries'), 2)
+
+    copy = pickle.loads(pickle.dumps(cloned))
+    eq_(copy.get_data(), None)
+    copy.set_data(None)
+    ok_(copy.get_data() is proxy.get_data())
+
+    registry.register('codes', ['no', 'it'])
+    registry.register('flags', bytearray(b'NOIT'))
+    eq_(registry.acquire('codes', proxy), ('no', 'it'))
+    ok_(registry.acquire('flags', proxy).readonly)
+    flags = registry.mount(clone, 'flags', 'FlagProxy', CountryProxy)
+    eq_(flags.detach(), bytearray(b'NOIT'))
+    eq_(pickle.loads(pickle.dumps(flags)).get_data(), bytearray(b'NOIT'))
+
+    assert_raises(ValueError, registry.register, 'cities')
+    assert_raises(KeyError, registry.acquire, 'cities', proxy)
+    Facade.remove_core('test_shared_clone')
+    Facade.remove_core('test_shared_clone_copy')
@@ -0,0 +1,78 @@
+from nose.tools import *
+from puremvc_multicore.patterns.facade import Facade
+from puremvc_multicore.patterns.mediator import Mediator
+from puremvc_multicore.patterns.tracking import Diff, TrackingProxy
+
+
+class PricesProxy(TrackingProxy):
+    NAME = 'PricesProxy'
+
+
+class BatchedPricesProxy(TrackingProxy):
+    NAME = 'BatchedPricesProxy'
+    AUTO_FLUSH = False
+
+
+class PricesMediator(Mediator):
+    """Keeps a copy of the prices up to date from the diffs"""
+
+    def list_notification_interests(self):
+        return [TrackingProxy.CHANGED]
+
+    def handle_notification(self, note):
+        copy, diffs = self.view_component
+        note.get_body().apply(copy)
+        diffs.append((note.get_type(), note.get_body()))
+
+
+def create_core(key, proxy):
+    facade = Facade(key)
+    facade.register_proxy(proxy)
+    copy, diffs = dict(proxy.get_data()), []
+    facade.register_mediator(PricesMediator('PricesMediator', (copy, diffs)))
+    return facade, copy, diffs
+
+
+def test_tracking_auto_flush():
+    proxy = PricesProxy(data={'a': 1, 'b': 2})
+    facade, copy, diffs = create_core('test_tracking_auto_flush', proxy)
+
+    proxy.set('c', 3)
+    proxy.update({'a': 10, 'b': 2})
+    eq_(proxy.delete('c'), 3)
+    proxy.set_data({'a': 10, 'd': 4})
+    eq_(diffs, [
+        ('PricesProxy', Diff(inserts={'c': 3})),
+        ('PricesProxy', Diff(updates={'a': 10})),
+        ('PricesProxy', Diff(deletes=('c',))),
+        ('PricesProxy', Diff(inserts={'d': 4}, deletes=('b',))),
+    ])
+    eq_(copy, proxy.get_data())
+    Facade.remove_core('test_tracking_auto_flush')
+
+
+def test_tracking_merged_changes():
+    proxy = BatchedPricesProxy(data={'a': 1, 'b': [1], 'c': 3})
+    facade, copy, diffs = create_core('test_tracking_merged_changes', proxy)
+
+    proxy.set('x', 1)
+    proxy.delete('x')
+    proxy.set('a', 5)
+    proxy.set('a', 1)
+    proxy.delete('c')
+    proxy.set('c', 30)
+    proxy.get('b').append(2)
+    proxy.touch('b')
+    proxy.set('d', 4)
+    eq_(diffs, [])
+    eq_(len(proxy.diff()), 3)
+
+    eq_(proxy.flush(), Diff(inserts={'d': 4}, updates={'c': 30, 'b': [1, 2]}))
+    eq_(len(diffs), 1)
+    eq_(copy, proxy.get_data())
+    eq_(proxy.flush(), None)
+
+    proxy.set('d', 4)
+    eq_(proxy.flush(), None)
+    eq_(len(diffs), 1)
+    Facade.remove_core('test_tracking_merged_changes')
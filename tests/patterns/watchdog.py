@@ -0,0 +1,157 @@
+import threading
+import time
+from nose.tools import *
+from puremvc_multicore.patterns.command import SimpleCommand
+from puremvc_multicore.patterns.facade import Facade
+from puremvc_multicore.patterns.mediator import Mediator
+from puremvc_multicore.patterns.watchdog import ASYNC, DEFER, get_watchdog
+
+
+class SlowMediator(Mediator):
+    def list_notification_interests(self):
+        return ['TICK']
+
+    def handle_notification(self, note):
+        if note.get_body():
+            time.sleep(note.get_body())
+        self.view_component.append(threading.current_thread().name)
+
+
+class SlowCommand(SimpleCommand):
+    def execute(self, note):
+        time.sleep(note.get_body())
+        self.respond(note, threading.current_thread().name)
+
+
+class RelayCommand(SimpleCommand):
+    def execute(self, note):
+        self.facade.send_notification('TICK', note.get_body())
+
+
+def create_core(key):
+    facade = Facade(key)
+    slow = SlowMediator('slow', [])
+    fast = SlowMediator('fast', [])
+    facade.register_mediator(slow)
+    facade.register_mediator(fast)
+    facade.register_command('WORK', SlowCommand)
+    facade.register_command('RELAY', RelayCommand)
+    return facade, slow, fast
+
+
+def test_watchdog_flags_offenders():
+    facade, slow, fast = create_core('test_watchdog_flags')
+    reports = []
+    watchdog = facade.start_watchdog(0.01, budgets={'fast': 1.0}, sample_interval=0.002,
+                                     report=lambda offender, note, elapsed: reports.append((offender.name, elapsed)))
+    ok_(facade.start_watchdog() is watchdog)
+    ok_(get_watchdog('test_watchdog_flags') is watchdog)
+
+    facade.send_notification('TICK', 0)
+    eq_(watchdog.offenders, {})
+    facade.send_notification('TICK', 0.03)
+    facade.request('WORK', 0.02).result(5)
+    eq_(sorted(watchdog.offenders), [('command', 'WORK'), ('mediator', 'slow')])
+    eq_([name for name, elapsed in reports], ['slow', 'WORK'])
+    ok_(reports[0][1] >= 0.03)
+
+    offender = watchdog.offenders[('mediator', 'slow')]
+    eq_(offender.count, 1)
+    eq_(offender.notification_name, 'TICK')
+    ok_(offender.samples)
+    ok_('handle_notification' in offender.samples[0])
+    eq_(watchdog.worst_offenders()[0], offender)
+
+    watchdog.stop()
+    ok_('notify_observers' not in facade.view.__dict__)
+    ok_(get_watchdog('test_watchdog_flags') is None)
+    Facade.remove_core('test_watchdog_flags')
+
+
+def test_watchdog_defers_offenders():
+    facade, slow, fast = create_core('test_watchdog_defers')
+    watchdog = facade.start_watchdog(0.005, budgets={'fast': 1.0}, demote=DEFER, strikes=2)
+    facade.send_notification('TICK', 0.01)
+    facade.send_notification('TICK', 0.01)
+    eq_(watchdog.offenders[('mediator', 'slow')].demoted, DEFER)
+    eq_(len(slow.view_component), 2)
+
+    facade.send_notification('TICK', 0.01)
+    eq_(len(slow.view_component), 2)
+    eq_(len(fast.view_component), 3)
+    eq_(watchdog.deliver_deferred(), 1)
+    eq_(len(slow.view_component), 3)
+
+    # a copy of the Core is not watched
+    clone = facade.clone_core('test_watchdog_defers_clone')
+    ok_('notify_observers' not in clone.view.__dict__)
+    Facade.remove_core('test_watchdog_defers_clone')
+
+    Facade.remove_core('test_watchdog_defers')
+    ok_(get_watchdog('test_watchdog_defers') is None)
+    ok_('notify_observers' not in facade.view.__dict__)
+    facade.send_notification('TICK', 0)
+    eq_(len(slow.view_component), 4)
+
+
+def test_watchdog_demotes_commands():
+    facade, slow, fast = create_core('test_watchdog_async')
+    watchdog = facade.start_watchdog(0.005, budgets={'fast': 1.0}, demote=ASYNC, strikes=1)
+    eq_(facade.request('WORK', 0.01).result(5), threading.current_thread().name)
+    eq_(watchdog.offenders[('command', 'WORK')].demoted, ASYNC)
+
+    # the command now runs on the thread of the watchdog; the mediators do not
+    eq_(facade.request('WORK', 0).result(5), 'puremvc-demoted-test_watchdog_async')
+    facade.send_notification('TICK', 0)
+    eq_(slow.view_component, [threading.current_thread().name])
+    watchdog.stop()
+    eq_(facade.request('WORK', 0).result(5), threading.current_thread().name)
+    Facade.remove_core('test_watchdog_async')
+    assert_raises(ValueError, Facade('test_watchdog_bad').start_watchdog, demote='later')
+    Facade.remove_core('test_watchdog_bad')
+
+
+def test_watchdog_excludes_nested_observers():
+    facade, slow, fast = create_core('test_watchdog_nested')
+    watchdog = facade.start_watchdog(0.01, budgets={'fast': 1.0}, sample_interval=0.002, demote=ASYNC, strikes=1)
+
+    # the command is quick, the mediator it notifies is not
+    facade.send_notification('RELAY', 0.03)
+    eq_(sorted(watchdog.offenders), [('mediator', 'slow')])
+    offender = watchdog.offenders[('mediator', 'slow')]
+    ok_(offender.samples)
+    ok_(all('handle_notification' in sample for sample in offender.samples))
+    eq_(offender.demoted, ASYNC)
+
+    # only the mediator is handed to the thread of the watchdog
+    facade.send_notification('RELAY', 0)
+    ok_(watchdog.actor.flush(5))
+    eq_(slow.view_component[-1], 'puremvc-demoted-test_watchdog_nested')
+    eq_(fast.view_component, [threading.current_thread().name] * 2)
+    eq_(sorted(watchdog.offenders), [('mediator', 'slow')])
+
+    Facade.remove_core('test_watchdog_nested')
+    ok_('notify_observers' not in facade.view.__dict__)
+    facade.send_notification('TICK', 0)
+    eq_(slow.view_component[-1], threading.current_thread().name)
+
+
+def test_watchdog_cloned_core():
+    facade, slow, fast = create_core('test_watchdog_clone')
+    watchdog = facade.start_watchdog(0.005, budgets={'fast': 1.0}, demote=DEFER, strikes=1)
+    facade.send_notification('TICK', 0.01)
+    facade.request('WORK', 0.01).result(5)
+    eq_(watchdog.offenders[('mediator', 'slow')].demoted, DEFER)
+    eq_(watchdog.offenders[('command', 'WORK')].demoted, DEFER)
+
+    # the copy of a demoted observer is notified at once, not deferred for the template
+    clone = facade.clone_core('test_watchdog_clone_copy')
+    copy = clone.retrieve_mediator('slow')
+    copy.view_component = []
+    clone.send_notification('TICK', 0)
+    eq_(copy.view_component, [threading.current_thread().name])
+    ok_(clone.request('WORK', 0).done())
+    eq_(watchdog.deliver_deferred(), 0)
+    eq_(len(slow.view_component), 1)
+    Facade.remove_core('test_watchdog_clone_copy')
+    Facade.remove_core('test_watchdog_clone')
@@ -13,3 +13,14 @@ class ModelTestProxy(Proxy):
 
     def on_remove(self):
         self.set_data(ModelTestProxy.ON_REMOVE_CALLED)
+
+class ModelTestLazyProxy(Proxy):
+    NAME = 'ModelTestLazyProxy'
+    instances = 0
+
+    def __init__(self):
+        Proxy.__init__(self, ModelTestLazyProxy.NAME)
+        ModelTestLazyProxy.instances += 1
+
+    def on_register(self):
+        self.set_data(ModelTestProxy.ON_REGISTER_CALLED)
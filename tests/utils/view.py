@@ -85,3 +85,49 @@ class ViewTestMediator5(Mediator, IMediator):
 
     def handle_notification(self, notification):
         self.view_component.counter += 1
+
+class ViewTestLazyMediator(Mediator, IMediator):
+
+    NAME = 'ViewTestLazyMediator'
+    instances = 0
+
+    def __init__(self, view):
+        Mediator.__init__(self, ViewTestLazyMediator.NAME, view)
+        ViewTestLazyMediator.instances += 1
+
+    def list_notification_interests(self):
+        return [self.view_component.NOTE1, self.view_component.NOTE2]
+
+    def handle_notification(self, notification):
+        self.view_component.lastNotification = notification.get_name()
+        self.view_component.counter += 1
+
+    def on_register(self):
+        self.view_component.onRegisterCalled = True
+
+class ViewTestTypedMediator(Mediator, IMediator):
+
+    NAME = 'ViewTestTypedMediator'
+
+    def __init__(self, view):
+        Mediator.__init__(self, ViewTestTypedMediator.NAME, view)
+
+    def list_notification_interests(self):
+        return [(self.view_component.NOTE1, 'typed'), self.view_component.NOTE2]
+
+    def handle_notification(self, notification):
+        self.view_component.lastNotification = notification.get_name()
+        self.view_component.counter += 1
+
+class ViewTestPlainAndTypedMediator(Mediator, IMediator):
+
+    NAME = 'ViewTestPlainAndTypedMediator'
+
+    def __init__(self, view):
+        Mediator.__init__(self, ViewTestPlainAndTypedMediator.NAME, view)
+
+    def list_notification_interests(self):
+        return [self.view_component.NOTE3, (self.view_component.NOTE3, 'typed')]
+
+    def handle_notification(self, notification):
+        self.view_component.counter += 1